@@ -4,17 +4,29 @@
 
 import certifi
 import requests
+from requests.adapters import DEFAULT_RETRIES, HTTPAdapter
+from requests.utils import default_headers
 
 from juriscraper.lib.date_utils import fix_future_year_typo, json_date_handler
 from juriscraper.lib.exceptions import InsanityException
 from juriscraper.lib.html_utils import (
     clean_html,
+    clean_html_bytes,
     fix_links_in_lxml_tree,
     get_html_from_element,
+    get_html_parsed_bytes,
     get_html_parsed_text,
+    is_utf8,
     set_response_encoding,
 )
 from juriscraper.lib.log_tools import make_default_logger
+from juriscraper.lib.network_utils import (
+    async_request,
+    connection_pool,
+    get_httpx,
+    make_async_client,
+)
+from juriscraper.lib.rate_limit import rate_limiter
 from juriscraper.lib.string_utils import (
     CaseNameTweaker,
     clean_string,
@@ -30,7 +42,14 @@ class AbstractSite:
     """Contains generic methods for scraping data. Should be extended by all
     scrapers.
 
-    Should not contain lists that can't be sorted by the _date_sort function."""
+    Should not contain lists that can't be sorted by the _date_sort function.
+    """
+
+    # The most requests per second to send to this court's host. The limit is
+    # shared by every object in the process that talks to the host. If None,
+    # the process-wide default in juriscraper.lib.rate_limit is used.
+    rate_limit = None
+    rate_limit_burst = 1
 
     def __init__(self, cnt=None):
         super().__init__()
@@ -42,6 +61,14 @@ def __init__(self, cnt=None):
         self.back_scrape_iterable = None
         self.downloader_executed = False
         self.cookies = {}
+        # Set this to a PageStateStore to skip pages that haven't changed
+        # since they were last scraped.
+        self.page_state_store = None
+        self.unchanged = False
+        self._page_state = None
+        # Connections are borrowed from this pool, so that they outlive the
+        # Site. Set it to None to give the Site connections of its own.
+        self.connection_pool = connection_pool
         self.cnt = cnt or CaseNameTweaker()
         self.request = {
             "verify": certifi.where(),
@@ -85,6 +112,8 @@ def __len__(self):
 
     def close_session(self):
         if self.request["session"]:
+            if self.connection_pool is not None:
+                self.connection_pool.release(self.request["session"])
             self.request["session"].close()
 
     def _make_item(self, i):
@@ -125,10 +154,39 @@ def parse(self):
         if not self.downloader_executed:
             # Run the downloader if it hasn't been run already
             self.html = self._download()
+            if self.unchanged:
+                return self._parse_unchanged()
 
             # Process the available html (optional)
             self._process_html()
 
+        return self._parse_html()
+
+    async def aparse(self, client=None):
+        """Like parse(), but download the page without blocking the event
+        loop, so that many courts can be fetched at once in a single thread.
+
+        Parsing is exactly the same as with parse(). Downloading is done with
+        httpx, if it is installed. Sites with a custom downloader, or that
+        have set up their session (and sites in test mode) keep using
+        requests, but it is run in a worker thread.
+
+        :param client: An optional httpx.AsyncClient to share connections
+        across many sites. If not provided, one is created for the request.
+        """
+        if not self.downloader_executed:
+            self.html = await self._adownload(client)
+            if self.unchanged:
+                return self._parse_unchanged()
+            self._process_html()
+
+        return self._parse_html()
+
+    def _parse_html(self):
+        """Run the data getters on the downloaded html and clean the result.
+
+        Shared by parse() and aparse().
+        """
         # Set the attribute to the return value from _get_foo()
         # e.g., this does self.case_names = _get_case_names()
         for attr in self._all_attrs:
@@ -144,6 +202,16 @@ def parse(self):
         self._check_sanity()
         self._date_sort()
         self._make_hash()
+        self._save_page_state()
+        return self
+
+    def _parse_unchanged(self):
+        """Stand-in for parsing when the page hasn't changed since it was
+        last scraped. Leaves the Site empty, but with the hash it had before.
+        """
+        for attr in self._all_attrs:
+            self.__setattr__(attr, [])
+        logger.info(f"{self.court_id}: Page unchanged since last scrape.")
         return self
 
     def tweak_response_object(self):
@@ -294,6 +362,16 @@ def _make_hash(self):
         """
         self.hash = hashlib.sha1(str(self.case_names).encode()).hexdigest()
 
+    def _uses_default_parser(self):
+        """Whether this site cleans and parses its pages with the stock
+        hooks, so that they can be parsed without being decoded first.
+        """
+        cls = type(self)
+        return (
+            cls._clean_text is AbstractSite._clean_text
+            and cls._make_html_tree is AbstractSite._make_html_tree
+        )
+
     def _make_html_tree(self, text):
         """Hook for custom HTML parsers
 
@@ -304,9 +382,7 @@ def _make_html_tree(self, text):
         """
         return get_html_parsed_text(text)
 
-    def _download(self, request_dict={}):
-        """Download the latest version of Site"""
-        self.downloader_executed = True
+    def _log_download(self):
         if self.method == "POST":
             truncated_params = {}
             for k, v in self.parameters.items():
@@ -317,6 +393,11 @@ def _download(self, request_dict={}):
             )
         else:
             logger.info(f"Now downloading case page at: {self.url}")
+
+    def _download(self, request_dict={}):
+        """Download the latest version of Site"""
+        self.downloader_executed = True
+        self._log_download()
         self._process_request_parameters(request_dict)
         if self.method == "GET":
             self._request_url_get(self.url)
@@ -325,8 +406,107 @@ def _download(self, request_dict={}):
         elif self.test_mode_enabled():
             self._request_url_mock(self.url)
         self._post_process_response()
+        if self._check_page_state():
+            return None
         return self._return_response_text_object()
 
+    def _uses_default_downloader(self):
+        """Whether this site downloads its page with the stock GET/POST
+        machinery and an untouched session, as opposed to a downloader of its
+        own.
+        """
+        cls = type(self)
+        return (
+            cls._download is AbstractSite._download
+            and cls._request_url_get is AbstractSite._request_url_get
+            and cls._request_url_post is AbstractSite._request_url_post
+            and self.method in ["GET", "POST"]
+            and self._uses_default_session()
+        )
+
+    def _uses_default_session(self):
+        """Whether the session is as requests made it, so that httpx can make
+        the same request. Sites sometimes set up their session, by mounting an
+        SSLAdapter, say, or setting cookies, and httpx wouldn't know about it.
+        """
+        session = self.request["session"]
+        if (
+            session.cookies
+            or session.auth
+            or session.proxies
+            or session.params
+            or session.cert
+            or session.verify is not True
+            or session.headers != default_headers()
+        ):
+            return False
+        for prefix, adapter in session.adapters.items():
+            if (
+                self.connection_pool is not None
+                and adapter in self.connection_pool
+            ):
+                continue
+            if (
+                prefix not in ("http://", "https://")
+                or type(adapter) is not HTTPAdapter
+                or adapter.max_retries.total != DEFAULT_RETRIES
+            ):
+                return False
+        return True
+
+    async def _adownload(self, client=None, request_dict={}):
+        """Download the latest version of Site without blocking the event
+        loop.
+        """
+        if get_httpx() is None or not self._uses_default_downloader():
+            # Not imported at the top, to keep importing scrapers fast.
+            import asyncio
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, self._download, request_dict
+            )
+
+        self.downloader_executed = True
+        self._log_download()
+        self._process_request_parameters(request_dict)
+        await self._arequest_url(self.url, client)
+        self._post_process_response()
+        if self._check_page_state():
+            return None
+        return self._return_response_text_object()
+
+    async def _arequest_url(self, url, client=None):
+        """Execute a GET or POST request with httpx and assign appropriate
+        request dictionary values.
+
+        The httpx response is converted to a requests.Response, so that
+        tweak_response_object and everything after it work unchanged.
+        """
+        self.request["url"] = url
+        if self.method == "GET":
+            headers = self._get_request_headers(url)
+        else:
+            headers = self.request["headers"]
+        kwargs = {
+            "headers": headers,
+            "timeout": 60,
+            **self.request["parameters"],
+        }
+        if self.method == "POST":
+            kwargs["data"] = self.parameters
+        await rate_limiter.async_wait(
+            url, self.rate_limit, self.rate_limit_burst
+        )
+        if client is None or self.request["verify"] is False:
+            async with make_async_client(self.request["verify"]) as client:
+                response = await async_request(
+                    client, self.method, url, **kwargs
+                )
+        else:
+            response = await async_request(client, self.method, url, **kwargs)
+        self.request["response"] = response
+
     def _process_html(self):
         """Hook for processing available self.html after it's been downloaded.
         This step is completely optional, but is useful if you want to transform
@@ -343,14 +523,97 @@ def _process_request_parameters(self, parameters={}):
             del parameters["verify"]
         self.request["parameters"] = parameters
 
+    def _get_page_state_key(self, url):
+        """Make the key used for a page in the page state store. POSTed pages
+        are keyed by their parameters as well as their URL.
+        """
+        if self.method == "POST":
+            parameters = json.dumps(
+                self.parameters, sort_keys=True, default=str
+            )
+            return f"{url} {parameters}"
+        return url
+
+    def _get_request_headers(self, url):
+        """Get the headers for a GET request, adding the validators from the
+        last time the page was scraped, if we know them. These let the server
+        reply with a cheap 304 Not Modified.
+        """
+        if self.page_state_store is None:
+            return self.request["headers"]
+        state = self.page_state_store.get(self._get_page_state_key(url))
+        if not state:
+            return self.request["headers"]
+        headers = dict(self.request["headers"])
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def _check_page_state(self):
+        """Check whether the page just downloaded is the same as the last time
+        it was scraped, either because the server said so with a 304, or
+        because the raw body is byte-identical.
+
+        Sets self.unchanged, and remembers the new state of the page so it can
+        be saved once parsing succeeds. Sites with their own downloader may
+        download several pages, so they are always parsed in full.
+
+        :return: True if the page is unchanged, else False.
+        """
+        if self.page_state_store is None:
+            return False
+        if type(self)._download is not AbstractSite._download:
+            return False
+        response = self.request["response"]
+        key = self._get_page_state_key(self.request["url"])
+        previous = self.page_state_store.get(key)
+        if previous and response.status_code == 304:
+            self.unchanged = True
+            self.hash = previous.get("hash")
+            return True
+
+        state = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "digest": hashlib.sha1(response.content).hexdigest(),
+            "hash": None,
+        }
+        if previous and previous.get("digest") == state["digest"]:
+            self.unchanged = True
+            self.hash = state["hash"] = previous.get("hash")
+            self.page_state_store.set(key, state)
+            return True
+
+        self._page_state = (key, state)
+        return False
+
+    def _save_page_state(self):
+        """Save the state of the page once it has been successfully parsed.
+        Pages that fail to parse are not saved, so they are retried in full.
+        """
+        if self.page_state_store is None or self._page_state is None:
+            return
+        key, state = self._page_state
+        state["hash"] = self.hash
+        self.page_state_store.set(key, state)
+        self._page_state = None
+
+    def _mount_connection_pool(self, url):
+        if self.connection_pool is not None:
+            self.connection_pool.mount(self.request["session"], url)
+
     def _request_url_get(self, url):
         """Execute GET request and assign appropriate request dictionary
         values
         """
         self.request["url"] = url
+        self._mount_connection_pool(url)
+        rate_limiter.wait(url, self.rate_limit, self.rate_limit_burst)
         self.request["response"] = self.request["session"].get(
             url,
-            headers=self.request["headers"],
+            headers=self._get_request_headers(url),
             verify=self.request["verify"],
             timeout=60,
             **self.request["parameters"],
@@ -359,6 +622,8 @@ def _request_url_get(self, url):
     def _request_url_post(self, url):
         """Execute POST request and assign appropriate request dictionary values"""
         self.request["url"] = url
+        self._mount_connection_pool(url)
+        rate_limiter.wait(url, self.rate_limit, self.rate_limit_burst)
         self.request["response"] = self.request["session"].post(
             url,
             headers=self.request["headers"],
@@ -386,13 +651,25 @@ def _return_response_text_object(self):
             ):
                 return self.request["response"].json()
             else:
-                try:
-                    payload = self.request["response"].content.decode("utf8")
-                except:
-                    payload = self.request["response"].text
-
-                text = self._clean_text(payload)
-                html_tree = self._make_html_tree(text)
+                content = self.request["response"].content
+                if (
+                    self._uses_default_parser()
+                    and isinstance(content, bytes)
+                    and is_utf8(content)
+                ):
+                    # Let lxml decode the page, rather than making str copies
+                    # of it to clean and parse.
+                    html_tree = get_html_parsed_bytes(
+                        clean_html_bytes(content)
+                    )
+                else:
+                    try:
+                        payload = content.decode("utf8")
+                    except:
+                        payload = self.request["response"].text
+
+                    text = self._clean_text(payload)
+                    html_tree = self._make_html_tree(text)
                 html_tree.rewrite_links(
                     fix_links_in_lxml_tree, base_href=self.request["url"]
                 )
@@ -1,11 +1,9 @@
-import os
+# selenium is imported where it's used, so that scrapers can be imported (and
+# listed) quickly, and without selenium installed.
+from __future__ import annotations
 
-from selenium import webdriver
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select, WebDriverWait
+import os
+from typing import TYPE_CHECKING
 
 from juriscraper.lib.cookie_utils import normalize_cookies
 from juriscraper.lib.html_utils import (
@@ -14,6 +12,10 @@
     get_html_parsed_text,
 )
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webelement import WebElement
+    from selenium.webdriver.support.ui import Select
+
 
 class WebDriven:
     def __init__(self, *args, **kwargs):
@@ -31,6 +33,8 @@ def action_chain_click(self, element: WebElement):
         Element is not clickable at point (x, y) because
         another element obscures it
         """
+        from selenium.webdriver.common.action_chains import ActionChains
+
         ActionChains(self.webdriver).move_to_element(element).click().perform()
 
     def close_webdriver_session(self):
@@ -51,12 +55,18 @@ def find_element(self, by: str, path: str) -> WebElement:
         raise Exception("webdriver not initiated")
 
     def find_element_by_class_name(self, path: str) -> WebElement:
+        from selenium.webdriver.common.by import By
+
         return self.find_element(By.CLASS_NAME, path)
 
     def find_element_by_id(self, path: str) -> WebElement:
+        from selenium.webdriver.common.by import By
+
         return self.find_element(By.ID, path)
 
     def find_element_by_xpath(self, path: str) -> WebElement:
+        from selenium.webdriver.common.by import By
+
         return self.find_element(By.XPATH, path)
 
     def get_page(self) -> WebElement:
@@ -69,6 +79,9 @@ def initiate_webdriven_session(self):
         if not self.url:
             raise Exception("self.url not set")
 
+        from selenium import webdriver
+        from selenium.webdriver.support.ui import WebDriverWait
+
         options = webdriver.FirefoxOptions()
         if os.environ.get("SELENIUM_VISIBLE", False):
             options.headless = False
@@ -94,10 +107,14 @@ def initiate_webdriven_session(self):
         self.cookies = normalize_cookies(self.webdriver.get_cookies())
 
     def scroll_to_element_then_click(self, element: WebElement):
+        from selenium import webdriver
+
         script = "arguments[0].click();"
         webdriver.Firefox.execute_script(script, element)
 
     def select_form_option(self, form_id: str) -> Select:
+        from selenium.webdriver.support.ui import Select
+
         element = self.find_element_by_id(form_id)
         return Select(element)
 
@@ -110,12 +127,21 @@ def select_form_option_text(self, form_id: str, form_value_text: str):
         )
 
     def wait_for_id_then_click(self, id: str):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
         self.wait.until(EC.element_to_be_clickable((By.ID, id))).click()
 
     def wait_for_path_then_click(self, xpath: str):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
         self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath))).click()
 
     def wait_for_id(self, id_attr):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
         self.wait.until(EC.presence_of_element_located((By.ID, id_attr)))
 
     def take_screenshot(self, name: str = None):
@@ -0,0 +1,112 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+
+def make_item_key(item):
+    """Make a stable string key for an item of a back_scrape_iterable.
+
+    Items are usually dates, numbers, strings or tuples of those, none of
+    which survive a round trip through most stores, so they're keyed by their
+    JSON instead.
+    """
+    return json.dumps(item, sort_keys=True, default=str)
+
+
+class BackscrapeCheckpoint:
+    """Remembers which items of a court's back_scrape_iterable have been
+    scraped, so that an interrupted back-scrape can pick up where it left off.
+
+    For each item, the record is a dict with the keys:
+
+     - count: The number of items the Site found.
+     - hash: The hash of the parsed Site (see AbstractSite._make_hash).
+
+    This class keeps everything in memory. Subclass it and override get and
+    set to keep the records elsewhere.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def get(self, court_id, item):
+        """Get the record of an item, or None if it hasn't been completed.
+
+        :param court_id: The court, usually its module string.
+        :param item: An item of the court's back_scrape_iterable.
+        """
+        with self._lock:
+            return self._records.get((court_id, make_item_key(item)))
+
+    def set(self, court_id, item, record):
+        """Save the record of a completed item.
+
+        :param court_id: The court, usually its module string.
+        :param item: An item of the court's back_scrape_iterable.
+        :param record: A dict as described in the class docstring.
+        """
+        with self._lock:
+            self._records[(court_id, make_item_key(item))] = record
+
+    def is_done(self, court_id, item):
+        return self.get(court_id, item) is not None
+
+    def mark_done(self, court_id, item, site):
+        """Record that item was scraped, using the results in site."""
+        self.set(court_id, item, {"count": len(site), "hash": site.hash})
+
+
+class SqliteBackscrapeCheckpoint(BackscrapeCheckpoint):
+    """A BackscrapeCheckpoint that is saved to a SQLite database, so that a
+    back-scrape that is killed can be resumed by the next run.
+
+    Every record is committed as soon as it is set, so at most the items
+    that were in flight are lost.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS backscrape_checkpoints (
+                    court_id TEXT NOT NULL,
+                    item TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    hash TEXT,
+                    completed_at TEXT NOT NULL,
+                    PRIMARY KEY (court_id, item)
+                )"""
+            )
+
+    def get(self, court_id, item):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT count, hash FROM backscrape_checkpoints "
+                "WHERE court_id = ? AND item = ?",
+                (court_id, make_item_key(item)),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"count": row[0], "hash": row[1]}
+
+    def set(self, court_id, item, record):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO backscrape_checkpoints "
+                "(court_id, item, count, hash, completed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    court_id,
+                    make_item_key(item),
+                    record["count"],
+                    record["hash"],
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+    def close(self):
+        self._connection.close()
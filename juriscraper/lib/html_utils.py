@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import codecs
 import re
 import sys
 from urllib.parse import urlsplit, urlunsplit
@@ -6,10 +7,12 @@
 import lxml
 from lxml import etree, html
 from lxml.etree import XMLSyntaxError
-from lxml.html import HtmlElement, fromstring, html5parser, tostring
+from lxml.html import HtmlElement, fromstring, tostring
 from lxml.html.clean import Cleaner
 from requests import Response
 
+from .network_utils import get_host
+
 try:
     # Use cchardet for performance to detect the character encoding.
     import cchardet as chardet
@@ -34,11 +37,19 @@ def get_html_parsed_text(text):
     return html.fromstring(text)
 
 
+def get_html_parsed_bytes(content: bytes, encoding: str = "utf-8"):
+    """Like get_html_parsed_text, but for undecoded content.
+
+    lxml decodes the content itself, so no str copy of the document is made.
+    """
+    return html.fromstring(content, parser=html.HTMLParser(encoding=encoding))
+
+
 def get_html_from_element(element):
     return tostring(element)
 
 
-def get_html5_parsed_text(text: str) -> HtmlElement:
+def get_html5_parsed_text(text: str, single_pass: bool = False) -> HtmlElement:
     """Return content using the html5parser, ideal for faulty html.
 
     This dance is slightly different than usual because it uses the
@@ -48,13 +59,48 @@ def get_html5_parsed_text(text: str) -> HtmlElement:
     html5parser, and the usual lxml parser gives us the same API we are
     used to.
 
+    With single_pass, html5lib builds the HtmlElement tree directly instead,
+    which skips the second parse and the serialized copy of the document.
+    The trees differ slightly: the round trip nests the document in a second
+    html element (<html><body><html>...), while the single pass tree is the
+    document as html5lib parsed it.
+
     :param text: The html of the document
+    :param single_pass: Whether to skip the round trip through tostring.
     :return: an lxml.HtmlElement object
     """
+    if single_pass:
+        return _html5_parse_to_html_elements(text)
+    # html5lib is slow to import, and most scrapers never use it.
+    from lxml.html import html5parser
+
     parsed = html5parser.document_fromstring(text)
     return fromstring(tostring(parsed, encoding="unicode"))
 
 
+def _html5_parse_to_html_elements(text: str) -> HtmlElement:
+    """Parse text with html5lib straight into an HtmlElement tree.
+
+    html5lib's lxml tree builder makes its elements with the default parser,
+    so for the length of the parse the default parser (which is per thread)
+    is swapped for one that makes HtmlElements, as lxml.html's
+    XHTMLParser does.
+    """
+    import html5lib
+
+    parser = etree.XMLParser()
+    parser.set_element_class_lookup(html.HtmlElementClassLookup())
+    default_parser = etree.get_default_parser()
+    etree.set_default_parser(parser)
+    try:
+        html5_parser = html5lib.HTMLParser(
+            tree=html5lib.getTreeBuilder("lxml"), namespaceHTMLElements=False
+        )
+        return html5_parser.parse(text).getroot()
+    finally:
+        etree.set_default_parser(default_parser)
+
+
 def get_table_column_text(
     html: HtmlElement,
     cell_num: int,
@@ -168,10 +214,105 @@ def get_visible_text(html_content):
     return " ".join(text)
 
 
+# How far into a page to look for a <meta> charset. Browsers look at the
+# first 1024 bytes.
+ENCODING_SNIFF_BYTES = 1024
+
+# How much of a page to give chardet when nothing declares the encoding.
+ENCODING_DETECTION_SAMPLE_BYTES = 64 * 1024
+
+BYTE_ORDER_MARKS = (
+    # The UTF-32 marks start with the UTF-16 ones, so they go first.
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-z0-9_:.-]+)""", re.I
+)
+
+NON_ASCII_BYTE_RE = re.compile(rb"[\x80-\xff]")
+
+# The encodings chardet guessed for each host. Courts don't change encodings
+# from one page to the next, so one guess per host is enough.
+detected_encodings = {}
+
+
+def normalize_encoding(encoding):
+    """Get the canonical name of an encoding, or None if Python doesn't know
+    it.
+
+    ISO-8859-1 is switched to cp1252, a superset of it that is what browsers
+    (and most servers that claim ISO-8859-1) actually use.
+    """
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return None
+    if name == "iso8859-1":
+        return "cp1252"
+    return name
+
+
+def get_meta_encoding(content: bytes):
+    """Get the encoding declared in a <meta> tag at the start of the page,
+    if any.
+    """
+    m = META_CHARSET_RE.search(content, 0, ENCODING_SNIFF_BYTES)
+    if m:
+        return normalize_encoding(m.group(1).decode("ascii"))
+    return None
+
+
+def detect_encoding(content: bytes, host: str = ""):
+    """Work out the encoding of content that came without one.
+
+    In order, this uses:
+
+     1. A byte order mark.
+     2. A <meta> charset in the first ENCODING_SNIFF_BYTES.
+     3. ASCII or UTF-8, if the content is valid as either.
+     4. A guess by chardet, from up to ENCODING_DETECTION_SAMPLE_BYTES
+        starting at the first non-ASCII byte. The guess is remembered for the
+        host, if one is given, and reused for its later pages.
+
+    :param content: The undecoded content.
+    :param host: The host the content came from.
+    :return: The name of the encoding, or None if it can't be worked out.
+    """
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if content.startswith(bom):
+            return encoding
+
+    encoding = get_meta_encoding(content)
+    if encoding:
+        return encoding
+
+    if content.isascii():
+        return "ascii"
+    if is_utf8(content):
+        return "utf-8"
+
+    if host and host in detected_encodings:
+        return detected_encodings[host]
+    start = NON_ASCII_BYTE_RE.search(content).start()
+    sample = content[start : start + ENCODING_DETECTION_SAMPLE_BYTES]
+    encoding = chardet.detect(sample)["encoding"]
+    if encoding:
+        encoding = normalize_encoding(encoding)
+        if host:
+            detected_encodings[host] = encoding
+    return encoding
+
+
 def set_response_encoding(request):
     """Set the encoding if it isn't set already.
 
-    Use cchardet for added performance.
+    Requests sets the encoding from the Content-Type header. When the header
+    has none, detect_encoding works it out from the start of the content.
     """
     if request:
         # If the encoding is iso-8859-1, switch it to cp1252 (a superset)
@@ -182,15 +323,54 @@ def set_response_encoding(request):
             # Requests detects the encoding when the item is GET'ed using
             # HTTP headers, and then when r.text is accessed, if the encoding
             # hasn't been set by that point. By setting the encoding here, we
-            # ensure that it's done by cchardet, if it hasn't been done with
-            # HTTP headers. This way it is done before r.text is accessed
-            # (which would do it with vanilla chardet). This is a big
-            # performance boon, and can be removed once requests is upgraded
+            # ensure that r.text never runs chardet across the whole body.
             if isinstance(request.content, str):
-                as_bytes = request.content.encode()
-                request.encoding = chardet.detect(as_bytes)["encoding"]
+                request.encoding = "utf-8"
             else:
-                request.encoding = chardet.detect(request.content)["encoding"]
+                request.encoding = detect_encoding(
+                    request.content, get_host(request.url)
+                )
+
+
+# The <?xml> declaration, when it starts the document.
+XML_DECLARATION_RE = re.compile(r"\s*<\?xml\s+.*?\?>")
+
+# Characters that aren't allowed in XML (http://stackoverflow.com/questions/8733233/)
+# Note that this won't work completely on narrow builds of Python, which
+# existed prior to Py3. Thus, we check if it's a narrow build, and adjust
+# accordingly.
+if sys.maxunicode == 65535:
+    INVALID_XML_CHARS_RE = re.compile(
+        "[^\u0020-\ud7ff\u0009\u000a\u000d\ue000-\ufffd]+"
+    )
+else:
+    INVALID_XML_CHARS_RE = re.compile(
+        "[^\u0020-\ud7ff\u0009\u000a\u000d\ue000-\ufffd"
+        "\U00010000-\U0010ffff]+"
+    )
+
+
+# The control characters that aren't allowed in XML, as UTF-8.
+INVALID_XML_CONTROL_BYTES = bytes(
+    c for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)
+)
+
+
+def has_invalid_xml_chars(text: str) -> bool:
+    """Check whether text has any characters that INVALID_XML_CHARS_RE would
+    remove.
+
+    This is several times faster than searching with the regex, because the
+    common case, where there's nothing to remove, never leaves C.
+    """
+    try:
+        # Lone surrogates can't be encoded.
+        encoded = text.encode("utf-8")
+    except UnicodeEncodeError:
+        return True
+    if len(encoded.translate(None, INVALID_XML_CONTROL_BYTES)) != len(encoded):
+        return True
+    return "\ufffe" in text or "\uffff" in text
 
 
 def clean_html(text: str) -> str:
@@ -200,10 +380,15 @@ def clean_html(text: str) -> str:
     3. Replaces </br> with <br/>
     4. Nukes invalid bytes in input
     5. ?
+
+    Each fix first does a cheap check for whether it's needed, so text that is
+    already clean is returned as is.
     """
     # Remove <![CDATA because it causes breakage in lxml.
-    text = re.sub(r"<!\[CDATA\[", "", text)
-    text = re.sub(r"\]\]>", "", text)
+    if "<![CDATA[" in text:
+        text = text.replace("<![CDATA[", "")
+    if "]]>" in text:
+        text = text.replace("]]>", "")
 
     # Remove <?xml> declaration in Unicode objects, because it causes an
     # error: "ValueError: Unicode strings with encoding declaration are not
@@ -213,27 +398,74 @@ def clean_html(text: str) -> str:
     # removing it. This moves our encoding detection to chardet, rather than
     # lxml.
     if isinstance(text, str):
-        text = re.sub(r"^\s*<\?xml\s+.*?\?>", "", text)
-
-    # Fix invalid bytes in XML (http://stackoverflow.com/questions/8733233/)
-    # Note that this won't work completely on narrow builds of Python, which
-    # existed prior to Py3. Thus, we check if it's a narrow build, and adjust
-    # accordingly.
-    if sys.maxunicode == 65535:
-        text = re.sub(
-            "[^\u0020-\uD7FF\u0009\u000A\u000D\uE000-\uFFFD]+", "", text
-        )
-    else:
-        text = re.sub(
-            "[^\u0020-\uD7FF\u0009\u000A\u000D\uE000-\uFFFD"
-            "\U00010000-\U0010FFFF]+",
-            "",
-            text,
-        )
+        m = XML_DECLARATION_RE.match(text)
+        if m:
+            text = text[m.end() :]
+
+    # Fix invalid bytes in XML
+    if has_invalid_xml_chars(text):
+        text = INVALID_XML_CHARS_RE.sub("", text)
 
     return text
 
 
+UTF8_CHECK_CHUNK_SIZE = 64 * 1024
+
+
+def is_utf8(content: bytes) -> bool:
+    """Check whether content is valid UTF-8 without decoding all of it at
+    once.
+    """
+    if content.isascii():
+        return True
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    view = memoryview(content)
+    try:
+        for i in range(0, len(view), UTF8_CHECK_CHUNK_SIZE):
+            decoder.decode(view[i : i + UTF8_CHECK_CHUNK_SIZE])
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+# The UTF-8 forms of the noncharacters that INVALID_XML_CHARS_RE removes.
+# Surrogates can't be in valid UTF-8, and the control characters are the same
+# as their bytes.
+INVALID_XML_UTF8_SEQUENCES = (b"\xef\xbf\xbe", b"\xef\xbf\xbf")
+
+
+def clean_html_bytes(content: bytes) -> bytes:
+    """Like clean_html, but for UTF-8 content that hasn't been decoded yet.
+
+    For valid UTF-8, clean_html_bytes(content).decode() is always the same as
+    clean_html(content.decode()), without making a str copy of the document.
+    """
+    if b"<![CDATA[" in content:
+        content = content.replace(b"<![CDATA[", b"")
+    if b"]]>" in content:
+        content = content.replace(b"]]>", b"")
+
+    # The declaration can only be at the start, but it can be preceded by
+    # Unicode whitespace, so decode just enough to match it the same way
+    # clean_html does.
+    start = content.find(b"<?xml")
+    if start != -1:
+        end = content.find(b"?>", start)
+        if end != -1:
+            prefix = content[: end + 2].decode("utf-8")
+            m = XML_DECLARATION_RE.match(prefix)
+            if m:
+                content = content[len(m.group().encode("utf-8")) :]
+
+    if len(content.translate(None, INVALID_XML_CONTROL_BYTES)) != len(content):
+        content = content.translate(None, INVALID_XML_CONTROL_BYTES)
+    for sequence in INVALID_XML_UTF8_SEQUENCES:
+        if sequence in content:
+            content = content.replace(sequence, b"")
+    return content
+
+
 def fix_links_but_keep_anchors(link):
     # Wrap the function below so that we have one that can be passed to
     # lxml's rewrite_links method, which doesn't accept any parameters.
@@ -1,11 +1,42 @@
+import importlib
+import json
 import os
+from functools import lru_cache
 
 from requests import HTTPError
 
+# Every scraper, made by write_court_registry, so that scrapers can be listed
+# and found without importing them all.
+COURT_REGISTRY_PATH = os.path.join(
+    os.path.dirname(__file__), "court_registry.json"
+)
+# Bump this when the fields of the registry change.
+COURT_REGISTRY_VERSION = 1
+
 
 def build_module_list(court_id):
     """Takes a string and builds up a list of modules to import.
 
+    Scrapers in the court registry are listed from it, without importing
+    anything. For anything else, this walks the packages, as
+    walk_module_list does.
+
+    Returns either a list of modules or in the case of errors, an empty list.
+    """
+    prefix = f"{court_id}."
+    module_strings = [
+        court["module"]
+        for court in load_court_registry()
+        if court["module"] == court_id or court["module"].startswith(prefix)
+    ]
+    if module_strings:
+        return module_strings
+    return walk_module_list(court_id)
+
+
+def walk_module_list(court_id):
+    """Build the list of modules under court_id by importing its packages.
+
     This is a simple recursive function that iteratively looks for __all__
     attributes in packages. If it finds one, it inspects each of the items in
     it to see if each of those has an __all__ attribute. If they lack it, the
@@ -53,6 +84,16 @@ def find_all_attr_or_punt(court_id):
 
 
 def get_module_by_name(name):
+    """Get the opinion Site of the court with the id name, e.g. "ca1".
+
+    :return: An instance of the court's Site, or None if there's no such
+    court.
+    """
+    for court in get_courts_by_id().get(name, []):
+        if court["scraper_type"] == "opinions":
+            return importlib.import_module(court["module"]).Site()
+
+    # Not in the registry. Look for it among the files.
     db_root = os.path.abspath(
         os.path.join(os.path.dirname(__file__), "..", "opinions")
     )
@@ -72,6 +113,80 @@ def get_module_by_name(name):
                 return juriscraper_module.Site()
 
 
+def make_court_registry():
+    """Import every scraper and describe it for the court registry.
+
+    Each court is a dict with the keys:
+
+     - court_id: The name of its module, e.g. "ca1".
+     - module: The full module string.
+     - scraper_type: "opinions" or "oral_args".
+     - uses_selenium: Whether its Site needs a browser.
+     - backscrape: Whether its Site can scrape backwards.
+
+    :return: A dict with the registry's version, and the list of courts in
+    the order walk_module_list finds them.
+    """
+    from juriscraper.AbstractSite import AbstractSite
+    from juriscraper.WebDriven import WebDriven
+
+    courts = []
+    for module_string in walk_module_list("juriscraper"):
+        site = importlib.import_module(module_string).Site
+        courts.append(
+            {
+                "court_id": module_string.rsplit(".", 1)[1],
+                "module": module_string,
+                "scraper_type": module_string.split(".")[1],
+                "uses_selenium": issubclass(site, WebDriven),
+                "backscrape": site._download_backwards
+                is not AbstractSite._download_backwards,
+            }
+        )
+    return {"version": COURT_REGISTRY_VERSION, "courts": courts}
+
+
+def write_court_registry(path=COURT_REGISTRY_PATH):
+    """Write make_court_registry() to path, for load_court_registry.
+
+    Run this whenever a scraper is added, moved or removed.
+    """
+    with open(path, "w") as f:
+        json.dump(make_court_registry(), f, indent=2)
+        f.write("\n")
+
+
+@lru_cache(maxsize=None)
+def load_court_registry(path=COURT_REGISTRY_PATH):
+    """Load the courts written by write_court_registry.
+
+    :return: A tuple of court dicts, as described in make_court_registry.
+    Don't modify them; they're shared.
+    """
+    with open(path) as f:
+        registry = json.load(f)
+    if registry["version"] != COURT_REGISTRY_VERSION:
+        raise ValueError(
+            f"{path} is version {registry['version']} of the court registry, "
+            f"not {COURT_REGISTRY_VERSION}. Run write_court_registry()."
+        )
+    return tuple(registry["courts"])
+
+
+@lru_cache(maxsize=None)
+def get_courts_by_id():
+    """Index the court registry by court_id.
+
+    :return: A dict of each court_id, and the list of courts that have it.
+    A court can have both an opinion and an oral argument scraper, and a
+    back-scraper.
+    """
+    courts_by_id = {}
+    for court in load_court_registry():
+        courts_by_id.setdefault(court["court_id"], []).append(court)
+    return courts_by_id
+
+
 def site_yielder(iterable, mod):
 
     for i in iterable:
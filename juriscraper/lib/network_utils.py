@@ -1,10 +1,20 @@
 import random
+import threading
 import time
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
 
-from requests.adapters import HTTPAdapter
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from requests.models import Response
 from requests.packages.urllib3.poolmanager import PoolManager
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 
-from juriscraper.AbstractSite import logger
+from .log_tools import make_default_logger
+
+logger = make_default_logger()
 
 
 class SSLAdapter(HTTPAdapter):
@@ -24,6 +34,176 @@ def init_poolmanager(self, connections, maxsize, block=False):
         )
 
 
+def get_host(url):
+    """Get the host part of a URL, or the empty string if it has none.
+
+    Local paths (as used in test mode) have no host.
+    """
+    if not url or not isinstance(url, str):
+        return ""
+    return urlsplit(url).netloc.lower()
+
+
+class ConnectionPool:
+    """Keep-alive connections shared by every session in the process.
+
+    Each host gets a single transport adapter (and thus a single urllib3 pool
+    of connections), created the first time the host is seen. Sessions borrow
+    it with mount, so a Site or report that is thrown away after one page
+    doesn't throw away its connections too. Cookies and headers stay with the
+    session that made the request; only the sockets are shared.
+
+    :param pool_maxsize: The most connections to keep open to each host.
+    Sessions can still open more at once, but only this many are kept alive
+    afterwards unless pool_block is True.
+    :param pool_block: Whether to wait for a free connection instead of
+    opening a new one when a host already has pool_maxsize in use.
+    :param max_retries: Passed to each HTTPAdapter.
+    """
+
+    def __init__(
+        self, pool_maxsize=DEFAULT_POOLSIZE, pool_block=False, max_retries=0
+    ):
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self._adapters = {}
+        self._lock = threading.Lock()
+        self._session = None
+
+    @staticmethod
+    def _get_prefix(url):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            return None
+        return f"{parts.scheme}://{parts.netloc.lower()}/"
+
+    def get_adapter(self, url):
+        """Get the adapter for the host of url, creating it if needed."""
+        prefix = self._get_prefix(url)
+        if prefix is None:
+            return None
+        with self._lock:
+            adapter = self._adapters.get(prefix)
+            if adapter is None:
+                # A host is only ever reached over a handful of pools (one per
+                # scheme, port and SSL setting), so num_pools can stay small.
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=self.max_retries,
+                    pool_block=self.pool_block,
+                )
+                self._adapters[prefix] = adapter
+            return adapter
+
+    def mount(self, session, url):
+        """Have session use the shared connections for the host of url.
+
+        Sessions that mount adapters of their own (an SSLAdapter, say) for
+        url are left alone.
+
+        :param session: A requests.Session
+        :param url: The URL that is about to be requested.
+        """
+        prefix = self._get_prefix(url)
+        if prefix is None or prefix in session.adapters:
+            return
+        current = session.get_adapter(url)
+        if type(current) is not HTTPAdapter or current in self:
+            return
+        if not any(
+            session.adapters.get(default) is current
+            for default in ("http://", "https://")
+        ):
+            return
+        session.mount(prefix, self.get_adapter(url))
+
+    def release(self, session):
+        """Unmount the shared adapters from session.
+
+        Call this before closing the session, since closing a session closes
+        its adapters, which would close the shared connections for everybody.
+        """
+        for prefix, adapter in list(session.adapters.items()):
+            if adapter in self:
+                del session.adapters[prefix]
+
+    def __contains__(self, adapter):
+        with self._lock:
+            return any(a is adapter for a in self._adapters.values())
+
+    @property
+    def session(self):
+        """A cookieless session for anonymous requests, such as PACER's free
+        magic links, that uses the shared connections.
+        """
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                session.cookies.set_policy(
+                    DefaultCookiePolicy(allowed_domains=[])
+                )
+                self._session = session
+        return self._session
+
+    def get(self, url, **kwargs):
+        """Make an anonymous GET request using the shared connections."""
+        session = self.session
+        self.mount(session, url)
+        return session.get(url, **kwargs)
+
+    def close(self):
+        """Close every shared connection."""
+        with self._lock:
+            adapters = list(self._adapters.values())
+            self._adapters = {}
+        for adapter in adapters:
+            adapter.close()
+
+
+# The process-wide pool, used by Sites and reports unless they're given
+# another one.
+connection_pool = ConnectionPool()
+
+
+class StreamedResponse:
+    """The body of a response requested with stream=True, with the start of
+    it read, so that it can be checked before the rest is downloaded.
+
+    :param response: A requests.Response
+    :param head_size: How many bytes to read up front, at most.
+    :param chunk_size: How many bytes to read at a time.
+    """
+
+    def __init__(self, response, head_size, chunk_size=64 * 1024):
+        self.response = response
+        self._chunks = response.iter_content(chunk_size)
+        head = bytearray()
+        for chunk in self._chunks:
+            head += chunk
+            if len(head) >= head_size:
+                break
+        self.head = bytes(head)
+
+    def write_to(self, sink):
+        """Write the whole body to sink a chunk at a time, then close the
+        response.
+
+        :param sink: A file-like object opened for writing bytes.
+        :return: The number of bytes written.
+        """
+        try:
+            sink.write(self.head)
+            size = len(self.head)
+            for chunk in self._chunks:
+                sink.write(chunk)
+                size += len(chunk)
+        finally:
+            self.response.close()
+        return size
+
+
 def add_delay(delay=0, deviation=0):
     """Create a semi-random delay.
 
@@ -33,3 +213,55 @@ def add_delay(delay=0, deviation=0):
     duration = random.randrange(delay - deviation, delay + deviation)
     logger.info(f"Adding a delay of {duration} seconds. Please wait.")
     time.sleep(duration)
+
+
+@lru_cache(maxsize=None)
+def get_httpx():
+    """Get the httpx module, or None if it isn't installed.
+
+    httpx is optional, and only needed to download pages without blocking the
+    event loop. It's slow to import, so it's only imported the first time it
+    is needed.
+    """
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx
+
+
+def make_async_client(verify=True, **kwargs):
+    """Make an httpx.AsyncClient that follows redirects like requests does.
+
+    :param verify: Passed to httpx. Either a bool or a path to a CA bundle.
+    :param kwargs: Any other arguments for httpx.AsyncClient.
+    """
+    kwargs.setdefault("follow_redirects", True)
+    return get_httpx().AsyncClient(verify=verify, **kwargs)
+
+
+async def async_request(client, method, url, **kwargs):
+    """Make a request with an httpx.AsyncClient and return the result as a
+    requests.Response, so that it can be used by code written for requests.
+
+    :param client: An httpx.AsyncClient
+    :param method: The HTTP method to use, e.g. "GET"
+    :param url: The URL to request
+    :param kwargs: Any of the requests-style arguments that httpx also
+    understands (headers, params, data, cookies, timeout), plus
+    allow_redirects.
+    :return: A requests.Response object
+    """
+    if "allow_redirects" in kwargs:
+        kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+    r = await client.request(method, url, **kwargs)
+
+    response = Response()
+    response.status_code = r.status_code
+    response.reason = r.reason_phrase
+    response.headers = CaseInsensitiveDict(r.headers.items())
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = str(r.url)
+    response._content = r.content
+    response._content_consumed = True
+    return response
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import threading
+
+
+class PageStateStore:
+    """Remembers what a court's page looked like the last time it was
+    scraped, so that unchanged pages can be skipped.
+
+    For each page, the state is a dict with the keys:
+
+     - etag: The ETag header the server sent, if any.
+     - last_modified: The Last-Modified header the server sent, if any.
+     - digest: The SHA1 of the raw body of the response.
+     - hash: The hash of the parsed Site (see AbstractSite._make_hash).
+
+    This class keeps everything in memory, which is enough for a long-running
+    process. Subclass it and override get and set to keep the states
+    elsewhere.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get the state of a page, or None if it has never been seen.
+
+        :param key: A key identifying the page, usually its URL.
+        """
+        with self._lock:
+            return self._states.get(key)
+
+    def set(self, key, state):
+        """Save the state of a page.
+
+        :param key: A key identifying the page, usually its URL.
+        :param state: A dict as described in the class docstring.
+        """
+        with self._lock:
+            self._states[key] = state
+
+
+class JsonPageStateStore(PageStateStore):
+    """A PageStateStore that is saved to a JSON file, so that it survives
+    between runs.
+
+    The file is rewritten atomically every time a state is set.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path) as f:
+                self._states = json.load(f)
+
+    def set(self, key, state):
+        with self._lock:
+            self._states[key] = state
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._states, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
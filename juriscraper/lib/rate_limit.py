@@ -0,0 +1,126 @@
+import threading
+import time
+
+from .network_utils import get_host
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    Tokens are added at rate per second, up to burst tokens. Each request
+    takes a token. When there are none left, the request reserves the next one
+    and is told how long to wait for it, so waiting never happens while the
+    lock is held.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token.
+
+        :return: The number of seconds to wait before using it.
+        """
+        with self._lock:
+            now = self.clock()
+            elapsed = now - self.updated_at
+            self.updated_at = now
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Limits the rate of requests to each host.
+
+    One of these is shared by the whole process (see rate_limiter, below), so
+    that every Site, report and session hitting a host draws from the same
+    bucket, no matter how many of them are running at once.
+
+    Rates are in requests per second. Hosts without a rate of their own use
+    default_rate, and if that's None, they aren't limited at all.
+    """
+
+    def __init__(self, default_rate=None, default_burst=1):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def set_rate(self, host, rate, burst=1):
+        """Set the rate for a host, replacing any rate it had before.
+
+        :param host: The host, e.g. "ecf.cand.uscourts.gov"
+        :param rate: The maximum requests per second, or None for no limit.
+        :param burst: How many requests can be made back to back.
+        """
+        with self._lock:
+            if rate is None:
+                self._buckets[host] = None
+            else:
+                self._buckets[host] = TokenBucket(rate, burst)
+
+    def _get_bucket(self, host, rate, burst):
+        """Get the bucket for a host, creating it if needed.
+
+        If a rate is requested that is stricter than the host's current one,
+        the stricter one wins. This way, when several courts share a host, the
+        most polite of their rates is used.
+        """
+        with self._lock:
+            if host in self._buckets:
+                bucket = self._buckets[host]
+            elif self.default_rate is not None:
+                bucket = TokenBucket(self.default_rate, self.default_burst)
+                self._buckets[host] = bucket
+            else:
+                bucket = None
+            if rate is not None and (bucket is None or rate < bucket.rate):
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def reserve(self, url, rate=None, burst=1):
+        """Reserve a request to the host of url.
+
+        :param url: The URL about to be requested.
+        :param rate: The rate the caller wants for this host, if any.
+        :param burst: The burst the caller wants for this host.
+        :return: The number of seconds to wait before making the request.
+        """
+        host = get_host(url)
+        if not host:
+            # Local files, as in test mode.
+            return 0
+        bucket = self._get_bucket(host, rate, burst)
+        if bucket is None:
+            return 0
+        return bucket.reserve()
+
+    def wait(self, url, rate=None, burst=1):
+        """Block until a request can be made to the host of url."""
+        delay = self.reserve(url, rate, burst)
+        if delay:
+            time.sleep(delay)
+
+    async def async_wait(self, url, rate=None, burst=1):
+        """Like wait, but without blocking the event loop."""
+        delay = self.reserve(url, rate, burst)
+        if delay:
+            # An event loop is running, so this is already imported.
+            import asyncio
+
+            await asyncio.sleep(delay)
+
+
+# The process-wide limiter. Configure it with something like:
+#   rate_limiter.default_rate = 2
+#   rate_limiter.set_rate("www.courts.state.example.us", 0.5)
+rate_limiter = RateLimiter()
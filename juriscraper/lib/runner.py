@@ -0,0 +1,200 @@
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+from requests import HTTPError
+
+from .log_tools import make_default_logger
+from .network_utils import get_host
+
+logger = make_default_logger()
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_PER_HOST = 2
+
+
+class KeyedSemaphore:
+    """A collection of bounded semaphores, one per key.
+
+    Used to cap how many workers can talk to a single host (or court) at once,
+    while letting workers that are busy with other keys carry on unimpeded.
+    Semaphores are created lazily the first time a key is seen.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _get_semaphore(self, key):
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.limit)
+                self._semaphores[key] = semaphore
+            return semaphore
+
+    @contextmanager
+    def hold(self, key):
+        """Block until a slot for key is free, and hold it until exit."""
+        semaphore = self._get_semaphore(key)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+def import_site_module(module_string):
+    """Import a scraper module from its dotted path."""
+    package, module = module_string.rsplit(".", 1)
+    return __import__(f"{package}.{module}", globals(), locals(), [module])
+
+
+def _scrape_court(module_string, callback, host_semaphore):
+    """Instantiate, parse and process a single court.
+
+    This runs in a worker thread. Any failure is captured so that one broken
+    court never takes down the rest of the run.
+    """
+    result = {"global_failure": False, "scrape": {}, "site": None}
+    try:
+        mod = import_site_module(module_string)
+        site = mod.Site()
+        result["site"] = site
+        with host_semaphore.hold(get_host(site.url)):
+            site.parse()
+        if callback is not None:
+            result["scrape"] = callback(site)
+        else:
+            result["scrape"] = {"count": len(site), "exceptions": {}}
+    except Exception:
+        result["global_failure"] = traceback.format_exc()
+        logger.warning(
+            f"Scraping failed on mod: {module_string}\n"
+            f"{result['global_failure']}"
+        )
+    return result
+
+
+def scrape_courts(
+    module_strings,
+    callback=None,
+    max_workers=DEFAULT_MAX_WORKERS,
+    max_per_host=DEFAULT_MAX_PER_HOST,
+):
+    """Scrape many courts at once on a bounded pool of worker threads.
+
+    Results are yielded as each court finishes rather than in the order they
+    were requested, so a slow court doesn't hold up everybody else. At most
+    max_per_host courts are downloaded from the same host at the same time.
+
+    Only max_workers courts are ever in flight, so closing the generator
+    early (e.g., on SIGTERM) lets the running courts finish without starting
+    any new ones.
+
+    :param module_strings: A list of scraper modules, such as the one returned
+    by build_module_list.
+    :param callback: An optional function that is called in the worker with
+    each parsed Site object. Its return value is placed in the "scrape" key of
+    the result. If not provided, the number of items found is returned.
+    :param max_workers: The maximum number of courts to scrape at once.
+    :param max_per_host: The maximum number of courts to download from a
+    single host at once.
+    :return: Yields tuples of (module_string, result), where result is a dict
+    with the keys "global_failure" (False, or the traceback of the error that
+    took down the court), "scrape" and "site".
+    """
+    host_semaphore = KeyedSemaphore(max_per_host)
+    yield from _map_unordered(
+        lambda module_string: _scrape_court(
+            module_string, callback, host_semaphore
+        ),
+        module_strings,
+        max_workers,
+    )
+
+
+def _map_unordered(fn, iterable, max_workers):
+    """Call fn on each item of iterable in a pool of threads, yielding
+    (item, result) tuples as they finish.
+
+    Items are pulled from iterable lazily, so that only max_workers of them
+    are ever in flight. If fn raises, the exception is raised here, after the
+    calls already in flight are done.
+    """
+    iterable = iter(iterable)
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def submit_next():
+            for item in iterable:
+                in_flight[executor.submit(fn, item)] = item
+                return True
+            return False
+
+        while len(in_flight) < max_workers and submit_next():
+            pass
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                submit_next()
+                yield item, future.result()
+
+
+def _backscrape_item(mod, item):
+    """Download and parse a single item of a back_scrape_iterable.
+
+    :return: The parsed Site, or None if the server returned an error, in
+    which case the item is left to be tried again next time.
+    """
+    site = mod.Site()
+    try:
+        site._download_backwards(item)
+        site.parse()
+    except HTTPError as e:
+        logger.warning(f"Unable to back-scrape {mod.__name__} for {item}: {e}")
+        return None
+    return site
+
+
+def parallel_site_yielder(
+    iterable, mod, max_workers=DEFAULT_MAX_PER_HOST, checkpoint=None
+):
+    """A parallel version of importer.site_yielder.
+
+    The items of iterable (usually a Site's back_scrape_iterable) are
+    downloaded and parsed on a pool of worker threads, and the parsed Sites
+    are yielded as they finish, not in the order of iterable. Since every
+    item goes to the same court, keep max_workers small.
+
+    Items that fail with an HTTPError are logged and skipped, as in
+    site_yielder. Any other error stops the back-scrape and is raised.
+
+    :param iterable: The items to pass to Site._download_backwards
+    :param mod: The scraper module
+    :param max_workers: The maximum number of items to scrape at once.
+    :param checkpoint: An optional BackscrapeCheckpoint. Items it has
+    recorded as done are skipped, and every other item is recorded as done
+    once the caller has finished with its Site, i.e., when it asks for the
+    next one. Items are never recorded when the caller stops iterating,
+    since that may be because its loop raised an exception, so a caller that
+    breaks out of the loop should call checkpoint.mark_done for the last
+    item itself.
+    :return: Yields tuples of (item, site)
+    """
+    court_id = mod.__name__
+    if checkpoint is not None:
+        iterable = (
+            item for item in iterable if not checkpoint.is_done(court_id, item)
+        )
+    for item, site in _map_unordered(
+        lambda item: _backscrape_item(mod, item), iterable, max_workers
+    ):
+        if site is None:
+            continue
+        yield item, site
+        if checkpoint is not None:
+            checkpoint.mark_done(court_id, item, site)
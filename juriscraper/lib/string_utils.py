@@ -1,9 +1,11 @@
 import calendar
+import datetime as dt_module
+import os
 import re
 import string
 from datetime import timedelta
+from functools import lru_cache
 
-import geonamescache
 from dateutil import parser
 
 # For use in titlecase
@@ -282,6 +284,15 @@ def fix_camel_case(s):
     + "|cross(--?|/)appell(ees|ant)s?|deceased"
 )
 BAD_WORDS = re.compile(r"^(%s)(,|\.)?$" % BW, re.I)
+# BAD_WORDS, for every word of a string of words separated by single spaces.
+BAD_WORDS_INLINE = re.compile(r"(?<![^ ])(%s)(,|\.)?(?![^ ])" % BW, re.I)
+VS = re.compile(r"\svs\.?\s", re.I)
+LOWER_V = re.compile(r"\sv\.?\s")
+LEADING_NOS = re.compile(r"^Nos?\.\s+")
+
+# The most strings to remember the cleaned versions of. Case names and
+# parties repeat a lot, within a page and across pages.
+STRING_CACHE_SIZE = 8192
 
 
 def harmonize(text):
@@ -300,20 +311,20 @@ def harmonize(text):
     """
     if not isinstance(text, str):
         text = str(text)
+    return _harmonize(text)
+
 
+@lru_cache(maxsize=STRING_CACHE_SIZE)
+def _harmonize(text):
     # replace vs. with v.
-    text = re.sub(re.compile(r"\svs\.?\s", re.IGNORECASE), " v. ", text)
+    text = VS.sub(" v. ", text)
 
     # replace lower case v without a period with v.
-    text = re.sub(r"\sv\.?\s", " v. ", text)
+    text = LOWER_V.sub(" v. ", text)
 
-    # Remove the BAD_WORDS.
-    text = text.split()
-    cleaned_text = []
-    for word in text:
-        word = re.sub(BAD_WORDS, "", word)
-        cleaned_text.append(word)
-    text = " ".join(cleaned_text)
+    # Remove the BAD_WORDS, leaving the space around them, as if each word
+    # had been checked on its own.
+    text = BAD_WORDS_INLINE.sub("", " ".join(text.split()))
 
     # split on all ' v. ' and then deal with United States variations.
     harmonized_parts = []
@@ -324,23 +335,34 @@ def harmonize(text):
             harmonized_parts.append("United States")
         elif party.lower() == "the state":
             harmonized_parts.append("State")
-        else:
+        elif party == "US":
             # needed here, because we can't put "US" as a case-insensitive
             # word into the UNITED_STATES regex.
-            party = re.sub(re.compile(r"^US$"), "United States", party)
+            harmonized_parts.append("United States")
+        else:
             # no match
             harmonized_parts.append(party)
 
     result = " v. ".join(harmonized_parts)
 
     # Remove the ET_AL words.
-    result = re.sub(ET_AL, "", result)
+    result = ET_AL.sub("", result)
 
     # Fix the No. and Nos.
     if result.startswith("No.") or result.startswith("Nos."):
-        result = re.sub(r"^Nos?\.\s+", "", result)
+        result = LEADING_NOS.sub("", result)
 
-    return clean_string(result)
+    return _clean_string(result)
+
+
+# Everything that \s matches, which is what str.isspace() is true for.
+WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002"
+    "\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029"
+    "\u202f\u205f\u3000"
+)
+# Stripped from both ends of each party by clean_string.
+BAD_PUNCTUATION = "-–_/;," + WHITESPACE
 
 
 def clean_string(s):
@@ -355,7 +377,11 @@ def clean_string(s):
     # if not already unicode, make it unicode, dropping invalid characters
     # if not isinstance(s, unicode):
     s = force_unicode(s, errors="ignore")
+    return _clean_string(s)
 
+
+@lru_cache(maxsize=STRING_CACHE_SIZE)
+def _clean_string(s):
     # Get rid of HTML encoded chars
     s = (
         s.replace("&rsquo;", "'")
@@ -378,27 +404,18 @@ def clean_string(s):
     # Get rid of weird punctuation
     s = s.replace("*", "").replace("#", "").replace(";", "")
 
-    # Strip bad stuff from the end of lines. Python's strip fails here because
-    # we don't know the order of the various punctuation items to be stripped.
-    # We split on the v., and handle fixes at either end of plaintiff or
-    # appellant.
-    bad_punctuation = r"(-|–|_|/|;|,|\s)*"
-    bad_endings = re.compile(r"%s$" % bad_punctuation)
-    bad_beginnings = re.compile(r"^%s" % bad_punctuation)
-
-    s = s.split(" v. ")
-    cleaned_string = []
-    for frag in s:
-        frag = re.sub(bad_endings, "", frag)
-        frag = re.sub(bad_beginnings, "", frag)
-        cleaned_string.append(frag)
-    s = " v. ".join(cleaned_string)
+    # Strip bad stuff from the end of lines. We split on the v., and handle
+    # fixes at either end of plaintiff or appellant.
+    s = " v. ".join(
+        frag.rstrip(BAD_PUNCTUATION).lstrip(BAD_PUNCTUATION)
+        for frag in s.split(" v. ")
+    )
 
     # get rid of '\t\n\x0b\x0c\r ', and replace them with a single space.
     s = " ".join(s.split())
 
     # Convert non-breaking spaces to regular spaces
-    s = s.replace("\u00A0", " ")
+    s = s.replace("\u00a0", " ")
 
     return s
 
@@ -487,15 +504,59 @@ def trunc(s, length, ellipsis=None):
         return s
 
 
-def convert_date_string(date_string, fuzzy=False, datetime=False):
-    """Sanitize date string and convert into standard date object
+# Dates that are common enough to parse without dateutil. Each must give
+# exactly what dateutil would, so anything out of the ordinary (two-digit
+# years, day-first dates, times, zones) is left to it.
+NUMERIC_DATE_RE = re.compile(r"([0-9]{1,2})([/-])([0-9]{1,2})\2([0-9]{4})")
+ISO_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})")
+MONTH_NAME_DATE_RE = re.compile(
+    r"([a-z]{3,9})\.? ([0-9]{1,2}),? ([0-9]{4})", re.I
+)
+MONTH_NUMBERS = {
+    name.lower(): number
+    for names in (calendar.month_name, calendar.month_abbr)
+    for number, name in enumerate(names)
+    if name
+}
 
-    :param date_string: A string to convert to a datetime object.
-    :param fuzzy: whether fuzzy string matching should be used, as defined by
-    dateutil.
-    :param datetime: If True, return a datetime object. If false, cast to a
-    date.
-    :return: datetime or date object, depending on the datetime parameter.
+
+def parse_common_date_format(date_string):
+    """Parse the few date formats that courts use most, without dateutil.
+
+    :param date_string: A stripped date string, like "01/31/2020",
+    "2020-01-31", or "January 31, 2020".
+    :return: A datetime at midnight, or None if the string isn't in one of
+    the formats, or isn't a real date.
+    """
+    try:
+        m = NUMERIC_DATE_RE.fullmatch(date_string)
+        if m:
+            month, day, year = int(m.group(1)), int(m.group(3)), m.group(4)
+            if month > 12:
+                # dateutil swaps the day and month for these.
+                return None
+            return dt_module.datetime(int(year), month, day)
+        m = ISO_DATE_RE.fullmatch(date_string)
+        if m:
+            return dt_module.datetime(*map(int, m.groups()))
+        m = MONTH_NAME_DATE_RE.fullmatch(date_string)
+        if m:
+            month = MONTH_NUMBERS.get(m.group(1).lower())
+            if month is None:
+                return None
+            return dt_module.datetime(int(m.group(3)), month, int(m.group(2)))
+    except ValueError:
+        # Not a real date. Let dateutil raise its own error.
+        return None
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(date_string, fuzzy, today):
+    """Parse a date string, remembering the result.
+
+    dateutil fills in missing parts of a date from the current date, so
+    today is part of the cache key, even though it isn't used.
     """
     date_string = date_string.replace("(", "")
     date_string = date_string.replace(")", "")
@@ -507,7 +568,28 @@ def convert_date_string(date_string, fuzzy=False, datetime=False):
     if date_string == "N/A":
         return None
 
-    dt = parser.parse(date_string, fuzzy=fuzzy)
+    dt = parse_common_date_format(date_string)
+    if dt is None:
+        dt = parser.parse(date_string, fuzzy=fuzzy)
+    return dt
+
+
+def convert_date_string(date_string, fuzzy=False, datetime=False):
+    """Sanitize date string and convert into standard date object
+
+    Common formats are parsed directly, others with dateutil. Results are
+    cached, since the same dates tend to come up again and again.
+
+    :param date_string: A string to convert to a datetime object.
+    :param fuzzy: whether fuzzy string matching should be used, as defined by
+    dateutil.
+    :param datetime: If True, return a datetime object. If false, cast to a
+    date.
+    :return: datetime or date object, depending on the datetime parameter.
+    """
+    dt = _parse_date_string(date_string, fuzzy, dt_module.date.today())
+    if dt is None:
+        return None
     if datetime:
         return dt
     else:
@@ -547,14 +629,194 @@ def normalize_dashes(raw_string):
     return raw_string
 
 
-class CaseNameTweaker:
-    def __init__(self):
-        self._bad_words = None
-        super().__init__()
+# The words that CaseNameTweaker.bad_words is made from, one per line. Made
+# with write_bad_words_file, because building it from geonamescache takes a
+# while, and every process that makes short case names needs it.
+BAD_WORDS_PATH = os.path.join(os.path.dirname(__file__), "bad_words.txt")
+
+
+def make_bad_words():
+    """Make the sorted list of lowercase words that CaseNameTweaker.bad_words
+    is made from. See that property for what it includes.
+    """
+    acros = [
+        "a.g.p.",
+        "c.d.c.",
+        "c.i.a.",
+        "d.o.c.",
+        "e.e.o.c.",
+        "e.p.a.",
+        "f.b.i.",
+        "f.c.c.",
+        "f.d.i.c.",
+        "f.s.b.",
+        "f.t.c.",
+        "i.c.c.",
+        "i.n.s.",
+        "i.r.s.",
+        "n.a.a.c.p.",
+        "n.l.r.b.",
+        "p.l.c.",
+        "s.e.c.",
+        "s.p.a.",
+        "s.r.l.",
+        "u.s.",
+        "u.s.a.",
+        "u.s.e.e.o.c.",
+        "u.s.e.p.a.",
+    ]
+    acros_sans_dots = [acro.replace(".", "") for acro in acros]
+    # corp_acros = ['L.L.C.', 'L.L.L.P.', 'L.L.P.', 'L.P.', 'P.A.', 'P.C.',
+    #              'P.L.L.C.',c ]
+    # corp_acros_sans_dots = [acro.replace('.', '') for acro in corp_acros]
+    common_names = [
+        "state",
+        "people",
+        "smith",
+        "johnson",
+        "commissioner",
+    ]
+
+    ags = [
+        "Akerman",
+        "Ashcroft",
+        "Barr",
+        "Bates",
+        "Bell",
+        "Berrien",
+        "Biddle",
+        "Black",
+        "Bonaparte",
+        "Bork",
+        "Bradford",
+        "Breckinridge",
+        "Brewster",
+        "Brownell",
+        "Butler",
+        "Civiletti",
+        "Clark",
+        "Clement",
+        "Clifford",
+        "Crittenden",
+        "Cummings",
+        "Cushing",
+        "Daugherty",
+        "Devens",
+        "Evarts",
+        "Filip",
+        "Garland",
+        "Gerson",
+        "Gilpin",
+        "Gonzales",
+        "Gregory",
+        "Griggs",
+        "Grundy",
+        "Harmon",
+        "Hoar",
+        "Holder",
+        "Jackson",
+        "Johnson",
+        "Katzenbach",
+        "Keisler",
+        "Kennedy",
+        "Kleindienst",
+        "Knox",
+        "Lee",
+        "Legaré",
+        "Levi",
+        "Lincoln",
+        "Lynch",
+        "MacVeagh",
+        "Mason",
+        "McGranery",
+        "McGrath",
+        "McKenna",
+        "McReynolds",
+        "Meese",
+        "Miller",
+        "Mitchell",
+        "Moody",
+        "Mukasey",
+        "Murphy",
+        "Nelson",
+        "Olney",
+        "Palmer",
+        "Pierrepont",
+        "Pinkney",
+        "Randolph",
+        "Reno",
+        "Richardson",
+        "Rodney",
+        "Rogers",
+        "Rush",
+        "Sargent",
+        "Saxbe",
+        "Sessions",
+        "Smith",
+        "Speed",
+        "Stanbery",
+        "Stanton",
+        "Stone",
+        "Taft",
+        "Taney",
+        "Thornburgh",
+        "Toucey",
+        "Whitacker",
+        "Wickersham",
+        "Williams",
+        "Wirt",
+    ]
+    # self.corp_acros = corp_acros + corp_acros_sans_dots
+    bad_words = (
+        acros
+        + acros_sans_dots
+        + common_names
+        + ags
+        + CaseNameTweaker.make_geographies_list()
+    )
+    return sorted({s.lower() for s in bad_words})
+
+
+def write_bad_words_file(path=BAD_WORDS_PATH):
+    """Write make_bad_words() to path, for load_bad_words.
+
+    Run this whenever the words or geonamescache change.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(f"{word}\n" for word in make_bad_words()))
+
+
+def expand_bad_words(words):
+    """Add the variations of words with punctuation after them.
 
+    :param words: Lowercase words, as made by make_bad_words.
+    :return: A frozenset of the words and their variations.
+    """
+    bad_words = set(words)
+    for word in words:
+        for punctuation in string.punctuation:
+            if not word.endswith(punctuation):
+                bad_words.add(f"{word}{punctuation}")
+    return frozenset(bad_words)
+
+
+@lru_cache(maxsize=None)
+def load_bad_words(path=BAD_WORDS_PATH):
+    """Load the bad words written by write_bad_words_file.
+
+    They're loaded once per process, so load them before forking workers to
+    share them.
+
+    :return: A frozenset, from expand_bad_words.
+    """
+    with open(path, encoding="utf-8") as f:
+        return expand_bad_words(f.read().splitlines())
+
+
+class CaseNameTweaker:
     @property
     def bad_words(self):
-        """A list of words that shouldn't be in small case names according to
+        """A set of words that shouldn't be in small case names according to
         Blue Book rules.
 
         Includes:
@@ -567,165 +829,19 @@ def bad_words(self):
          - States
          - Punctuation and capitalization variations on the above
 
-        Created lazily and then cached the first time the property is called.
+        Loaded from BAD_WORDS_PATH the first time any CaseNameTweaker needs
+        it, and then shared by all of them.
         """
-        if self._bad_words is not None:
-            return self._bad_words
-
-        acros = [
-            "a.g.p.",
-            "c.d.c.",
-            "c.i.a.",
-            "d.o.c.",
-            "e.e.o.c.",
-            "e.p.a.",
-            "f.b.i.",
-            "f.c.c.",
-            "f.d.i.c.",
-            "f.s.b.",
-            "f.t.c.",
-            "i.c.c.",
-            "i.n.s.",
-            "i.r.s.",
-            "n.a.a.c.p.",
-            "n.l.r.b.",
-            "p.l.c.",
-            "s.e.c.",
-            "s.p.a.",
-            "s.r.l.",
-            "u.s.",
-            "u.s.a.",
-            "u.s.e.e.o.c.",
-            "u.s.e.p.a.",
-        ]
-        acros_sans_dots = [acro.replace(".", "") for acro in acros]
-        # corp_acros = ['L.L.C.', 'L.L.L.P.', 'L.L.P.', 'L.P.', 'P.A.', 'P.C.',
-        #              'P.L.L.C.',c ]
-        # corp_acros_sans_dots = [acro.replace('.', '') for acro in corp_acros]
-        common_names = [
-            "state",
-            "people",
-            "smith",
-            "johnson",
-            "commissioner",
-        ]
-
-        ags = [
-            "Akerman",
-            "Ashcroft",
-            "Barr",
-            "Bates",
-            "Bell",
-            "Berrien",
-            "Biddle",
-            "Black",
-            "Bonaparte",
-            "Bork",
-            "Bradford",
-            "Breckinridge",
-            "Brewster",
-            "Brownell",
-            "Butler",
-            "Civiletti",
-            "Clark",
-            "Clement",
-            "Clifford",
-            "Crittenden",
-            "Cummings",
-            "Cushing",
-            "Daugherty",
-            "Devens",
-            "Evarts",
-            "Filip",
-            "Garland",
-            "Gerson",
-            "Gilpin",
-            "Gonzales",
-            "Gregory",
-            "Griggs",
-            "Grundy",
-            "Harmon",
-            "Hoar",
-            "Holder",
-            "Jackson",
-            "Johnson",
-            "Katzenbach",
-            "Keisler",
-            "Kennedy",
-            "Kleindienst",
-            "Knox",
-            "Lee",
-            "Legaré",
-            "Levi",
-            "Lincoln",
-            "Lynch",
-            "MacVeagh",
-            "Mason",
-            "McGranery",
-            "McGrath",
-            "McKenna",
-            "McReynolds",
-            "Meese",
-            "Miller",
-            "Mitchell",
-            "Moody",
-            "Mukasey",
-            "Murphy",
-            "Nelson",
-            "Olney",
-            "Palmer",
-            "Pierrepont",
-            "Pinkney",
-            "Randolph",
-            "Reno",
-            "Richardson",
-            "Rodney",
-            "Rogers",
-            "Rush",
-            "Sargent",
-            "Saxbe",
-            "Sessions",
-            "Smith",
-            "Speed",
-            "Stanbery",
-            "Stanton",
-            "Stone",
-            "Taft",
-            "Taney",
-            "Thornburgh",
-            "Toucey",
-            "Whitacker",
-            "Wickersham",
-            "Williams",
-            "Wirt",
-        ]
-        # self.corp_acros = corp_acros + corp_acros_sans_dots
-        bad_words = (
-            acros
-            + acros_sans_dots
-            + common_names
-            + ags
-            + self.make_geographies_list()
-        )
-
-        # Add variations with punctuation
-        punctuation_bad_words = []
-        for word in bad_words:
-            for punctuation in string.punctuation:
-                if not word.endswith(punctuation):
-                    punctuation_bad_words.append(f"{word}{punctuation}")
-        bad_words = bad_words + punctuation_bad_words
-
-        bad_words = [s.lower() for s in bad_words]
-
-        self._bad_words = bad_words
-        return bad_words
+        return load_bad_words()
 
     @staticmethod
     def make_geographies_list():
         """Make a flat list of cities, counties and states that we can exclude
         from short names.
         """
+        # Only needed to make bad_words.txt, so not imported at the top.
+        import geonamescache
+
         geonames = geonamescache.GeonamesCache()
 
         # Make a list of cities with big populations.
@@ -20,10 +20,6 @@
 
 from dateutil.rrule import WEEKLY, rrule
 from lxml import html
-from selenium.webdriver import ActionChains
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
 from juriscraper.AbstractSite import logger
 from juriscraper.DeferringList import DeferringList
@@ -82,6 +78,11 @@ def _download(self, request_dict={}):
             )
             return html_tree_list
         else:
+            from selenium.webdriver import ActionChains
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support import expected_conditions as EC
+            from selenium.webdriver.support.ui import WebDriverWait
+
             logger.info("Running Selenium browser...")
             self.initiate_webdriven_session()
             if self.court_name == "sc":
@@ -1,34 +1,66 @@
-from .appellate_docket import AppellateDocketReport
-from .attachment_page import AttachmentPage
-from .case_query import CaseQuery
-from .case_query_advanced import CaseQueryAdvancedBankruptcy
-from .claims_register import ClaimsRegister
-from .docket_history_report import DocketHistoryReport
-from .docket_report import DocketReport
-from .download_confirmation_page import DownloadConfirmationPage
-from .email import NotificationEmail, S3NotificationEmail
-from .free_documents import FreeOpinionReport
-from .hidden_api import PossibleCaseNumberApi, ShowCaseDocApi
-from .http import PacerSession
-from .internet_archive import InternetArchive
-from .mobile_query import MobileQuery
-from .rss_feeds import PacerRssFeed
+import importlib
+
+# The module each of the names below is in. Importing every report is slow,
+# so each one is imported the first time it's used (PEP 562).
+_MODULES = {
+    "AppellateDocketReport": ".appellate_docket",
+    "AttachmentPage": ".attachment_page",
+    "CaseQuery": ".case_query",
+    "CaseQueryAdvancedBankruptcy": ".case_query_advanced",
+    "ClaimsRegister": ".claims_register",
+    "DocketHistoryReport": ".docket_history_report",
+    "DocketReport": ".docket_report",
+    "DownloadConfirmationPage": ".download_confirmation_page",
+    "FileLoginStore": ".session_pool",
+    "FreeOpinionReport": ".free_documents",
+    "InternetArchive": ".internet_archive",
+    "LoginStore": ".session_pool",
+    "MobileQuery": ".mobile_query",
+    "NotificationEmail": ".email",
+    "S3NotificationEmail": ".email",
+    "PacerRssFeed": ".rss_feeds",
+    "PacerSession": ".http",
+    "PacerSessionPool": ".session_pool",
+    "PossibleCaseNumberApi": ".hidden_api",
+    "ShowCaseDocApi": ".hidden_api",
+}
 
 __all__ = [
-    AppellateDocketReport,
-    AttachmentPage,
-    CaseQuery,
-    CaseQueryAdvancedBankruptcy,
-    ClaimsRegister,
-    DocketHistoryReport,
-    DocketReport,
-    DownloadConfirmationPage,
-    FreeOpinionReport,
-    InternetArchive,
-    NotificationEmail,
-    S3NotificationEmail,
-    PacerRssFeed,
-    PacerSession,
-    PossibleCaseNumberApi,
-    ShowCaseDocApi,
+    "AppellateDocketReport",
+    "AttachmentPage",
+    "CaseQuery",
+    "CaseQueryAdvancedBankruptcy",
+    "ClaimsRegister",
+    "DocketHistoryReport",
+    "DocketReport",
+    "DownloadConfirmationPage",
+    "FileLoginStore",
+    "FreeOpinionReport",
+    "InternetArchive",
+    "LoginStore",
+    "MobileQuery",
+    "NotificationEmail",
+    "S3NotificationEmail",
+    "PacerRssFeed",
+    "PacerSession",
+    "PacerSessionPool",
+    "PossibleCaseNumberApi",
+    "ShowCaseDocApi",
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name = _MODULES[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache it, so that this isn't called for the name again.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,6 +6,7 @@
 
 from ..lib.judge_parsers import normalize_judge_string
 from ..lib.log_tools import make_default_logger
+from ..lib.network_utils import StreamedResponse
 from ..lib.string_utils import (
     clean_string,
     convert_date_string,
@@ -40,6 +41,8 @@ class AppellateDocketReport(BaseDocketReport, BaseReport):
 
     CACHE_ATTRS = ["metadata", "docket_entries"]
 
+    HTML5_SINGLE_PASS = True
+
     ERROR_STRINGS = BaseReport.ERROR_STRINGS + [
         r"The link to this page may not have originated from within CM/ECF.",
         r'Click on the "Accept Charges and Retrieve" button ONCE at the '
@@ -303,6 +306,28 @@ def download_pdf(self, pacer_doc_id, pacer_case_id=None):
         identified and so is ignored below.
         # noqa
         """
+        return self._get_pdf(pacer_doc_id, pacer_case_id)
+
+    def download_pdf_to(self, sink, pacer_doc_id, pacer_case_id=None):
+        """Download a PDF from an appellate court, writing it to sink as it
+        arrives, so that it's never all in memory at once.
+
+        :param sink: A file-like object opened for writing bytes.
+        :param pacer_doc_id: The document ID for the item.
+        :param pacer_case_id: The case ID for the docket
+        :return: request.Response object the PDF was in, its body having been
+        written to sink, if one can be found, else returns None.
+        """
+        r = self._get_pdf(pacer_doc_id, pacer_case_id, stream=True)
+        if r is not None:
+            StreamedResponse(r, 0).write_to(sink)
+        return r
+
+    def _get_pdf(self, pacer_doc_id, pacer_case_id=None, stream=False):
+        """Request a PDF for download_pdf and download_pdf_to.
+
+        :return: The response, if it's a PDF, else None.
+        """
         assert (
             self.session is not None
         ), "session attribute of AppellateDocketReport cannot be None."
@@ -318,7 +343,7 @@ def download_pdf(self, pacer_doc_id, pacer_case_id=None):
         logger.info(
             "GETting PDF at URL: %s with params: %s", self.url, query_params
         )
-        r = self.session.get(self.url, params=query_params)
+        r = self.session.get(self.url, params=query_params, stream=stream)
         r.raise_for_status()
         if is_pdf(r):
             logger.info(
@@ -327,6 +352,7 @@ def download_pdf(self, pacer_doc_id, pacer_case_id=None):
                 self.court_id,
             )
             return r
+        r.close()
         return None
 
     @property
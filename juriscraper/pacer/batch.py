@@ -0,0 +1,91 @@
+from collections import Counter, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .docket_report import DocketReport
+
+
+def query_dockets(
+    session_pool,
+    cases,
+    max_workers=8,
+    max_per_court=2,
+    report_class=DocketReport,
+):
+    """Query many dockets at once.
+
+    Dockets from different courts are queried at the same time, but no more
+    than max_per_court from any one court, so that no court gets more than
+    its share of requests. Courts take turns, so a long list of cases from
+    one court doesn't hold up the others.
+
+    >>> pool = PacerSessionPool(username, password)
+    >>> cases = [("cand", "186730"), ("nysd", "518286", {"doc_num_start": 5})]
+    >>> for (court_id, pacer_case_id), data in query_dockets(pool, cases):
+    ...     if isinstance(data, Exception):
+    ...         ...
+
+    :param session_pool: A PacerSessionPool, to borrow sessions from.
+    :param cases: An iterable of (court_id, pacer_case_id) tuples, or of
+    (court_id, pacer_case_id, options) tuples where options is a dict of
+    keyword arguments for the report's query method.
+    :param max_workers: The most dockets to query at once.
+    :param max_per_court: The most dockets to query at once from each court.
+    :param report_class: The report to query with.
+    :return: Yields ((court_id, pacer_case_id), result) tuples as each query
+    finishes, where result is the report's data, or the exception that the
+    query raised.
+    """
+    pending = defaultdict(deque)
+    for court_id, pacer_case_id, *options in cases:
+        pending[court_id].append(
+            (pacer_case_id, options[0] if options else {})
+        )
+    # The courts with dockets left to query, in the order they take turns.
+    courts = deque(pending)
+    running = {}
+    in_flight = Counter()
+
+    def query(court_id, pacer_case_id, options):
+        with session_pool.session() as session:
+            report = report_class(court_id, session)
+            report.query(pacer_case_id, **options)
+            return report.data
+
+    def submit_more(executor):
+        """Give each court with room for another query one, in turn, until
+        there are max_workers running or there's nothing else to run.
+        """
+        while len(running) < max_workers:
+            submitted = False
+            for _ in range(len(courts)):
+                court_id = courts.popleft()
+                dockets = pending[court_id]
+                if (
+                    in_flight[court_id] < max_per_court
+                    and len(running) < max_workers
+                ):
+                    pacer_case_id, options = dockets.popleft()
+                    future = executor.submit(
+                        query, court_id, pacer_case_id, options
+                    )
+                    running[future] = (court_id, pacer_case_id)
+                    in_flight[court_id] += 1
+                    submitted = True
+                if dockets:
+                    courts.append(court_id)
+            if not submitted:
+                return
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        submit_more(executor)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                court_id, pacer_case_id = running.pop(future)
+                in_flight[court_id] -= 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                yield (court_id, pacer_case_id), result
+            submit_more(executor)
@@ -25,6 +25,7 @@ class ClaimsRegister(BaseDocketReport, BaseReport):
 
     PATH = "cgi-bin/SearchClaims.pl"
     CACHE_ATTRS = ["claims", "metadata"]
+    HTML5_SINGLE_PASS = True
     ERROR_STRINGS = BaseReport.ERROR_STRINGS + [
         "No claims found for this case using selection criteria entered"
     ]
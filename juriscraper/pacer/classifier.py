@@ -0,0 +1,79 @@
+import re
+from typing import Iterable, NamedTuple, Optional, Union
+
+
+class Rule(NamedTuple):
+    """A pattern that identifies a kind of page.
+
+    :param pattern: Either bytes, to look for literally, or a compiled bytes
+    regex, to search for.
+    :param kind: What it means if the pattern is found, e.g. "sealed".
+    :param message: A template for a message about it, which is formatted with
+    the keyword arguments given to Classifier.classify.
+    """
+
+    pattern: Union[bytes, "re.Pattern[bytes]"]
+    kind: str
+    message: str = ""
+
+
+class Classification(NamedTuple):
+    """What a Classifier found: the kind of the rule, and its message."""
+
+    kind: str
+    message: str
+
+
+class Classifier:
+    """Classify responses by looking for each of a table of rules in them.
+
+    Rules are tried in the order they're given, so put the ones that should
+    win when several match first. Searching stops at the first match.
+
+    Literal patterns are looked for with bytes.find, which is much faster in
+    CPython than combining them into one big regex would be, since the re
+    module checks every alternative at every position.
+
+    :param rules: An iterable of Rules.
+    :param max_bytes: If given, only this many bytes at the start of the
+    content are searched.
+    """
+
+    def __init__(self, rules: Iterable[Rule], max_bytes: Optional[int] = None):
+        self.rules = tuple(rules)
+        self.max_bytes = max_bytes
+
+    def _head(self, content: bytes) -> bytes:
+        if self.max_bytes is not None and len(content) > self.max_bytes:
+            return content[: self.max_bytes]
+        return content
+
+    def search(self, content: bytes, kind: Optional[str] = None):
+        """Find the first rule that matches content.
+
+        :param content: The bytes to search.
+        :param kind: If given, only rules of this kind are tried.
+        :return: The Rule, or None if none match.
+        """
+        content = self._head(content)
+        for rule in self.rules:
+            if kind is not None and rule.kind != kind:
+                continue
+            if isinstance(rule.pattern, bytes):
+                if rule.pattern in content:
+                    return rule
+            elif rule.pattern.search(content):
+                return rule
+        return None
+
+    def classify(self, content: bytes, **context) -> Optional[Classification]:
+        """Classify content by the first rule that matches it.
+
+        :param content: The bytes to search.
+        :param context: Values for the message template.
+        :return: A Classification, or None if no rule matches.
+        """
+        rule = self.search(content)
+        if rule is None:
+            return None
+        return Classification(rule.kind, rule.message.format(**context))
@@ -5,8 +5,9 @@
 
 from dateutil.tz import gettz
 from lxml import etree
-from lxml.html import HtmlElement, fromstring, tostring
+from lxml.html import HtmlElement, HtmlElementClassLookup, fromstring, tostring
 
+from ..lib.html_utils import clean_html, strip_bad_html_tags_insecure
 from ..lib.judge_parsers import normalize_judge_string
 from ..lib.log_tools import make_default_logger
 from ..lib.string_utils import (
@@ -330,6 +331,8 @@ class DocketReport(BaseDocketReport, BaseReport):
         "is_adversary_proceeding",
     ]
 
+    HTML5_SINGLE_PASS = True
+
     ERROR_STRINGS = BaseReport.ERROR_STRINGS + [
         "The report may take a long time to run because this case has many "
         "docket entries",
@@ -954,40 +957,142 @@ def docket_entries(self):
 
         docket_entries = []
         for row in docket_entry_rows:
-            de = {}
-            cells = row.xpath("./td[not(./input)]")
-            if len(cells) == 0:
-                # In some instances, the document entry table has an empty row
-                # <tr></tr>. See docket bankruptcy wiwb examples.
-                continue
-            if len(cells) == 4:
-                # In some instances, the document entry table has an extra
-                # column. See almb, 92-04963
-                del cells[1]
-
-            date_filed_str = force_unicode(cells[0].text_content())
-            if not date_filed_str.strip():
-                # Some older dockets have missing dates. Press on.
-                continue
-            de["date_filed"] = convert_date_string(date_filed_str)
-            de["document_number"] = self._get_document_number(cells[1])
-            results = self._get_pacer_doc_id_and_seq_no(
-                cells[1], de["document_number"]
-            )
-            de["pacer_doc_id"], de["pacer_seq_no"] = results[0], results[1]
-            de["description"] = self._get_description(cells)
-
-            number = de["document_number"]
-            if number is not None and not number.isdigit():
-                # Some courts use the word "doc" instead of a docket number. We
-                # skip these for now.
-                continue
-            docket_entries.append(de)
+            de = self._parse_docket_entry_row(row)
+            if de is not None:
+                docket_entries.append(de)
 
         docket_entries = clean_court_object(docket_entries)
         self._docket_entries = docket_entries
         return docket_entries
 
+    def _parse_docket_entry_row(self, row):
+        """Parse a row of the docket entry table into a dict, or return None
+        if the row isn't a docket entry.
+        """
+        de = {}
+        cells = row.xpath("./td[not(./input)]")
+        if len(cells) == 0:
+            # In some instances, the document entry table has an empty row
+            # <tr></tr>. See docket bankruptcy wiwb examples.
+            return None
+        if len(cells) == 4:
+            # In some instances, the document entry table has an extra
+            # column. See almb, 92-04963
+            del cells[1]
+
+        date_filed_str = force_unicode(cells[0].text_content())
+        if not date_filed_str.strip():
+            # Some older dockets have missing dates. Press on.
+            return None
+        de["date_filed"] = convert_date_string(date_filed_str)
+        de["document_number"] = self._get_document_number(cells[1])
+        results = self._get_pacer_doc_id_and_seq_no(
+            cells[1], de["document_number"]
+        )
+        de["pacer_doc_id"], de["pacer_seq_no"] = results[0], results[1]
+        de["description"] = self._get_description(cells)
+
+        number = de["document_number"]
+        if number is not None and not number.isdigit():
+            # Some courts use the word "doc" instead of a docket number. We
+            # skip these for now.
+            return None
+        return de
+
+    def iter_docket_entries(self, text_chunks):
+        """Parse the docket entries of a docket as its HTML comes in, and
+        yield them one at a time.
+
+        Unlike docket_entries, this doesn't parse the whole docket into
+        self.tree first. Each row of the docket entry table is parsed as soon
+        as it is complete, and then thrown away, so memory use stays flat no
+        matter how many entries the docket has. Use it for huge dockets,
+        when only the entries are needed. None of the other properties are
+        available this way, and self.tree is left alone.
+
+        The HTML is parsed with lxml's HTML parser instead of html5lib, and
+        the validity of the docket isn't checked, since that needs the whole
+        docket at once.
+
+        :param text_chunks: The HTML of the docket, either as a str or as an
+        iterable of str, such as a file opened in text mode or
+        response.iter_content(decode_unicode=True).
+        :return: Yields docket entry dicts, as in docket_entries.
+        """
+        if isinstance(text_chunks, str):
+            text_chunks = [text_chunks]
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        parser.set_element_class_lookup(HtmlElementClassLookup())
+
+        def read_events():
+            # libxml2 can lose content when a tag is split between two feeds
+            # (e.g., "</scr" and "ipt>"), so each chunk is only fed up to its
+            # last "<", and the rest is carried over to the next one.
+            rest = ""
+            for chunk in text_chunks:
+                text = rest + chunk
+                split_at = text.rfind("<")
+                if split_at <= 0:
+                    rest = text
+                    continue
+                text, rest = text[:split_at], text[split_at:]
+                parser.feed(clean_html(text))
+                yield from parser.read_events()
+            if rest:
+                parser.feed(clean_html(rest))
+            # The parser holds on to the end of the document until it's
+            # closed.
+            parser.close()
+            yield from parser.read_events()
+
+        # For each open table, whether it is a docket entry table. See
+        # docket_entries for how they're identified. The tables that follow
+        # a docket entry table are docket entry tables too, so the parents
+        # of docket entry tables are kept as well.
+        tables = []
+        parents_of_entry_tables = set()
+        first_row = True
+        for event, element in read_events():
+            if element.tag == "table":
+                if event == "start":
+                    parent = element.getparent()
+                    is_entry_table = parent in parents_of_entry_tables
+                    tables.append(
+                        {"is_entry_table": is_entry_table, "excluded": False}
+                    )
+                else:
+                    table = tables.pop()
+                    if table["is_entry_table"]:
+                        parents_of_entry_tables.add(element.getparent())
+                continue
+            if event != "end" or element.tag != "tr" or not tables:
+                continue
+
+            row_text = element.text_content()
+            if "Docket Text" in row_text:
+                for table in tables:
+                    table["is_entry_table"] = True
+            if (
+                "Total file size of selected documents" in row_text
+                or "Footer format:" in row_text
+            ):
+                for table in tables:
+                    table["excluded"] = True
+            table = tables[-1]
+            if table["is_entry_table"] and not table["excluded"]:
+                if first_row:
+                    # Skip the header row.
+                    first_row = False
+                else:
+                    row = strip_bad_html_tags_insecure(element)
+                    de = self._parse_docket_entry_row(row)
+                    if de is not None:
+                        yield clean_court_object(de)
+                # Throw away the row, and the rows before it.
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
     @property
     def is_adversary_proceeding(self):
         if self._is_adversary_proceeding is not None:
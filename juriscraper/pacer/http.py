@@ -7,13 +7,50 @@
 from ..lib.exceptions import PacerLoginException
 from ..lib.html_utils import get_html_parsed_text, get_xml_parsed_text
 from ..lib.log_tools import make_default_logger
+from ..lib.network_utils import connection_pool
+from ..lib.rate_limit import rate_limiter
 from ..pacer.utils import is_pdf, is_text
+from .classifier import Classifier, Rule
 
 logger = make_default_logger()
 
 requests.packages.urllib3.disable_warnings(exceptions.InsecureRequestWarning)
 
 
+# How to tell whether a page from PACER is one we're logged into.
+login_page_classifier = Classifier(
+    [
+        # Results from case number queries.
+        Rule(b"<case number=", "case_query"),
+        Rule(b"<request number=", "case_query"),
+        Rule(b'id="caseid"', "case_query"),
+        Rule(b"Cost: ", "case_query"),
+        Rule(re.compile(b"<message.*Cannot find"), "case_query"),
+        Rule(re.compile(b"<message.*Case Under Seal"), "case_query"),
+        # An unauthenticated PossibleCaseNumberApi XML result. The complete
+        # result looks like:
+        # <request number='1501084'>
+        #   <message text='Not logged in.  Please refresh this page.'/>
+        # </request>
+        Rule(re.compile(b"text.*Not logged in"), "not_logged_in"),
+        # Pages with logout links.
+        Rule(b"/cgi-bin/login.pl?logout", "logged_in"),
+        Rule(b"InvalidUserLogin.jsp", "logged_in"),
+        # A download confirmation page doesn't contain a logout link but we're
+        # logged into.
+        Rule(b"Download Confirmation", "logged_in"),
+        # When looking for a download confirmation page sometimes an appellate
+        # attachment page is returned instead, see:
+        # https://ecf.ca8.uscourts.gov/n/beam/servlet/TransportRoom?servlet=ShowDoc&pacer=i&dls_id=00802251695
+        Rule(b"Documents are attached to this filing", "logged_in"),
+        # Sometimes the document is completely unavailable and an error
+        # message is shown, see:
+        # https://ecf.ca11.uscourts.gov/n/beam/servlet/TransportRoom?servlet=ShowDoc/009033568259
+        Rule(b"The requested document cannot be displayed", "logged_in"),
+    ]
+)
+
+
 def check_if_logged_in_page(content: bytes) -> bool:
     """Is this a valid HTML page from PACER?
 
@@ -24,67 +61,12 @@ def check_if_logged_in_page(content: bytes) -> bool:
     converting data to text using an unknown encoding. (see #564)
     :return boolean: True if logged in, False if not.
     """
-
-    valid_case_number_query = (
-        b"<case number=" in content
-        or b"<request number=" in content
-        or b'id="caseid"' in content
-        or b"Cost: " in content
-    )
-    no_results_case_number_query = re.search(b"<message.*Cannot find", content)
-    sealed_case_query = re.search(b"<message.*Case Under Seal", content)
-    if any(
-        [
-            valid_case_number_query,
-            no_results_case_number_query,
-            sealed_case_query,
-        ]
-    ):
-        not_logged_in = re.search(b"text.*Not logged in", content)
-        if not_logged_in:
-            # An unauthenticated PossibleCaseNumberApi XML result. Simply
-            # continue onwards. The complete result looks like:
-            # <request number='1501084'>
-            #   <message text='Not logged in.  Please refresh this page.'/>
-            # </request>
-            # An authenticated PossibleCaseNumberApi XML result.
-            return False
-        else:
-            return True
+    if login_page_classifier.search(content, "case_query"):
+        return not login_page_classifier.search(content, "not_logged_in")
 
     # Detect if we are logged in. If so, no need to do so. If not, we login
     # again below.
-    found_district_logout_link = b"/cgi-bin/login.pl?logout" in content
-    found_appellate_logout_link = b"InvalidUserLogin.jsp" in content
-
-    # A download confirmation page doesn't contain a logout link but we're
-    # logged into.
-    is_a_download_confirmation_page = b"Download Confirmation" in content
-    # When looking for a download confirmation page sometimes an appellate
-    # attachment page is returned instead, see:
-    # https://ecf.ca8.uscourts.gov/n/beam/servlet/TransportRoom?servlet=ShowDoc&pacer=i&dls_id=00802251695
-    appellate_attachment_page = (
-        b"Documents are attached to this filing" in content
-    )
-    # Sometimes the document is completely unavailable and an error message is
-    # shown, see:
-    # https://ecf.ca11.uscourts.gov/n/beam/servlet/TransportRoom?servlet=ShowDoc/009033568259
-    appellate_document_error = (
-        b"The requested document cannot be displayed" in content
-    )
-    if any(
-        [
-            found_district_logout_link,
-            found_appellate_logout_link,
-            is_a_download_confirmation_page,
-            appellate_attachment_page,
-            appellate_document_error,
-        ]
-    ):
-        # A normal HTML page we're logged into.
-        return True
-
-    return False
+    return login_page_classifier.search(content, "logged_in") is not None
 
 
 class PacerSession(requests.Session):
@@ -98,8 +80,19 @@ class PacerSession(requests.Session):
 
     LOGIN_URL = "https://pacer.login.uscourts.gov/services/cso-auth"
 
+    # The most requests per second to send to each court's host, shared with
+    # every other session in the process. If None, the process-wide default
+    # in juriscraper.lib.rate_limit is used.
+    rate_limit = None
+    rate_limit_burst = 1
+
     def __init__(
-        self, cookies=None, username=None, password=None, client_code=None
+        self,
+        cookies=None,
+        username=None,
+        password=None,
+        client_code=None,
+        login_store=None,
     ):
         """
         Instantiate a new PACER API Session with some Juriscraper defaults
@@ -107,6 +100,8 @@ def __init__(
         :param username: a PACER account username
         :param password: a PACER account password
         :param client_code: an optional PACER client code for the session
+        :param login_store: an optional LoginStore, to share logins with other
+        sessions instead of each logging in on its own
         """
         super().__init__()
         self.headers["User-Agent"] = "Juriscraper"
@@ -123,6 +118,23 @@ def __init__(
         self.username = username
         self.password = password
         self.client_code = client_code
+        self.login_store = login_store
+        # The generation of the login_store login the session's cookies are
+        # from. 0 if they aren't from one.
+        self.login_generation = 0
+        # Connections are borrowed from this pool, so that many sessions can
+        # share them. Set it to None to give the session its own.
+        self.connection_pool = connection_pool
+
+    def request(self, method, url, *args, **kwargs):
+        if self.connection_pool is not None:
+            self.connection_pool.mount(self, url)
+        return super().request(method, url, *args, **kwargs)
+
+    def close(self):
+        if self.connection_pool is not None:
+            self.connection_pool.release(self)
+        super().close()
 
     def get(self, url, auto_login=True, **kwargs):
         """Overrides request.Session.get with session retry logic.
@@ -133,9 +145,13 @@ def get(self, url, auto_login=True, **kwargs):
         """
         kwargs.setdefault("timeout", 300)
 
+        self._wait_for_rate_limit(url)
         r = super().get(url, **kwargs)
 
-        if b"This user has no access privileges defined." in r.content:
+        if (
+            not is_pdf(r)
+            and b"This user has no access privileges defined." in r.content
+        ):
             # This is a strange error that we began seeing in CM/ECF 6.3.1 at
             # ILND. You can currently reproduce it by logging in on the central
             # login page, selecting "Court Links" as your destination, and then
@@ -143,11 +159,13 @@ def get(self, url, auto_login=True, **kwargs):
             # The solution when this error shows up is to simply re-run the get
             # request, so that's what we do here. PACER needs some frustrating
             # and inelegant hacks sometimes.
+            self._wait_for_rate_limit(url)
             r = super().get(url, **kwargs)
         if auto_login:
             updated = self._login_again(r)
             if updated:
                 # Re-do the request with the new session.
+                self._wait_for_rate_limit(url)
                 return super().get(url, **kwargs)
         return r
 
@@ -176,11 +194,13 @@ def post(self, url, data=None, json=None, auto_login=True, **kwargs):
         else:
             kwargs.update({"data": data, "json": json})
 
+        self._wait_for_rate_limit(url)
         r = super().post(url, **kwargs)
         if auto_login:
             updated = self._login_again(r)
             if updated:
                 # Re-do the request with the new session.
+                self._wait_for_rate_limit(url)
                 return super().post(url, **kwargs)
         return r
 
@@ -193,8 +213,15 @@ def head(self, url, **kwargs):
         :return: requests.Response
         """
         kwargs.setdefault("timeout", 300)
+        self._wait_for_rate_limit(url)
         return super().head(url, **kwargs)
 
+    def _wait_for_rate_limit(self, url):
+        """Block until the process-wide rate limit for the host of url allows
+        another request.
+        """
+        rate_limiter.wait(url, self.rate_limit, self.rate_limit_burst)
+
     @staticmethod
     def _prepare_multipart_form_data(data):
         """
@@ -379,7 +406,10 @@ def _login_again(self, r):
             logger.info(
                 "Invalid/expired PACER session. Establishing new session."
             )
-            self.login()
+            if self.login_store is not None:
+                self.login_store.login(self)
+            else:
+                self.login()
             return True
         else:
             raise PacerLoginException(
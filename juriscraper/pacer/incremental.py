@@ -0,0 +1,289 @@
+import sqlite3
+import threading
+from datetime import date
+from typing import NamedTuple, Optional
+
+from ..lib.log_tools import make_default_logger
+
+logger = make_default_logger()
+
+
+class Watermark(NamedTuple):
+    """How far into a docket we've already got: the latest date an entry was
+    filed, and the highest document number.
+    """
+
+    date_filed: Optional[date] = None
+    document_number: Optional[int] = None
+
+    def max(self, other):
+        """Combine two watermarks, keeping the highest of each part."""
+
+        def highest(a, b):
+            if a is None or b is None:
+                return b if a is None else a
+            return max(a, b)
+
+        return Watermark(
+            highest(self.date_filed, other.date_filed),
+            highest(self.document_number, other.document_number),
+        )
+
+
+def _as_date(value):
+    """Dates are date objects in a report's data, but strings once it's been
+    through JSON.
+    """
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def get_watermark(docket):
+    """Get the watermark of a docket's entries.
+
+    :param docket: A docket, as in DocketReport.data.
+    :return: A Watermark.
+    """
+    watermark = Watermark()
+    for entry in docket.get("docket_entries", []):
+        document_number = entry.get("document_number")
+        if document_number and str(document_number).isdigit():
+            document_number = int(document_number)
+        else:
+            document_number = None
+        watermark = watermark.max(
+            Watermark(_as_date(entry.get("date_filed")), document_number)
+        )
+    return watermark
+
+
+def delta_query_options(watermark, by="date"):
+    """Get the options for DocketReport.query that get only the entries at
+    or after a watermark.
+
+    Dates are queried by when entries were entered, not filed, since an
+    entry can be entered long after the date it's filed on, like a
+    back-dated order or a document that's unsealed. An entry is never
+    entered before it's filed, so this gets every entry filed since the
+    watermark, and every one entered since, too. The entries on the
+    watermark itself are queried again, because more entries might have
+    been entered that day since, so merge the results into the docket with
+    merge_dockets to drop the ones you already have.
+
+    :param watermark: A Watermark, or None if there isn't one.
+    :param by: "date", to get the entries entered on or after the
+    watermark's date, or "document_number", to get the documents numbered at or after
+    its document number. Entries without document numbers, like minute
+    entries, are only found by date.
+    :return: A dict of keyword arguments for DocketReport.query. It's empty
+    if there's no watermark, so that the whole docket is queried.
+    """
+    if by not in ("date", "document_number"):
+        raise ValueError("Invalid value for 'by' parameter.")
+    if watermark is None:
+        return {}
+    if by == "date":
+        if watermark.date_filed is None:
+            return {}
+        return {
+            "date_range_type": "Entered",
+            "date_start": watermark.date_filed,
+        }
+    if watermark.document_number is None:
+        return {}
+    return {"doc_num_start": watermark.document_number}
+
+
+def entry_key(entry):
+    """What makes a docket entry the same entry in two queries.
+
+    Entries with documents are identified by their document's IDs. Those
+    without, like minute entries, by their date and text, so if a minute
+    entry's text is parsed differently by a later query, the docket ends up
+    with both versions of it.
+    """
+    if entry.get("pacer_doc_id"):
+        return entry["pacer_doc_id"], entry.get("pacer_seq_no")
+    return (
+        _as_date(entry.get("date_filed")),
+        entry.get("document_number"),
+        entry.get("description"),
+    )
+
+
+def merge_dockets(old, new):
+    """Merge the results of a delta query into a docket.
+
+    The metadata of the new docket wins, and its entries are added to the
+    old ones, replacing any that are the same entry (see entry_key). The old
+    parties are kept unless the new docket has some.
+
+    The entries are sorted by date filed, as DocketReport sorts them by
+    default, so back-dated entries go where they belong. Entries filed on
+    the same day keep the order they were in, old ones first. They aren't
+    sorted by document number, because PACER doesn't always list a day's
+    entries in that order.
+
+    :param old: A docket, as in DocketReport.data.
+    :param new: A docket with the entries since old was queried.
+    :return: The merged docket. Neither old nor new is changed.
+    """
+    merged = dict(old)
+    for key, value in new.items():
+        if key == "docket_entries":
+            continue
+        if key == "parties" and not value:
+            # Parties weren't asked for.
+            continue
+        merged[key] = value
+    entries = {}
+    for entry in old.get("docket_entries", []):
+        entries[entry_key(entry)] = entry
+    for entry in new.get("docket_entries", []):
+        entries[entry_key(entry)] = entry
+    merged["docket_entries"] = sorted(
+        entries.values(),
+        key=lambda entry: _as_date(entry.get("date_filed")) or date.min,
+    )
+    return merged
+
+
+class WatermarkStore:
+    """Keeps the watermark of each docket, in memory.
+
+    Subclass it and override _read and _write to keep them somewhere else,
+    like SqliteWatermarkStore does.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._watermarks = {}
+
+    def _read(self, court_id, pacer_case_id):
+        return self._watermarks.get((court_id, str(pacer_case_id)))
+
+    def _write(self, court_id, pacer_case_id, watermark):
+        """Save watermark, or as much of it as is higher than the one
+        that's saved.
+        """
+        key = (court_id, str(pacer_case_id))
+        with self._lock:
+            old = self._watermarks.get(key)
+            if old is not None:
+                watermark = old.max(watermark)
+            self._watermarks[key] = watermark
+
+    def get(self, court_id, pacer_case_id):
+        """:return: The docket's Watermark, or None if it doesn't have one."""
+        return self._read(court_id, pacer_case_id)
+
+    def update(self, court_id, pacer_case_id, docket):
+        """Raise the docket's watermark to cover the entries of docket.
+
+        Watermarks never go down, so this can be given just the new entries.
+        """
+        self._write(court_id, pacer_case_id, get_watermark(docket))
+
+
+class SqliteWatermarkStore(WatermarkStore):
+    """Keeps the watermark of each docket in an SQLite database, so they
+    last between runs, and can be shared by processes.
+
+    :param path: The path to the database. It's created if it doesn't exist.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks ("
+                "  court_id TEXT NOT NULL,"
+                "  pacer_case_id TEXT NOT NULL,"
+                "  date_filed TEXT,"
+                "  document_number INTEGER,"
+                "  PRIMARY KEY (court_id, pacer_case_id)"
+                ")"
+            )
+
+    def _read(self, court_id, pacer_case_id):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT date_filed, document_number FROM watermarks "
+                "WHERE court_id = ? AND pacer_case_id = ?",
+                (court_id, str(pacer_case_id)),
+            ).fetchone()
+        if row is None:
+            return None
+        return Watermark(_as_date(row[0]), row[1])
+
+    def _write(self, court_id, pacer_case_id, watermark):
+        date_filed = watermark.date_filed
+        if date_filed is not None:
+            date_filed = date_filed.isoformat()
+        # max() is NULL if either value is, so coalesce picks whichever
+        # isn't. It's done in one statement so that it's atomic.
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO watermarks VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (court_id, pacer_case_id) DO UPDATE SET "
+                "date_filed = coalesce(max(date_filed, excluded.date_filed), "
+                "date_filed, excluded.date_filed), "
+                "document_number = coalesce(max(document_number, "
+                "excluded.document_number), document_number, "
+                "excluded.document_number)",
+                (
+                    court_id,
+                    str(pacer_case_id),
+                    date_filed,
+                    watermark.document_number,
+                ),
+            )
+
+    def close(self):
+        self._connection.close()
+
+
+def refresh_docket(
+    report, pacer_case_id, store, docket=None, by="date", **kwargs
+):
+    """Query a docket for only what's new since it was last queried.
+
+    Only the entries from the docket's watermark on are queried, and the
+    watermark in store is raised to cover them. If there's no watermark, the
+    whole docket is queried.
+
+    :param report: A DocketReport, for the docket's court, with a session.
+    :param pacer_case_id: The internal PACER case ID for a case.
+    :param store: A WatermarkStore
+    :param docket: The docket as it was last queried, to merge the new
+    entries into. If it's given, its watermark is used instead of the one in
+    store.
+    :param by: Whether to query by "date" or "document_number". See
+    delta_query_options.
+    :param kwargs: Any other arguments for DocketReport.query
+    :return: The docket with the new entries merged in, or with only the new
+    entries if docket is None. If the docket report was invalid, docket is
+    returned as it was, and the watermark isn't changed.
+    """
+    court_id = report.court_id
+    if docket is not None:
+        # Go from what's in the docket, even if the store's watermark is
+        # higher, so that no entries are missing from it.
+        watermark = get_watermark(docket)
+    else:
+        watermark = store.get(court_id, pacer_case_id)
+    options = delta_query_options(watermark, by)
+    logger.info(
+        "Refreshing docket %s in %s with %s", pacer_case_id, court_id, options
+    )
+    report.query(pacer_case_id, **{**kwargs, **options})
+    new = report.data
+    if not new:
+        return docket
+    if docket is not None:
+        new = merge_dockets(docket, new)
+    store.update(court_id, pacer_case_id, new)
+    return new
@@ -1,13 +1,13 @@
 import re
-from typing import Optional, Tuple
+from typing import BinaryIO, Optional, Tuple
 from urllib.parse import urljoin
 
-import requests
 from lxml.html import HtmlElement
 from requests import Response
 
 from ..lib.html_utils import (
     clean_html,
+    detect_encoding,
     fix_links_in_lxml_tree,
     get_html5_parsed_text,
     get_html_parsed_text,
@@ -16,10 +16,92 @@
     strip_bad_html_tags_insecure,
 )
 from ..lib.log_tools import make_default_logger
+from ..lib.network_utils import StreamedResponse, connection_pool
+from .classifier import Classifier, Rule
 from .utils import is_pdf, make_doc1_url, make_docs1_url
 
 logger = make_default_logger()
 
+# How much of each response download_pdf_to checks to find out what it is.
+# PACER's error pages are much smaller than this.
+PDF_HEAD_BYTES = 64 * 1024
+
+# The error pages doc1 URLs return instead of a PDF. When a page has more than
+# one of these on it, the first one wins.
+doc1_error_classifier = Classifier(
+    [
+        # See: https://ecf.cacd.uscourts.gov/doc1/031134206600
+        Rule(
+            b"Permission to view this document is denied based on Nature "
+            b"of Suit",
+            "nature_of_suit",
+            "Permission denied getting document due to nature of suit. "
+            "pacer_case_id={pacer_case_id!r}, url={url!r}",
+        ),
+        Rule(
+            b"A Client Code is required for PACER search",
+            "client_code_required",
+            "Unable to get document. Client code required: "
+            "pacer_case_id={pacer_case_id!r}, url={url!r}",
+        ),
+        # See: https://ecf.wvsd.uscourts.gov/doc1/20115419289
+        Rule(
+            b"This image is not available for viewing by non-court users",
+            "court_users_only",
+            "Image not available for viewing by non-court users. "
+            "pacer_case_id={pacer_case_id!r}, url={url!r}",
+        ),
+        # See: https://ecf.almd.uscourts.gov/doc1/01712589088
+        # See: https://ecf.cand.uscourts.gov/doc1/035122021132
+        # Matches against:
+        # "Sealed Document" and
+        # "This document is currently Under Seal and not available..."
+        Rule(
+            b"Sealed Document",
+            "sealed",
+            "Document is sealed: pacer_case_id={pacer_case_id!r} "
+            "url={url!r}",
+        ),
+        Rule(
+            b"Under Seal",
+            "sealed",
+            "Document is sealed: pacer_case_id={pacer_case_id!r} "
+            "url={url!r}",
+        ),
+        Rule(
+            b"You do not have access to this transcript.",
+            "transcript",
+            "Unable to get transcript. pacer_case_id={pacer_case_id!r}, "
+            "url={url!r}",
+        ),
+        Rule(
+            re.compile(
+                rb"You do not have permission to view\s+this document."
+            ),
+            "permission_denied",
+            "Permission denied getting document. It's probably sealed. "
+            "pacer_case_id={pacer_case_id!r}, url={url!r}",
+        ),
+        # See: https://ecf.akb.uscourts.gov/doc1/02211536343
+        # See: https://ecf.ksd.uscourts.gov/doc1/07912639735
+        # Matches against:
+        # "The document is not available" and
+        # "This document is not available"
+        Rule(
+            b"document is not available",
+            "unavailable",
+            "Document not available in case: "
+            "pacer_case_id={pacer_case_id!r} at {url}",
+        ),
+        Rule(
+            b"could not retrieve dktentry for dlsid",
+            "no_docket_entry",
+            "Failed to get docket entry in case: "
+            "pacer_case_id={pacer_case_id!r} at {url}",
+        ),
+    ],
+)
+
 
 # Patch the HtmlElement class to add a function that can handle regular
 # expressions within XPath queries. See usages throughout AppellateDocketReport.
@@ -32,6 +114,19 @@ def re_xpath(self, path):
 HtmlElement.re_xpath = re_xpath
 
 
+def compile_error_strings(error_strings):
+    """Combine a list of error strings into one case-insensitive regex.
+
+    Each error string becomes a named group, e0, e1, etc., in the order of the
+    list, so the one that matched can be found from match.lastgroup.
+    """
+    patterns = []
+    for i, error_string in enumerate(error_strings):
+        pattern = r"\s+".join(error_string.split())
+        patterns.append(f"(?P<e{i}>{pattern})")
+    return re.compile("|".join(patterns), flags=re.I)
+
+
 class BaseReport:
     """A base report for working with pages on PACER."""
 
@@ -46,6 +141,19 @@ class BaseReport:
         r'console\.log\(".*CloudMask',
         "Drumpf",
     ]
+    # ERROR_STRINGS as one regex. It's compiled again for each subclass as
+    # the subclass is created, in __init_subclass__.
+    _error_strings_re = compile_error_strings(ERROR_STRINGS)
+
+    # Whether to parse with html5lib in a single pass, instead of going
+    # through tostring and lxml afterwards. It's faster and uses less memory,
+    # but the tree differs (see get_html5_parsed_text), so it's opt in for
+    # each report whose XPaths have been checked against it.
+    HTML5_SINGLE_PASS = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._error_strings_re = compile_error_strings(cls.ERROR_STRINGS)
 
     def __init__(self, court_id, pacer_session=None):
         self.court_id = court_id
@@ -53,6 +161,8 @@ def __init__(self, court_id, pacer_session=None):
         self.tree = None
         self.response = None
         self.is_valid = None
+        # The item of ERROR_STRINGS that made the page invalid, if any.
+        self.error_string = None
 
     @property
     def url(self):
@@ -93,7 +203,9 @@ def _parse_text(self, text):
         text = clean_html(text)
         self.check_validity(text)
         if self.is_valid:
-            tree = get_html5_parsed_text(text)
+            tree = get_html5_parsed_text(
+                text, single_pass=self.HTML5_SINGLE_PASS
+            )
             self.tree = strip_bad_html_tags_insecure(tree)
             self.tree.rewrite_links(fix_links_in_lxml_tree, base_href=self.url)
 
@@ -101,15 +213,16 @@ def check_validity(self, text: str) -> None:
         """Place sanity checks here to make sure that the returned text is
         valid and not an error page or some other kind of problem.
 
-        Set self.is_valid flag to True or False
+        Set self.is_valid flag to True or False. If it's False, the item of
+        ERROR_STRINGS that matched first in the text is put in
+        self.error_string.
         """
-        for error_string in self.ERROR_STRINGS:
-            error_string_re = re.compile(
-                r"\s+".join(error_string.split()), flags=re.I
-            )
-            if error_string_re.search(text):
-                self.is_valid = False
-                return
+        m = self._error_strings_re.search(text)
+        if m:
+            self.is_valid = False
+            self.error_string = self.ERROR_STRINGS[int(m.lastgroup[1:])]
+            return
+        self.error_string = None
         self.is_valid = True
 
     @property
@@ -123,6 +236,7 @@ def _query_pdf_download(
         pacer_doc_id: str,
         pacer_magic_num: Optional[str],
         got_receipt: str,
+        stream: bool = False,
     ) -> Tuple[Response, str]:
         """Query the doc1 download URL.
 
@@ -130,6 +244,8 @@ def _query_pdf_download(
         :param pacer_doc_id: The doc id for the document
         :param got_receipt: Whether to get the receipt for the page ('0') or
         get the PDF itself ('1').
+        :param stream: Whether to stream the response, instead of reading all
+        of it right away.
         :return the Request.response object and the url queried
         """
         url = make_doc1_url(self.court_id, pacer_doc_id, True)
@@ -166,7 +282,7 @@ def _query_pdf_download(
 
         timeout = (60, 300)
         logger.info(f"POSTing URL: {url} with params: {data}")
-        r = self.session.post(url, data=data, timeout=timeout)
+        r = self.session.post(url, data=data, timeout=timeout, stream=stream)
         return r, url
 
     def download_pdf(
@@ -184,6 +300,80 @@ def download_pdf(
         one can be found (is not sealed, gone, etc.). And a string indicating
         the error message, if there is one or else an empty string.
         """
+        r, _, error = self._get_pdf_response(
+            pacer_case_id, pacer_doc_id, pacer_magic_num, appellate
+        )
+        return r, error
+
+    def download_pdf_to(
+        self,
+        sink: BinaryIO,
+        pacer_case_id: str,
+        pacer_doc_id: int,
+        pacer_magic_num: Optional[str] = None,
+        appellate: bool = False,
+    ) -> Tuple[Optional[Response], str]:
+        """Download a PDF from PACER, writing it to sink as it arrives.
+
+        This is like download_pdf, but the PDF is never all in memory at
+        once, no matter how big it is. Only the first PDF_HEAD_BYTES of each
+        response are read to check what it is, so error pages longer than
+        that may not be recognized.
+
+        :param sink: A file-like object opened for writing bytes.
+        :returns: A tuple of the request.Response object the PDF was in, its
+        body having been written to sink, and an empty string. If there's no
+        PDF, None and the error message, and nothing is written to sink.
+        """
+        r, body, error = self._get_pdf_response(
+            pacer_case_id, pacer_doc_id, pacer_magic_num, appellate, True
+        )
+        if r is not None:
+            body.write_to(sink)
+        return r, error
+
+    @staticmethod
+    def _get_pdf_download_error(
+        content: bytes, pacer_case_id: str, url: str
+    ) -> Optional[str]:
+        """Check the response to a doc1 request for PACER's error messages.
+
+        :param content: The response's body, or the start of it.
+        :return: An error message, or None if there's no error.
+        """
+        result = doc1_error_classifier.classify(
+            content, pacer_case_id=pacer_case_id, url=url
+        )
+        if result is None:
+            return None
+        return result.message
+
+    def _get_pdf_response(
+        self,
+        pacer_case_id: str,
+        pacer_doc_id: int,
+        pacer_magic_num: Optional[str] = None,
+        appellate: bool = False,
+        stream: bool = False,
+    ) -> Tuple[Optional[Response], Optional[StreamedResponse], str]:
+        """Find the response with the PDF in it, for download_pdf and
+        download_pdf_to.
+
+        :param stream: Whether to stream the responses. If so, only the first
+        PDF_HEAD_BYTES of them are checked for errors and redirects, so error
+        pages longer than that may not be recognized.
+        :returns: A tuple of the request.Response object containing a PDF, if
+        one can be found, a StreamedResponse of it if stream is True, else
+        None, and an error message or an empty string.
+        """
+
+        def read(r):
+            """Get r's body, or as much of it as needs checking."""
+            if not stream:
+                return None, r.content
+            body = StreamedResponse(r, PDF_HEAD_BYTES)
+            return body, body.head
+
         if pacer_magic_num:
             # If magic_number is available try to download the
             # document anonymously by its magic link
@@ -206,12 +396,15 @@ def download_pdf(
 
             # Add parameters to the PACER base url and make a GET request
             req_timeout = (60, 300)
-            r = requests.get(url, params=params, timeout=req_timeout)
+            r = connection_pool.get(
+                url, params=params, timeout=req_timeout, stream=stream
+            )
+            body, content = read(r)
 
             # If the response is an HTML document, and it doesn't contain an
             # IFRAME, the magic link document is no longer available
             error = None
-            if is_html(r) and "iframe" not in r.text:
+            if is_html(r) and b"iframe" not in content:
                 error = (
                     f"Document not available via magic link in case: "
                     f"caseid: {pacer_case_id}, magic_num: {pacer_magic_num}, "
@@ -219,93 +412,54 @@ def download_pdf(
                 )
             if error:
                 logger.warning(error)
-                return None, error
+                r.close()
+                return None, None, error
 
         else:
             # If no magic_number use normal method to fetch the document
             r, url = self._query_pdf_download(
-                pacer_case_id, pacer_doc_id, pacer_magic_num, got_receipt="1"
+                pacer_case_id,
+                pacer_doc_id,
+                pacer_magic_num,
+                got_receipt="1",
+                stream=stream,
             )
-
             # Use r.content instead of r.text for performance. See #564
-            if b"Cannot locate the case with caseid" in r.content:
+            body, content = read(r)
+
+            if b"Cannot locate the case with caseid" in content:
                 # This document is from a different docket, but is included in
                 # this docket. Probably a criminal case with the doppelganger
                 # bug. Try again, but do so without the pacer_case_id.
                 # This should work, but will omit the blue header on the PDFs.
+                r.close()
                 r, url = self._query_pdf_download(
-                    None, pacer_doc_id, pacer_magic_num, got_receipt="1"
-                )
-
-            error = None
-            if b"could not retrieve dktentry for dlsid" in r.content:
-                error = (
-                    f"Failed to get docket entry in case: "
-                    f"{pacer_case_id=} at {url}"
-                )
-            if b"document is not available" in r.content:
-                # See: https://ecf.akb.uscourts.gov/doc1/02211536343
-                # See: https://ecf.ksd.uscourts.gov/doc1/07912639735
-                # Matches against:
-                # "The document is not available" and
-                # "This document is not available"
-                error = (
-                    f"Document not available in case: "
-                    f"{pacer_case_id=} at {url}"
-                )
-            if re.search(
-                rb"You do not have permission to view\s+this document.",
-                r.content,
-            ):
-                error = (
-                    f"Permission denied getting document. It's probably "
-                    f"sealed. {pacer_case_id=}, {url=}"
-                )
-            if b"You do not have access to this transcript." in r.content:
-                error = f"Unable to get transcript. {pacer_case_id=}, {url=}"
-            if b"Sealed Document" in r.content or b"Under Seal" in r.content:
-                # See: https://ecf.almd.uscourts.gov/doc1/01712589088
-                # See: https://ecf.cand.uscourts.gov/doc1/035122021132
-                # Matches against:
-                # "Sealed Document" and
-                # "This document is currently Under Seal and not available..."
-                error = f"Document is sealed: {pacer_case_id=} {url=}"
-            if (
-                b"This image is not available for viewing by non-court users"
-                in r.content
-            ):
-                # See: https://ecf.wvsd.uscourts.gov/doc1/20115419289
-                error = (
-                    f"Image not available for viewing by non-court users. "
-                    f"{pacer_case_id=}, {url=}"
-                )
-            if b"A Client Code is required for PACER search" in r.content:
-                error = (
-                    f"Unable to get document. Client code required: "
-                    f"{pacer_case_id=}, {url=}"
-                )
-            if (
-                b"Permission to view this document is denied based on Nature of Suit"
-                in r.content
-            ):
-                # See: https://ecf.cacd.uscourts.gov/doc1/031134206600
-                error = (
-                    f"Permission denied getting document due to nature of "
-                    f"suit. {pacer_case_id=}, {url=}"
+                    None,
+                    pacer_doc_id,
+                    pacer_magic_num,
+                    got_receipt="1",
+                    stream=stream,
                 )
+                body, content = read(r)
 
+            error = self._get_pdf_download_error(content, pacer_case_id, url)
             if error:
                 logger.warning(error)
-                return None, error
+                r.close()
+                return None, None, error
 
             # Some pacer sites use window.location in their JS, so we have to
             # look for that. See: oknd, 13-cv-00357-JED-FHM, doc #24. But, be
             # warned, you can only catch the redirection with JS off.
             redirect_re = re.compile(rb'window\.\s*?location\s*=\s*"(.*)"\s*;')
-            m = redirect_re.search(r.content)
+            m = redirect_re.search(content)
             if m is not None:
-                r = self.session.get(urljoin(url, str(m.group(1))))
+                r.close()
+                r = self.session.get(
+                    urljoin(url, str(m.group(1))), stream=stream
+                )
                 r.raise_for_status()
+                body, content = read(r)
 
         # The request above sometimes generates an HTML page with an iframe
         # containing the PDF, and other times returns the PDF directly. ∴
@@ -314,9 +468,14 @@ def download_pdf(
         r.raise_for_status()
         if is_pdf(r):
             logger.info(f"Got PDF binary data for case at {url}")
-            return r, ""
+            return r, body, ""
 
-        text = clean_html(r.text)
+        if stream:
+            encoding = r.encoding or detect_encoding(content)
+            text = content.decode(encoding, errors="replace")
+        else:
+            text = r.text
+        text = clean_html(text)
         tree = get_html_parsed_text(text)
         tree.rewrite_links(fix_links_in_lxml_tree, base_href=r.url)
         try:
@@ -336,21 +495,26 @@ def download_pdf(
                     f"magic_num: {pacer_magic_num}"
                 )
             logger.error(error)
-            return None, error
+            r.close()
+            return None, None, error
 
+        r.close()
         if pacer_magic_num:
             # If magic_number is available try to download the
             # document anonymously from iframe_src
-            r = requests.get(iframe_src, timeout=req_timeout)
+            r = connection_pool.get(
+                iframe_src, timeout=req_timeout, stream=stream
+            )
         else:
             # Use PACER session to fetch the document from iframe_src
-            r = self.session.get(iframe_src)
+            r = self.session.get(iframe_src, stream=stream)
         if is_pdf(r):
             logger.info(
                 f"Got iframed PDF data for case {url} at: {iframe_src}"
             )
 
-        return r, ""
+        body, _ = read(r)
+        return r, body, ""
 
     def is_pdf_sealed(self, pacer_case_id, pacer_doc_id, pacer_magic_num=None):
         """Check if a PDF is sealed without trying to actually download
@@ -359,5 +523,5 @@ def is_pdf_sealed(self, pacer_case_id, pacer_doc_id, pacer_magic_num=None):
         r, url = self._query_pdf_download(
             pacer_case_id, pacer_doc_id, pacer_magic_num, got_receipt="0"
         )
-        sealed = "You do not have permission to view this document."
-        return sealed in r.content
+        rule = doc1_error_classifier.search(r.content, "permission_denied")
+        return rule is not None
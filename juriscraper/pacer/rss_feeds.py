@@ -5,7 +5,6 @@
 import sys
 from html import unescape
 
-import feedparser
 from dateutil import parser
 from requests import Session
 
@@ -193,6 +192,8 @@ def _parse_text(self, text):
         :param text: The text of the RSS feed.
         :return None
         """
+        import feedparser
+
         self.feed = feedparser.parse(text)
 
     @property
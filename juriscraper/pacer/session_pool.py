@@ -0,0 +1,220 @@
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+from requests.cookies import RequestsCookieJar
+
+from ..lib.log_tools import make_default_logger
+from .http import PacerSession
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, where logins are only shared by the threads of one process.
+    fcntl = None
+
+logger = make_default_logger()
+
+
+def dump_cookies(cookies):
+    """Get the cookies in a jar as a list of JSON-friendly dicts."""
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+        }
+        for cookie in cookies
+    ]
+
+
+def load_cookies(cookies):
+    """Make a cookie jar from the output of dump_cookies."""
+    jar = RequestsCookieJar()
+    for cookie in cookies:
+        jar.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie["domain"],
+            path=cookie["path"],
+        )
+    return jar
+
+
+class LoginStore:
+    """The cookies of the latest PACER login, shared by many sessions.
+
+    Every login gets a new generation number, and each session remembers the
+    generation of the cookies it has. When a session finds that it's logged
+    out, it calls login. If another session has logged in since the session
+    got its cookies, the newer cookies are used. Only if they're the ones
+    that just expired does the session log in again. Logins are done one at
+    a time, so when many sessions find they're logged out at once, the first
+    one logs in and the rest use its cookies.
+
+    This store is shared by the threads of one process. To share it with
+    other processes too, use a FileLoginStore.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # The generation and its cookies, together, so that they're always
+        # replaced at once and refresh can read them without the lock.
+        self._login = (0, [])
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            yield
+
+    def _read(self):
+        """:return: The latest generation and its cookies."""
+        return self._login
+
+    def _write(self, generation, cookies):
+        self._login = (generation, cookies)
+
+    @staticmethod
+    def _use(session, generation, cookies):
+        session.cookies = load_cookies(cookies)
+        session.login_generation = generation
+
+    def login(self, session):
+        """Log session in, unless another session already has since session
+        got its cookies, in which case session gets that login's cookies.
+
+        :param session: A PacerSession with a username and password.
+        :raises: PacerLoginException, if unable to log in.
+        """
+        with self._locked():
+            generation, cookies = self._read()
+            if generation <= session.login_generation:
+                session.login()
+                generation += 1
+                cookies = dump_cookies(session.cookies)
+                self._write(generation, cookies)
+            else:
+                logger.info("Using a PACER session another session made.")
+        self._use(session, generation, cookies)
+
+    def refresh(self, session):
+        """Give session the latest cookies, logging in if nobody has yet."""
+        generation, cookies = self._read()
+        if generation == 0:
+            self.login(session)
+        elif generation > session.login_generation:
+            self._use(session, generation, cookies)
+
+
+class FileLoginStore(LoginStore):
+    """A LoginStore kept in a file, so that it can be shared by every
+    process on a machine.
+
+    Logins are done one at a time with an flock on a lock file next to it.
+    The file has the PACER cookies in it, so it's only readable by its owner.
+
+    :param path: Where to keep the cookies. The directory must exist.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                # Closing the file releases the lock.
+                os.close(fd)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0, []
+        return data["generation"], data["cookies"]
+
+    def _write(self, generation, cookies):
+        # Write a new file, then move it into place, so that readers never
+        # see half of one.
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"generation": generation, "cookies": cookies}, f)
+        os.replace(tmp_path, self.path)
+
+
+class PacerSessionPool:
+    """Hand out PacerSessions that share one PACER login.
+
+    Sessions are made as they're needed and reused once they're returned.
+    When any of them has to log in again, the others get its cookies instead
+    of logging in themselves (see LoginStore).
+
+    >>> pool = PacerSessionPool(username, password)
+    >>> with pool.session() as s:
+    ...     report = DocketReport("cand", s)
+
+    :param username: A PACER account username
+    :param password: A PACER account password
+    :param client_code: An optional PACER client code
+    :param login_store: Where to keep the login. Defaults to a new LoginStore,
+    which only this pool uses. Pass a FileLoginStore to share it with other
+    processes.
+    """
+
+    def __init__(self, username, password, client_code=None, login_store=None):
+        self.username = username
+        self.password = password
+        self.client_code = client_code
+        self.login_store = login_store or LoginStore()
+        self._idle = queue.LifoQueue()
+
+    def get(self):
+        """Take a session out of the pool, or make a new one. Put it back
+        with put when you're done with it.
+        """
+        try:
+            session = self._idle.get_nowait()
+        except queue.Empty:
+            session = PacerSession(
+                username=self.username,
+                password=self.password,
+                client_code=self.client_code,
+                login_store=self.login_store,
+            )
+        self.login_store.refresh(session)
+        return session
+
+    def put(self, session):
+        self._idle.put(session)
+
+    @contextmanager
+    def session(self):
+        """Borrow a session for the duration of a with block."""
+        session = self.get()
+        try:
+            yield session
+        finally:
+            self.put(session)
+
+    def close(self):
+        """Close every session that's in the pool."""
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            session.close()
@@ -2,7 +2,6 @@
 from typing import Optional
 
 import requests
-import tldextract
 from lxml import html
 
 from ..lib.exceptions import ParsingException
@@ -24,6 +23,9 @@ def get_courts_from_json(j):
 
 def get_court_id_from_url(url):
     """Extract the court ID from the URL."""
+    # tldextract is slow to import, so it isn't imported until it's needed.
+    import tldextract
+
     parts = tldextract.extract(url)
     return parts.subdomain.split(".")[1]
 
@@ -6,7 +6,15 @@
 from optparse import OptionParser
 from urllib import parse, request
 
-from juriscraper.lib.importer import build_module_list, site_yielder
+from juriscraper.lib.checkpoint import SqliteBackscrapeCheckpoint
+from juriscraper.lib.importer import build_module_list
+from juriscraper.lib.runner import (
+    DEFAULT_MAX_PER_HOST,
+    DEFAULT_MAX_WORKERS,
+    import_site_module,
+    parallel_site_yielder,
+    scrape_courts,
+)
 from juriscraper.lib.string_utils import trunc
 from juriscraper.report import generate_scraper_report
 
@@ -90,6 +98,15 @@ def scrape_court(site, binaries=False):
     return {"count": len(site), "exceptions": exceptions}
 
 
+def log_court_failure(module_string):
+    v_print(3, "*************!! CRAWLER DOWN !!****************")
+    v_print(
+        3,
+        "*****scrape_court method failed on mod: %s*****" % module_string,
+    )
+    v_print(3, "*************!! ACTION NEEDED !!***************")
+
+
 v_print = None
 
 
@@ -154,6 +171,19 @@ def main():
         default=1,
         help="Increase output verbosity (e.g., -vv is more than -v).",
     )
+    parser.add_option(
+        "-w",
+        "--workers",
+        type="int",
+        default=None,
+        help=(
+            "The number of courts to scrape at once. Courts are reported "
+            "as they finish, not in the order they were requested. With "
+            "--backscrape, the number of pages of each court to scrape at "
+            f"once. Defaults to {DEFAULT_MAX_WORKERS}, or "
+            f"{DEFAULT_MAX_PER_HOST} with --backscrape."
+        ),
+    )
     parser.add_option(
         "--backscrape",
         dest="backscrape",
@@ -161,6 +191,16 @@ def main():
         default=False,
         help="Download the historical corpus using the _download_backwards method.",
     )
+    parser.add_option(
+        "--checkpoint",
+        dest="checkpoint",
+        default=None,
+        help=(
+            "With --backscrape, a SQLite file in which to record the pages "
+            "that are done. If the back-scrape is stopped, running it again "
+            "with the same file skips them."
+        ),
+    )
     parser.add_option(
         "-r",
         "--report",
@@ -201,62 +241,74 @@ def _v_print(*verb_args):
             parser.error("Unable to import module or package. Aborting.")
 
         v_print(3, "Starting up the scraper.")
-        num_courts = len(module_strings)
-        i = 0
-        while i < num_courts:
-            current_court = module_strings[i]
-            results[current_court] = {"global_failure": False}
-            # this catches SIGINT, so the code can be killed safely.
-            if die_now:
-                v_print(3, "The scraper has stopped.")
-                sys.exit(1)
-
-            package, module = module_strings[i].rsplit(".", 1)
-            v_print(3, f"Current court: {package}.{module}")
-
-            mod = __import__(
-                f"{package}.{module}", globals(), locals(), [module]
-            )
+        if backscrape:
+            checkpoint = None
+            if options.checkpoint:
+                checkpoint = SqliteBackscrapeCheckpoint(options.checkpoint)
+            max_workers = options.workers or DEFAULT_MAX_PER_HOST
             try:
-                if backscrape:
-                    for site in site_yielder(
-                        mod.Site().back_scrape_iterable, mod
-                    ):
-                        site.parse()
-                        scrape_court(site, binaries)
-                else:
-                    site = mod.Site()
-                    v_print(
-                        3,
-                        f"Sent {site.method} request to: {site.url}",
-                    )
-                    if site.uses_selenium:
-                        v_print(3, "Selenium will be used.")
-                    site.parse()
-                    results[current_court]["scrape"] = scrape_court(
-                        site, binaries
-                    )
-            except Exception:
-                results[current_court][
-                    "global_failure"
-                ] = traceback.format_exc()
-                results[current_court]["scrape"] = {}
-                v_print(3, "*************!! CRAWLER DOWN !!****************")
-                v_print(
-                    3,
-                    "*****scrape_court method failed on mod: %s*****"
-                    % module_strings[i],
-                )
-                v_print(3, "*************!! ACTION NEEDED !!***************")
-                v_print(3, traceback.format_exc())
-                i += 1
-                continue
-
-            last_court_in_list = i == (num_courts - 1)
-            if last_court_in_list and daemon_mode:
-                i = 0
-            else:
-                i += 1
+                for current_court in module_strings:
+                    # this catches SIGINT, so the code can be killed safely.
+                    if die_now:
+                        v_print(3, "The scraper has stopped.")
+                        sys.exit(1)
+                    results[current_court] = {"global_failure": False}
+                    v_print(3, f"Current court: {current_court}")
+                    mod = import_site_module(current_court)
+                    try:
+                        for item, site in parallel_site_yielder(
+                            mod.Site().back_scrape_iterable,
+                            mod,
+                            max_workers=max_workers,
+                            checkpoint=checkpoint,
+                        ):
+                            v_print(3, f"Finished back-scraping: {item}")
+                            scrape_court(site, binaries)
+                            if die_now:
+                                # The yielder only records items as done
+                                # when it's asked for the next one.
+                                if checkpoint is not None:
+                                    checkpoint.mark_done(
+                                        mod.__name__, item, site
+                                    )
+                                break
+                    except Exception:
+                        results[current_court][
+                            "global_failure"
+                        ] = traceback.format_exc()
+                        results[current_court]["scrape"] = {}
+                        log_court_failure(current_court)
+                        v_print(3, traceback.format_exc())
+            finally:
+                if checkpoint is not None:
+                    checkpoint.close()
+        else:
+            while True:
+                for current_court, result in scrape_courts(
+                    module_strings,
+                    callback=lambda site: scrape_court(site, binaries),
+                    max_workers=options.workers or DEFAULT_MAX_WORKERS,
+                ):
+                    site = result.pop("site")
+                    results[current_court] = result
+                    v_print(3, f"Finished court: {current_court}")
+                    if site is not None:
+                        v_print(
+                            3, f"Sent {site.method} request to: {site.url}"
+                        )
+                        if site.uses_selenium:
+                            v_print(3, "Selenium was used.")
+                    if result["global_failure"]:
+                        log_court_failure(current_court)
+                        v_print(3, result["global_failure"])
+                    # this catches SIGINT, so the code can be killed safely.
+                    if die_now:
+                        break
+                if die_now:
+                    v_print(3, "The scraper has stopped.")
+                    sys.exit(1)
+                if not daemon_mode:
+                    break
 
     v_print(3, "The scraper has stopped.")
 
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Compare the two ways get_html5_parsed_text can parse PACER dockets.
+
+Run from the root of the repo with:
+
+    python -m tests.benchmarks.benchmark_html5_parsing
+
+Every docket under tests/examples/pacer/dockets is parsed both with the
+round trip through tostring and in a single pass, and the time and peak
+Python memory of each are reported, largest dockets first.
+"""
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+import warnings
+
+from juriscraper.lib.html_utils import clean_html, get_html5_parsed_text
+from tests import TESTS_ROOT_EXAMPLES_PACER
+
+
+def measure(text, single_pass, repeat):
+    """Parse text repeat times and return the best time and the peak memory
+    of one parse.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        get_html5_parsed_text(text, single_pass=single_pass)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    get_html5_parsed_text(text, single_pass=single_pass)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Parse each docket this many times and keep the best time.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Only use the largest LIMIT dockets. 0 for all of them.",
+    )
+    args = parser.parse_args()
+
+    paths = glob.glob(
+        os.path.join(TESTS_ROOT_EXAMPLES_PACER, "dockets", "*", "*.html")
+    )
+    paths.sort(key=os.path.getsize, reverse=True)
+    if args.limit:
+        paths = paths[: args.limit]
+
+    # html5lib warns about every name it has to coerce.
+    warnings.simplefilter("ignore")
+    print(
+        f"{'docket':<40} {'KB':>6} {'round trip':>11} {'single':>8} "
+        f"{'speedup':>8} {'peak MB':>15}"
+    )
+    totals = [0.0, 0.0]
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            text = clean_html(f.read())
+        old_time, old_peak = measure(text, False, args.repeat)
+        new_time, new_peak = measure(text, True, args.repeat)
+        totals[0] += old_time
+        totals[1] += new_time
+        name = os.path.relpath(path, TESTS_ROOT_EXAMPLES_PACER)
+        print(
+            f"{name:<40} {os.path.getsize(path) // 1024:>6} "
+            f"{old_time:>10.3f}s {new_time:>7.3f}s "
+            f"{old_time / new_time:>7.2f}x "
+            f"{old_peak / 2**20:>7.1f}→{new_peak / 2**20:>6.1f}"
+        )
+    print(
+        f"{'total':<47} {totals[0]:>10.3f}s {totals[1]:>7.3f}s "
+        f"{totals[0] / totals[1]:>7.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+"""Benchmark the scrapers and parsers against the example files.
+
+Run from the root of the repo with:
+
+    python -m tests.benchmarks.benchmark_parsers --output results.json
+
+Every example file under tests/examples is parsed by the scraper or report
+that it's an example for. For each scraper and report, the number of files
+and MB parsed per second, the median and 95th percentile time to parse one
+file, and the peak Python memory used while parsing them are reported.
+
+To find regressions, save the results of a run, make your change, then run
+it again comparing against them:
+
+    python -m tests.benchmarks.benchmark_parsers --output before.json
+    python -m tests.benchmarks.benchmark_parsers --baseline before.json
+
+Anything that got slower or used more memory by more than --threshold is
+listed, and the exit status is 1.
+"""
+
+import argparse
+import fnmatch
+import glob
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+from juriscraper.lib.importer import build_module_list
+from juriscraper.lib.string_utils import CaseNameTweaker
+from tests import (
+    TESTS_ROOT_EXAMPLES,
+    TESTS_ROOT_EXAMPLES_LASC,
+    TESTS_ROOT_EXAMPLES_PACER,
+)
+
+# The PACER example directories, the report that parses each, and the files
+# in it to parse.
+PACER_EXAMPLES = [
+    ("dockets/district", "DocketReport", "*.html"),
+    ("dockets/bankruptcy", "DocketReport", "*.html"),
+    ("dockets/special", "DocketReport", "*.html"),
+    ("dockets/appellate", "AppellateDocketReport", "*.html"),
+    ("attachment_pages", "AttachmentPage", "*.html"),
+    ("case_queries", "CaseQuery", "*.html"),
+    ("case_queries_advanced", "CaseQueryAdvancedBankruptcy", "*.html"),
+    ("claims_registers", "ClaimsRegister", "*.html"),
+    ("confirmation_pages", "DownloadConfirmationPage", "*.html"),
+    ("docket_history_reports", "DocketHistoryReport", "*.html"),
+    ("dockets_internet_archive", "InternetArchive", "*.xml"),
+    ("mobile_queries", "MobileQuery", "*.html"),
+    ("nef", "NotificationEmail", "*.html"),
+    ("nef/s3", "S3NotificationEmail", "*.txt"),
+    ("nda", "S3NotificationEmail", "*.txt"),
+    ("rss_feeds", "PacerRssFeed", "*.xml"),
+]
+
+KINDS = ["opinions", "oral_args", "pacer", "lasc"]
+
+# Flag anything that's this much slower, or uses this much more memory, than
+# the baseline.
+DEFAULT_THRESHOLD = 0.2
+
+# Tiny timings are mostly noise, so changes in time smaller than this many
+# seconds are never regressions.
+MIN_SIGNIFICANT_SECONDS = 0.001
+
+
+def find_files(path_root, pattern):
+    paths = []
+    for root, dirnames, filenames in os.walk(path_root):
+        for filename in fnmatch.filter(filenames, pattern):
+            paths.append(os.path.join(root, filename))
+    return sorted(paths)
+
+
+def read_text(path):
+    """Read a PACER example the way the tests do, falling back to latin-1."""
+    with open(path, "rb") as f:
+        content = f.read()
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content.decode("iso-8859-1")
+
+
+def scraper_benchmarks(module_str):
+    """Yield a name, example files and parse function for each scraper.
+    Scrapers read the files themselves, so the inputs are the paths.
+    """
+    cnt = CaseNameTweaker()
+    for module_string in build_module_list(module_str):
+        if "backscraper" in module_string:
+            continue
+        package, module = module_string.rsplit(".", 1)
+        mod = __import__(module_string, globals(), locals(), [module])
+        module_parts = module_string.split(".")
+        example_path = os.path.join(
+            TESTS_ROOT_EXAMPLES,
+            module_parts[1],
+            "united_states",
+            module_parts[-1],
+        )
+        paths = sorted(
+            path
+            for path in glob.glob(f"{example_path}_example*")
+            if not path.endswith((".compare.json", "~"))
+        )
+
+        def parse(path, _, mod=mod):
+            site = mod.Site(cnt=cnt)
+            site.url = path
+            site.enable_test_mode()
+            site.parse()
+
+        name = module_string.split(".", 1)[1]
+        yield name, [(path, path) for path in paths], parse
+
+
+def pacer_benchmarks():
+    """Yield a name, example texts and parse function for each report."""
+    import juriscraper.pacer
+
+    files = {}
+    for directory, report_name, pattern in PACER_EXAMPLES:
+        path_root = os.path.join(TESTS_ROOT_EXAMPLES_PACER, directory)
+        paths = find_files(path_root, pattern)
+        files.setdefault(report_name, []).extend(
+            (path, read_text(path)) for path in paths
+        )
+    for report_name, texts in files.items():
+        report_class = getattr(juriscraper.pacer, report_name)
+
+        def parse(text, path, report_class=report_class):
+            court = os.path.basename(path).split(".")[0].split("_")[0]
+            report = report_class(court)
+            report._parse_text(text)
+            return report.data
+
+        yield f"pacer.{report_name}", texts, parse
+
+
+def lasc_benchmarks():
+    import jsondate3
+
+    from juriscraper.lasc.fetch import LASCSearch
+
+    paths = [
+        path
+        for path in find_files(
+            os.path.join(TESTS_ROOT_EXAMPLES_LASC, "dockets"), "*.json"
+        )
+        if not path.endswith("_result.json")
+    ]
+    files = []
+    for path in paths:
+        with open(path) as f:
+            # Like the API, with the dates parsed.
+            files.append((path, jsondate3.load(f)))
+
+    def parse(data, path):
+        LASCSearch(session=None)._parse_case_data(data)
+
+    yield "lasc.LASCSearch", files, parse
+
+
+def get_benchmarks(kinds):
+    """Yield a name, a list of (path, input) tuples and a function to parse
+    each input, for everything to benchmark.
+    """
+    for kind in kinds:
+        if kind in ("opinions", "oral_args"):
+            yield from scraper_benchmarks(f"juriscraper.{kind}")
+        elif kind == "pacer":
+            yield from pacer_benchmarks()
+        elif kind == "lasc":
+            yield from lasc_benchmarks()
+
+
+def percentile(values, percent):
+    """The nearest-rank percentile of values."""
+    values = sorted(values)
+    rank = math.ceil(percent / 100 * len(values))
+    return values[max(rank, 1) - 1]
+
+
+def run_benchmark(files, parse, repeat):
+    """Parse every file repeat times, keeping the best time for each, then
+    once more under tracemalloc for the peak memory. The files mustn't be
+    empty.
+
+    :return: A dict of the results.
+    """
+    # Warm up, so that nothing imported on first use is counted.
+    path, item = files[0]
+    parse(item, path)
+
+    timings = []
+    for path, item in files:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse(item, path)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best)
+    tracemalloc.start()
+    for path, item in files:
+        parse(item, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total_seconds = sum(timings)
+    total_bytes = sum(os.path.getsize(path) for path, _ in files)
+    return {
+        "files": len(files),
+        "bytes": total_bytes,
+        "seconds": total_seconds,
+        "files_per_second": len(files) / total_seconds,
+        "mb_per_second": total_bytes / 2**20 / total_seconds,
+        "p50": percentile(timings, 50),
+        "p95": percentile(timings, 95),
+        "peak_memory": peak,
+    }
+
+
+def compare_results(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Find what got slower or hungrier than it was in the baseline.
+
+    :param results: The "results" of a run.
+    :param baseline: The "results" of an earlier run.
+    :param threshold: How much worse, as a fraction, a measure must be to
+    be a regression.
+    :return: A list of (name, measure, baseline value, new value) tuples.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for measure in ("seconds", "p50", "p95", "peak_memory"):
+            if result[measure] <= old[measure] * (1 + threshold):
+                continue
+            if (
+                measure != "peak_memory"
+                and result[measure] - old[measure] < MIN_SIGNIFICANT_SECONDS
+            ):
+                continue
+            regressions.append((name, measure, old[measure], result[measure]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "kinds",
+        nargs="*",
+        help="What to benchmark, out of %s. Defaults to all of them."
+        % ", ".join(KINDS),
+    )
+    parser.add_argument(
+        "--only",
+        default="",
+        help="Only benchmark scrapers and reports with this in their name.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Parse each file this many times and keep the best time.",
+    )
+    parser.add_argument("--output", help="Save the results to this file.")
+    parser.add_argument(
+        "--baseline", help="Compare the results to those saved in this file."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Flag anything this much worse than the baseline, as a "
+        "fraction. Defaults to %(default)s.",
+    )
+    args = parser.parse_args()
+    kinds = args.kinds or KINDS
+    for kind in kinds:
+        if kind not in KINDS:
+            parser.error(f"Unknown kind of example: {kind}")
+
+    # Scrapers log and warn about all kinds of things in their examples.
+    logging.disable(logging.CRITICAL)
+    warnings.simplefilter("ignore")
+    print(
+        f"{'name':<60} {'files':>5} {'files/s':>8} {'MB/s':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'peak MB':>8}"
+    )
+    results = {}
+    for name, files, parse in get_benchmarks(kinds):
+        if args.only not in name or not files:
+            continue
+        result = run_benchmark(files, parse, args.repeat)
+        results[name] = result
+        print(
+            f"{name:<60} {result['files']:>5} "
+            f"{result['files_per_second']:>8.1f} "
+            f"{result['mb_per_second']:>7.2f} "
+            f"{result['p50'] * 1000:>8.1f} {result['p95'] * 1000:>8.1f} "
+            f"{result['peak_memory'] / 2**20:>8.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "created": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"\nSaved the results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print()
+        for name, measure, old, new in regressions:
+            print(
+                f"REGRESSION: {name} {measure} went from {old:.4g} to "
+                f"{new:.4g} ({(new - old) / old:+.0%})"
+            )
+        if regressions:
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
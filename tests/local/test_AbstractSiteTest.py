@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+
+from juriscraper.lib.network_utils import get_httpx
+from juriscraper.lib.page_state import JsonPageStateStore, PageStateStore
+from juriscraper.opinions.united_states.federal_appellate import ca1
+from tests import TESTS_ROOT_EXAMPLES
+
+httpx = get_httpx()
+
+CA1_EXAMPLE = os.path.join(
+    TESTS_ROOT_EXAMPLES, "opinions", "united_states", "ca1_example.html"
+)
+
+
+def make_test_site(path=CA1_EXAMPLE):
+    site = ca1.Site()
+    site.url = path
+    site.enable_test_mode()
+    return site
+
+
+class AsyncParseTest(unittest.TestCase):
+    """Does aparse() get the same results as parse()?"""
+
+    def setUp(self):
+        self.expected = make_test_site().parse().to_json()
+
+    def test_aparse_in_test_mode(self):
+        site = make_test_site()
+        asyncio.run(site.aparse())
+        self.assertEqual(site.to_json(), self.expected)
+
+    @unittest.skipIf(httpx is None, "httpx is not installed.")
+    def test_aparse_with_httpx(self):
+        with open(CA1_EXAMPLE, "rb") as f:
+            content = f.read()
+        requested = []
+
+        def handler(request):
+            requested.append(request)
+            return httpx.Response(
+                200,
+                content=content,
+                headers={"Content-Type": "text/html; charset=utf-8"},
+            )
+
+        async def run():
+            transport = httpx.MockTransport(handler)
+            async with httpx.AsyncClient(transport=transport) as client:
+                site = ca1.Site()
+                await site.aparse(client=client)
+                return site
+
+        site = asyncio.run(run())
+        self.assertEqual(len(requested), 1)
+        self.assertEqual(str(requested[0].url), ca1.Site().url)
+        self.assertEqual(requested[0].headers["User-Agent"], "Juriscraper")
+        self.assertEqual(site.request["response"].encoding, "utf-8")
+        self.assertEqual(site.to_json(), self.expected)
+
+    @unittest.skipIf(httpx is None, "httpx is not installed.")
+    def test_aparse_keeps_session_setup(self):
+        """Sites that set up their session are downloaded with it."""
+        site = ca1.Site()
+        self.assertTrue(site._uses_default_downloader())
+        site.request["session"].mount("https://", HTTPAdapter(max_retries=3))
+        self.assertFalse(site._uses_default_downloader())
+
+        site = ca1.Site()
+        site.request["session"].cookies.set("a", "b")
+        with mock.patch.object(
+            site, "_download", return_value=make_test_site().parse().html
+        ) as download:
+            asyncio.run(site.aparse())
+        download.assert_called_once()
+        self.assertEqual(site.to_json(), self.expected)
+
+
+class PageStateTest(unittest.TestCase):
+    """Are unchanged pages skipped?"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "ca1_example.html")
+        shutil.copy(CA1_EXAMPLE, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_unchanged_page_is_not_parsed_again(self):
+        store = PageStateStore()
+        site = make_test_site(self.path)
+        site.page_state_store = store
+        site.parse()
+        self.assertFalse(site.unchanged)
+        self.assertEqual(len(site), 80)
+        first_hash = site.hash
+
+        site = make_test_site(self.path)
+        site.page_state_store = store
+        with mock.patch.object(site, "_process_html") as process_html:
+            site.parse()
+        process_html.assert_not_called()
+        self.assertTrue(site.unchanged)
+        self.assertEqual(len(site), 0)
+        self.assertEqual(site.to_json(), "[]")
+        self.assertEqual(site.hash, first_hash)
+
+        # Now change the page. It gets parsed again.
+        with open(self.path, "a") as f:
+            f.write("<!-- A change -->")
+        site = make_test_site(self.path)
+        site.page_state_store = store
+        site.parse()
+        self.assertFalse(site.unchanged)
+        self.assertEqual(len(site), 80)
+
+    def test_failed_parse_is_not_saved(self):
+        store = PageStateStore()
+        site = make_test_site(self.path)
+        site.page_state_store = store
+        with mock.patch.object(
+            site, "_check_sanity", side_effect=ValueError("Broken")
+        ):
+            with self.assertRaises(ValueError):
+                site.parse()
+        self.assertIsNone(store.get(self.path))
+
+    def test_json_store_persists(self):
+        store_path = os.path.join(self.tmp_dir, "states.json")
+        site = make_test_site(self.path)
+        site.page_state_store = JsonPageStateStore(store_path)
+        site.parse()
+
+        site = make_test_site(self.path)
+        site.page_state_store = JsonPageStateStore(store_path)
+        site.parse()
+        self.assertTrue(site.unchanged)
+
+    def test_conditional_get(self):
+        """Are validators sent, and is a 304 treated as unchanged?"""
+        store = PageStateStore()
+        site = ca1.Site()
+        store.set(
+            site.url,
+            {
+                "etag": '"abc"',
+                "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+                "digest": "0" * 40,
+                "hash": "some-hash",
+            },
+        )
+        site.page_state_store = store
+        response = Response()
+        response.status_code = 304
+        response._content = b""
+        with mock.patch.object(
+            site.request["session"], "get", return_value=response
+        ) as get:
+            site.parse()
+        headers = get.call_args[1]["headers"]
+        self.assertEqual(headers["If-None-Match"], '"abc"')
+        self.assertEqual(
+            headers["If-Modified-Since"], "Wed, 21 Oct 2015 07:28:00 GMT"
+        )
+        self.assertNotIn("If-None-Match", site.request["headers"])
+        self.assertTrue(site.unchanged)
+        self.assertEqual(site.hash, "some-hash")
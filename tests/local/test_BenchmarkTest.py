@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+
+import unittest
+
+from tests.benchmarks.benchmark_parsers import (
+    compare_results,
+    percentile,
+    run_benchmark,
+)
+
+
+class BenchmarkTest(unittest.TestCase):
+    result = {"seconds": 1.0, "p50": 0.01, "p95": 0.1, "peak_memory": 1000}
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+        self.assertEqual(percentile([2, 1], 0), 1)
+
+    def test_run_benchmark(self):
+        parsed = []
+        files = [(__file__, "a"), (__file__, "b")]
+        result = run_benchmark(
+            files, lambda item, path: parsed.append(item), 2
+        )
+        # Warming up, twice each timed, then once under tracemalloc.
+        self.assertEqual(parsed, ["a", "a", "a", "b", "b", "a", "b"])
+        self.assertEqual(result["files"], 2)
+        self.assertLessEqual(result["p50"], result["p95"])
+
+    def test_compare_results(self):
+        slower = dict(self.result, p95=0.2, peak_memory=1100)
+        regressions = compare_results(
+            {"a": slower, "new": slower}, {"a": self.result}
+        )
+        self.assertEqual(regressions, [("a", "p95", 0.1, 0.2)])
+
+    def test_tiny_changes_in_time_are_ignored(self):
+        slower = dict(self.result, p50=0.0105)
+        self.assertEqual(
+            compare_results({"a": slower}, {"a": self.result}, 0.01), []
+        )
+        self.assertEqual(
+            compare_results({"a": self.result}, {"a": self.result}, 0), []
+        )
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+
+import unittest
+from unittest import mock
+
+import requests
+
+from juriscraper.lib.network_utils import ConnectionPool, SSLAdapter
+from juriscraper.opinions.united_states.federal_appellate import ca1
+from juriscraper.pacer import PacerSession
+
+
+def fake_send(request, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b""
+    response.request = request
+    response.url = request.url
+    return response
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(pool_maxsize=4)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_one_adapter_per_host(self):
+        a = self.pool.get_adapter("https://www.ca1.uscourts.gov/opinions")
+        b = self.pool.get_adapter("https://WWW.ca1.uscourts.gov/other")
+        c = self.pool.get_adapter("https://www.ca2.uscourts.gov/")
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        self.assertEqual(a._pool_maxsize, 4)
+        self.assertIsNone(self.pool.get_adapter("tests/examples/ca1.html"))
+
+    def test_sessions_share_adapters(self):
+        url = "https://www.ca1.uscourts.gov/opinions"
+        sessions = [requests.Session() for _ in range(3)]
+        for session in sessions:
+            self.pool.mount(session, url)
+        adapters = {id(session.get_adapter(url)) for session in sessions}
+        self.assertEqual(len(adapters), 1)
+
+    def test_custom_adapters_are_kept(self):
+        url = "https://www.ca1.uscourts.gov/opinions"
+        session = requests.Session()
+        adapter = SSLAdapter()
+        session.mount("https://", adapter)
+        self.pool.mount(session, url)
+        self.assertIs(session.get_adapter(url), adapter)
+
+    def test_closing_a_session_keeps_the_pool_open(self):
+        url = "https://www.ca1.uscourts.gov/opinions"
+        session = requests.Session()
+        self.pool.mount(session, url)
+        adapter = session.get_adapter(url)
+        with mock.patch.object(adapter, "close") as close:
+            self.pool.release(session)
+            session.close()
+        close.assert_not_called()
+        self.assertNotIn(adapter, session.adapters.values())
+
+    def test_sites_borrow_from_the_pool(self):
+        sites = [ca1.Site() for _ in range(3)]
+        for site in sites:
+            site.connection_pool = self.pool
+            with mock.patch(
+                "requests.adapters.HTTPAdapter.send", side_effect=fake_send
+            ) as send:
+                site._request_url_get(site.url)
+            send.assert_called_once()
+        adapters = {id(s.request["session"].get_adapter(s.url)) for s in sites}
+        self.assertEqual(len(adapters), 1)
+        self.assertIn(
+            sites[0].request["session"].get_adapter(sites[0].url), self.pool
+        )
+        for site in sites:
+            site.close_session()
+        self.assertEqual(len(self.pool._adapters), 1)
+
+    def test_pacer_sessions_borrow_from_the_pool(self):
+        url = "https://ecf.cand.uscourts.gov/cgi-bin/DktRpt.pl"
+        session = PacerSession()
+        session.connection_pool = self.pool
+        with mock.patch(
+            "requests.adapters.HTTPAdapter.send", side_effect=fake_send
+        ) as send:
+            session.head(url)
+        send.assert_called_once()
+        self.assertIs(session.get_adapter(url), self.pool.get_adapter(url))
+        session.close()
+        self.assertNotIn(self.pool.get_adapter(url), session.adapters.values())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+
+import os
+import subprocess
+import sys
+import unittest
+
+from juriscraper.lib.importer import (
+    build_module_list,
+    get_courts_by_id,
+    get_module_by_name,
+    load_court_registry,
+    make_court_registry,
+    walk_module_list,
+)
+from tests import JURISCRAPER_ROOT
+
+
+class CourtRegistryTest(unittest.TestCase):
+    def test_registry_is_up_to_date(self):
+        """Is court_registry.json what make_court_registry makes now?
+
+        If not, run importer.write_court_registry().
+        """
+        self.assertEqual(
+            list(load_court_registry()), make_court_registry()["courts"]
+        )
+
+    def test_listing_matches_walking(self):
+        for court_id in (
+            "juriscraper",
+            "juriscraper.opinions.united_states",
+            "juriscraper.oral_args",
+            "juriscraper.opinions.united_states.federal_appellate.ca1",
+        ):
+            with self.subTest(court_id=court_id):
+                self.assertEqual(
+                    build_module_list(court_id), walk_module_list(court_id)
+                )
+        with self.assertRaises(ImportError):
+            build_module_list("juriscraper.opinions.united_states.federal_a")
+
+    def test_listing_imports_no_scrapers(self):
+        code = (
+            "import sys\n"
+            "from juriscraper.lib.importer import build_module_list\n"
+            "build_module_list('juriscraper.opinions')\n"
+            "print(len([m for m in sys.modules if m.startswith("
+            "'juriscraper.opinions.united_states.')]))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(JURISCRAPER_ROOT),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "0")
+
+    def test_get_module_by_name(self):
+        site = get_module_by_name("ca1")
+        self.assertEqual(
+            type(site).__module__,
+            "juriscraper.opinions.united_states.federal_appellate.ca1",
+        )
+        self.assertIsNone(get_module_by_name("not_a_court"))
+
+    def test_courts_by_id(self):
+        courts = get_courts_by_id()["ca1"]
+        self.assertEqual(
+            {court["scraper_type"] for court in courts},
+            {"opinions", "oral_args"},
+        )
+        (tex,) = get_courts_by_id()["tex"]
+        self.assertTrue(tex["uses_selenium"])
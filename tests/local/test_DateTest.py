@@ -1,14 +1,22 @@
 #!/usr/bin/env python
 
 
+import calendar
 import datetime
 import unittest
+from unittest import mock
 
+from dateutil import parser
+
+from juriscraper.lib import string_utils
 from juriscraper.lib.date_utils import (
     fix_future_year_typo,
     make_date_range_tuples,
 )
-from juriscraper.lib.string_utils import convert_date_string
+from juriscraper.lib.string_utils import (
+    convert_date_string,
+    parse_common_date_format,
+)
 
 
 class DateTest(unittest.TestCase):
@@ -81,3 +89,67 @@ def test_date_range_creation(self):
             result = make_date_range_tuples(**test["q"])
             with self.subTest("Checking dates", test=test["q"]):
                 self.assertEqual(result, test["a"])
+
+
+class ConvertDateStringTest(unittest.TestCase):
+    def test_common_formats_match_dateutil(self):
+        strings = []
+        for month in ("1", "01", "12", "13", "00"):
+            for day in ("5", "05", "29", "30", "31", "32"):
+                for year in ("2020", "2021"):
+                    strings.extend(
+                        [
+                            f"{month}/{day}/{year}",
+                            f"{month}-{day}-{year}",
+                            f"{year}-{month}-{day}",
+                        ]
+                    )
+        names = calendar.month_name[1:] + calendar.month_abbr[1:]
+        for name in names + ["SEPT", "sept.", "Mayo"]:
+            for day in ("1", "05", "30", "31"):
+                strings.extend(
+                    [
+                        f"{name} {day}, 2020",
+                        f"{name}. {day}, 2020",
+                        f"{name} {day} 2020",
+                    ]
+                )
+        parsed = 0
+        for s in strings:
+            dt = parse_common_date_format(s)
+            if dt is None:
+                continue
+            parsed += 1
+            with self.subTest(s=s):
+                self.assertEqual(dt, parser.parse(s))
+        self.assertGreater(parsed, len(strings) / 2)
+
+    def test_other_formats_use_dateutil(self):
+        for s in ("31/12/2020", "1/2/20", "Sept 5, 2020", "01/02-2020"):
+            with self.subTest(s=s):
+                self.assertIsNone(parse_common_date_format(s))
+                self.assertEqual(
+                    convert_date_string(s), parser.parse(s).date()
+                )
+        self.assertEqual(
+            convert_date_string("(Filed: January 5, 2020)", fuzzy=True),
+            datetime.date(2020, 1, 5),
+        )
+        self.assertIsNone(convert_date_string(" N/A "))
+        with self.assertRaises(ValueError):
+            convert_date_string("02/30/2020")
+
+    def test_results_are_cached(self):
+        with mock.patch.object(
+            string_utils, "parse_common_date_format", return_value=None
+        ), mock.patch.object(
+            string_utils.parser, "parse", wraps=parser.parse
+        ) as parse:
+            string_utils._parse_date_string.cache_clear()
+            for _ in range(3):
+                self.assertEqual(
+                    convert_date_string("12/10/1999", datetime=True),
+                    datetime.datetime(1999, 12, 10),
+                )
+        self.assertEqual(parse.call_count, 1)
+        string_utils._parse_date_string.cache_clear()
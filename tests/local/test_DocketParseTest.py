@@ -3,11 +3,12 @@
 import sys
 import time
 import unittest
+from unittest import mock
 
 import jsondate3 as json
 
 from juriscraper.lib.test_utils import warn_or_crash_slow_parser
-from juriscraper.pacer import DocketReport
+from juriscraper.pacer import DocketReport, docket_report
 from tests import TESTS_ROOT_EXAMPLES_PACER
 
 TESTS_ROOT_EXAMPLES_PACER_DOCKET = os.path.join(
@@ -183,3 +184,99 @@ def test_not_docket_dockets(self) -> None:
         # aren't actually dockets, it isn't there ahead of time. In that case,
         # skip the before test.
         self.assert_anonymized(path, skip_pre_test=True)
+
+
+class DocketEntryStreamingTest(unittest.TestCase):
+    """Does iter_docket_entries get the same entries as docket_entries?"""
+
+    def assert_same_entries(self, path, chunk_size):
+        court = os.path.basename(path).split(".")[0].split("_")[0]
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        report = DocketReport(court)
+        report._parse_text(text)
+        chunks = (
+            text[i : i + chunk_size] for i in range(0, len(text), chunk_size)
+        )
+        entries = list(DocketReport(court).iter_docket_entries(chunks))
+        self.assertEqual(entries, report.docket_entries)
+
+    def test_examples(self):
+        for path in (
+            "bankruptcy/deb_17.html",
+            "bankruptcy/nvb_368678.html",
+            "bankruptcy/txnb_7.html",
+            "district/nysd.html",
+            "district/cand.html",
+        ):
+            for chunk_size in (97, 4096):
+                with self.subTest(path=path, chunk_size=chunk_size):
+                    self.assert_same_entries(
+                        os.path.join(TESTS_ROOT_EXAMPLES_PACER_DOCKET, path),
+                        chunk_size,
+                    )
+
+    def test_rows_are_thrown_away(self):
+        row = (
+            "<tr><td>01/0{d}/2020</td><td><a href="
+            "'https://ecf.cand.uscourts.gov/doc1/035{n:09d}'>{n}</a></td>"
+            "<td>Order number {n}</td></tr>"
+        )
+
+        def make_docket(count):
+            yield "<html><body><table><tr><th>Date Filed</th><th>#</th>"
+            yield "<th>Docket Text</th></tr>"
+            for n in range(1, count + 1):
+                yield row.format(d=n % 9 + 1, n=n)
+            yield "</table></body></html>"
+
+        rows_held = []
+        strip = docket_report.strip_bad_html_tags_insecure
+
+        def spy(element):
+            rows_held.append(len(element.getparent()))
+            return strip(element)
+
+        with mock.patch.object(
+            docket_report, "strip_bad_html_tags_insecure", side_effect=spy
+        ):
+            entries = DocketReport("cand").iter_docket_entries(
+                make_docket(5000)
+            )
+            numbers = [entry["document_number"] for entry in entries]
+        self.assertEqual(numbers, [str(n) for n in range(1, 5001)])
+        self.assertLess(max(rows_held), 50)
+
+
+class DocketValidityTest(unittest.TestCase):
+    """Does check_validity find error pages, and say why?"""
+
+    def test_error_string_is_reported(self):
+        report = DocketReport("cand")
+        report.check_validity(
+            "<html><p>There are no  documents\nin this case.</p></html>"
+        )
+        self.assertFalse(report.is_valid)
+        self.assertEqual(
+            report.error_string, "There are no documents in this case."
+        )
+
+        # Strings from the base class are still checked.
+        report.check_validity("<script>MetaMask ... web3</script>")
+        self.assertFalse(report.is_valid)
+        self.assertEqual(report.error_string, "MetaMask.*web3")
+
+        report.check_validity("<html><p>A fine docket.</p></html>")
+        self.assertTrue(report.is_valid)
+        self.assertIsNone(report.error_string)
+
+    def test_each_class_has_its_own_regex(self):
+        class CustomReport(DocketReport):
+            ERROR_STRINGS = ["Custom error"]
+
+        report = CustomReport("cand")
+        report.check_validity("There are no documents in this case.")
+        self.assertTrue(report.is_valid)
+        report.check_validity("A CUSTOM   ERROR")
+        self.assertFalse(report.is_valid)
+        self.assertEqual(report.error_string, "Custom error")
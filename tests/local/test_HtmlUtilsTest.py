@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+
+
+import glob
+import os
+import re
+import unittest
+from unittest import mock
+
+from lxml import etree
+from lxml.html import HtmlComment, HtmlElement
+from requests import Response
+
+from juriscraper.lib import html_utils
+from juriscraper.lib.html_utils import (
+    clean_html,
+    clean_html_bytes,
+    detect_encoding,
+    get_html5_parsed_text,
+    is_utf8,
+    set_response_encoding,
+)
+from juriscraper.pacer import DocketReport
+from tests import TESTS_ROOT_EXAMPLES, TESTS_ROOT_EXAMPLES_PACER
+
+
+def legacy_clean_html(text):
+    """The way clean_html used to work, one re.sub per fix."""
+    text = re.sub(r"<!\[CDATA\[", "", text)
+    text = re.sub(r"\]\]>", "", text)
+    text = re.sub(r"^\s*<\?xml\s+.*?\?>", "", text)
+    return re.sub(
+        "[^\u0020-\ud7ff\u0009\u000a\u000d\ue000-\ufffd"
+        "\U00010000-\U0010ffff]+",
+        "",
+        text,
+    )
+
+
+class CleanHtmlTest(unittest.TestCase):
+    strings = [
+        "",
+        "<p>Nothing to do</p>",
+        "<![CDATA[<p>A</p>]]>",
+        "]<![CDATA[]>",
+        '  \n<?xml version="1.0" encoding="utf-8"?>\n<p>B</p>',
+        '<p>C</p><?xml version="1.0"?>',
+        "<?xml\nversion='1.0'?><p>D</p>",
+        "<p>\x00\x01E\x0b\x1f\ufffe\uffff\ud800\t\r\n\U0001f600</p>",
+    ]
+
+    def test_tricky_strings(self):
+        for s in self.strings:
+            with self.subTest(s=s):
+                self.assertEqual(clean_html(s), legacy_clean_html(s))
+
+    def test_tricky_bytes(self):
+        strings = self.strings + [
+            "\u2003<?xml version='1.0'?>caf\u00e9",
+            "<?xml version='\u00e9'?><p>F</p>",
+        ]
+        for s in strings:
+            if "\ud800" in s:
+                continue
+            with self.subTest(s=s):
+                content = s.encode("utf-8")
+                self.assertEqual(
+                    clean_html_bytes(content).decode("utf-8"), clean_html(s)
+                )
+
+    def test_is_utf8(self):
+        self.assertTrue(is_utf8(b""))
+        self.assertTrue(is_utf8(b"ascii"))
+        self.assertTrue(is_utf8("caf\u00e9 \U0001f600".encode("utf-8")))
+        self.assertFalse(is_utf8("caf\u00e9".encode("cp1252")))
+        self.assertFalse(is_utf8("\u00e9".encode("utf-8")[:1]))
+
+    def test_example_corpus(self):
+        """Is clean_html the same as it used to be for every example?"""
+        paths = glob.glob(
+            os.path.join(TESTS_ROOT_EXAMPLES, "**", "*"), recursive=True
+        )
+        count = 0
+        for path in paths:
+            if not path.endswith((".html", ".htm", ".xml", ".txt", ".json")):
+                continue
+            with open(path, encoding="utf-8", errors="surrogateescape") as f:
+                text = f.read()
+            count += 1
+            if clean_html(text) != legacy_clean_html(text):
+                self.fail(f"clean_html changed the output for {path}")
+        self.assertTrue(count)
+
+    def test_example_corpus_as_bytes(self):
+        paths = glob.glob(
+            os.path.join(TESTS_ROOT_EXAMPLES, "**", "*.htm*"), recursive=True
+        )
+        for path in paths:
+            with open(path, "rb") as f:
+                content = f.read()
+            if not is_utf8(content):
+                continue
+            expected = clean_html(content.decode("utf-8"))
+            if clean_html_bytes(content).decode("utf-8") != expected:
+                self.fail(f"clean_html_bytes doesn't match for {path}")
+
+
+class Html5ParsingTest(unittest.TestCase):
+    html = (
+        "<!DOCTYPE html><title>A docket</title>"
+        "<table><tr><td>1<td nowrap>2</table><p>Text<!-- A comment -->"
+    )
+
+    def test_single_pass_makes_html_elements(self):
+        tree = get_html5_parsed_text(self.html, single_pass=True)
+        self.assertIsInstance(tree, HtmlElement)
+        self.assertEqual(tree.tag, "html")
+        self.assertEqual([e.tag for e in tree], ["head", "body"])
+        for element in tree.iter(tag=etree.Element):
+            self.assertIsInstance(element, HtmlElement)
+        (comment,) = tree.xpath("//comment()")
+        self.assertIsInstance(comment, HtmlComment)
+        self.assertEqual(
+            tree.xpath("//td/text()"),
+            get_html5_parsed_text(self.html).xpath("//td/text()"),
+        )
+        self.assertEqual(tree.text_content(), "A docket12Text")
+
+    def test_default_parser_is_restored(self):
+        default_parser = etree.get_default_parser()
+        get_html5_parsed_text(self.html, single_pass=True)
+        self.assertIs(etree.get_default_parser(), default_parser)
+        self.assertNotIsInstance(etree.Element("p"), HtmlElement)
+
+    def test_docket_is_the_same_either_way(self):
+        path = os.path.join(
+            TESTS_ROOT_EXAMPLES_PACER, "dockets", "district", "nysd.html"
+        )
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        results = []
+        for single_pass in (False, True):
+            report = DocketReport("nysd")
+            report.HTML5_SINGLE_PASS = single_pass
+            report._parse_text(text)
+            results.append(report.data)
+        self.assertEqual(results[0], results[1])
+        self.assertTrue(results[0]["docket_entries"])
+
+
+class EncodingDetectionTest(unittest.TestCase):
+    cp1252 = "<p>Caf\u00e9 \u201cquoted\u201d \u2014 na\u00efve</p>".encode(
+        "cp1252"
+    )
+
+    def setUp(self):
+        html_utils.detected_encodings.clear()
+
+    def tearDown(self):
+        html_utils.detected_encodings.clear()
+
+    def test_byte_order_marks(self):
+        text = "<p>\u00e9</p>"
+        self.assertEqual(
+            detect_encoding(text.encode("utf-8-sig")), "utf-8-sig"
+        )
+        self.assertEqual(detect_encoding(text.encode("utf-16")), "utf-16")
+        self.assertEqual(detect_encoding(text.encode("utf-32")), "utf-32")
+
+    def test_meta_charset(self):
+        for meta in (
+            b'<meta charset="utf-8">',
+            b'<META http-equiv="Content-Type" '
+            b'content="text/html; charset=UTF-8">',
+        ):
+            with self.subTest(meta=meta):
+                self.assertEqual(detect_encoding(meta + self.cp1252), "utf-8")
+        latin1 = b"<meta charset=iso-8859-1>"
+        self.assertEqual(detect_encoding(latin1), "cp1252")
+        unknown = b"<meta charset=nonsense>"
+        self.assertEqual(detect_encoding(unknown), "ascii")
+
+    def test_meta_charset_is_only_sniffed_at_the_start(self):
+        content = b" " * 2000 + b'<meta charset="utf-16">'
+        self.assertEqual(detect_encoding(content), "ascii")
+
+    def test_ascii_and_utf8(self):
+        self.assertEqual(detect_encoding(b"<p>Plain</p>"), "ascii")
+        content = "<p>Caf\u00e9</p>".encode()
+        self.assertEqual(detect_encoding(content), "utf-8")
+
+    def test_guesses_are_remembered_per_host(self):
+        with mock.patch.object(
+            html_utils.chardet,
+            "detect",
+            return_value={"encoding": "ISO-8859-1"},
+        ) as detect:
+            for _ in range(3):
+                encoding = detect_encoding(self.cp1252, "www.example.com")
+                self.assertEqual(encoding, "cp1252")
+            detect_encoding(self.cp1252, "www.example.org")
+            detect_encoding(self.cp1252)
+            detect_encoding(self.cp1252)
+        self.assertEqual(detect.call_count, 4)
+        # chardet only sees a sample, starting at the first non-ASCII byte.
+        sample = detect.call_args[0][0]
+        self.assertEqual(sample, self.cp1252[self.cp1252.index(b"\xe9") :])
+
+    def test_set_response_encoding(self):
+        response = Response()
+        response.status_code = 200
+        response._content = b"<meta charset=utf-8>" + self.cp1252
+        response.url = "https://www.example.com/opinions"
+        set_response_encoding(response)
+        self.assertEqual(response.encoding, "utf-8")
+
+        response = Response()
+        response.status_code = 200
+        response._content = self.cp1252
+        response.headers["content-type"] = "text/html; charset=ISO-8859-1"
+        response.encoding = "ISO-8859-1"
+        set_response_encoding(response)
+        self.assertEqual(response.encoding, "cp1252")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+
+import os
+import subprocess
+import sys
+import unittest
+
+import juriscraper.pacer
+from tests import JURISCRAPER_ROOT
+
+# Modules that are slow to import, and that most processes never use, so
+# they must not be imported until they're needed.
+LAZY_MODULES = {
+    "asyncio",
+    "feedparser",
+    "geonamescache",
+    "html5lib",
+    "httpx",
+    "selenium",
+    "tldextract",
+}
+
+# The most seconds that importing each module may take in a fresh
+# interpreter. These are several times what they take on a laptop, so that
+# slow machines don't fail, but they'll catch anything heavy being added.
+IMPORT_TIME_BUDGETS = {
+    "juriscraper.AbstractSite": 1.0,
+    "juriscraper.pacer": 0.2,
+    "juriscraper.pacer.docket_report": 1.5,
+    "juriscraper.OpinionSiteWebDriven": 1.0,
+    "juriscraper.opinions.united_states.state.tex": 1.0,
+}
+
+
+def import_times(module):
+    """Import module in a new interpreter, with -X importtime.
+
+    :return: A dict of each module that was imported, and how many seconds
+    it took to import, including what it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(JURISCRAPER_ROOT),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_imports_are_light_and_fast(self):
+        for module, budget in IMPORT_TIME_BUDGETS.items():
+            with self.subTest(module=module):
+                times = import_times(module)
+                imported = {name.split(".")[0] for name in times}
+                self.assertFalse(
+                    imported & LAZY_MODULES,
+                    f"Importing {module} imported {imported & LAZY_MODULES}",
+                )
+                self.assertLess(times[module], budget)
+
+
+class LazyPacerImportTest(unittest.TestCase):
+    def test_names_are_imported_on_use(self):
+        from juriscraper.pacer import DocketReport, PacerSession
+        from juriscraper.pacer.docket_report import (
+            DocketReport as DocketReportInModule,
+        )
+
+        self.assertIs(DocketReport, DocketReportInModule)
+        self.assertEqual(PacerSession.__module__, "juriscraper.pacer.http")
+        for name in juriscraper.pacer.__all__:
+            self.assertTrue(hasattr(juriscraper.pacer, name), name)
+        self.assertIn("ClaimsRegister", dir(juriscraper.pacer))
+
+    def test_unknown_names_raise_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            juriscraper.pacer.NotAReport
+        with self.assertRaises(ImportError):
+            from juriscraper.pacer import NotAReport  # noqa: F401
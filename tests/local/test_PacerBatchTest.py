@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+from collections import Counter
+from unittest import mock
+
+from juriscraper.lib.exceptions import ParsingException
+from juriscraper.pacer import PacerSession, PacerSessionPool
+from juriscraper.pacer.batch import query_dockets
+
+
+class FakeDocketReport:
+    """Stands in for DocketReport, keeping track of how many queries are
+    running at once.
+    """
+
+    lock = threading.Lock()
+    running = Counter()
+    most_running = Counter()
+    most_running_in_all = 0
+
+    def __init__(self, court_id, pacer_session=None):
+        self.court_id = court_id
+        self.session = pacer_session
+
+    @classmethod
+    def reset(cls):
+        cls.running = Counter()
+        cls.most_running = Counter()
+        cls.most_running_in_all = 0
+
+    def query(self, pacer_case_id, doc_num_start=""):
+        cls = type(self)
+        with cls.lock:
+            cls.running[self.court_id] += 1
+            cls.most_running[self.court_id] = max(
+                cls.most_running[self.court_id], cls.running[self.court_id]
+            )
+            cls.most_running_in_all = max(
+                cls.most_running_in_all, sum(cls.running.values())
+            )
+        time.sleep(0.01)
+        with cls.lock:
+            cls.running[self.court_id] -= 1
+        if pacer_case_id == "bad":
+            raise ParsingException("Unable to parse")
+        self.data = {
+            "pacer_case_id": pacer_case_id,
+            "doc_num_start": doc_num_start,
+            "cookie": self.session.cookies["NextGenCSO"],
+        }
+
+
+def fake_login(session, url=None):
+    session.cookies.set("NextGenCSO", "token", domain=".uscourts.gov")
+
+
+@mock.patch.object(
+    PacerSession, "login", autospec=True, side_effect=fake_login
+)
+class QueryDocketsTest(unittest.TestCase):
+    def setUp(self):
+        FakeDocketReport.reset()
+
+    def test_courts_are_capped(self, login):
+        cases = [("cand", str(i)) for i in range(20)]
+        cases += [("nysd", str(i), {"doc_num_start": 5}) for i in range(5)]
+        cases += [("dcd", "bad")]
+        pool = PacerSessionPool("user", "pass")
+        results = dict(
+            query_dockets(
+                pool,
+                cases,
+                max_workers=4,
+                max_per_court=2,
+                report_class=FakeDocketReport,
+            )
+        )
+        self.assertEqual(len(results), 26)
+        self.assertEqual(
+            results[("nysd", "3")],
+            {"pacer_case_id": "3", "doc_num_start": 5, "cookie": "token"},
+        )
+        self.assertEqual(results[("cand", "19")]["doc_num_start"], "")
+        self.assertIsInstance(results[("dcd", "bad")], ParsingException)
+        self.assertLessEqual(max(FakeDocketReport.most_running.values()), 2)
+        self.assertLessEqual(FakeDocketReport.most_running_in_all, 4)
+        # Courts took turns, so they ran at the same time.
+        self.assertGreater(FakeDocketReport.most_running_in_all, 2)
+        # The pool's sessions shared one login.
+        self.assertEqual(login.call_count, 1)
+
+    def test_results_come_as_they_finish(self, login):
+        pool = PacerSessionPool("user", "pass")
+        results = query_dockets(
+            pool,
+            [("cand", "1"), ("cand", "2")],
+            max_per_court=1,
+            report_class=FakeDocketReport,
+        )
+        key, data = next(results)
+        self.assertEqual(key, ("cand", "1"))
+        # The second one hasn't started yet, since cand is capped at one.
+        self.assertEqual(sum(FakeDocketReport.running.values()), 0)
+        self.assertEqual([key for key, _ in results], [("cand", "2")])
@@ -0,0 +1,63 @@
+import re
+import unittest
+
+from juriscraper.pacer.classifier import Classification, Classifier, Rule
+from juriscraper.pacer.reports import doc1_error_classifier
+
+
+class ClassifierTest(unittest.TestCase):
+    classifier = Classifier(
+        [
+            Rule(b"Sealed", "sealed", "Sealed: {case}"),
+            Rule(re.compile(rb"not\s+available"), "unavailable", "Gone"),
+            Rule(b"logout", "logged_in"),
+        ],
+        max_bytes=100,
+    )
+
+    def test_first_rule_wins(self):
+        content = b"<p>Not available: Sealed, not  available</p>"
+        self.assertEqual(
+            self.classifier.classify(content, case="1:20-cv-1"),
+            Classification("sealed", "Sealed: 1:20-cv-1"),
+        )
+        self.assertEqual(
+            self.classifier.classify(b"not\navailable"),
+            Classification("unavailable", "Gone"),
+        )
+        self.assertIsNone(self.classifier.classify(b"<p>A PDF</p>"))
+
+    def test_search_by_kind(self):
+        content = b"Sealed <a href='?logout'>"
+        rule = self.classifier.search(content, "logged_in")
+        self.assertEqual(rule.kind, "logged_in")
+        self.assertIsNone(self.classifier.search(content, "unavailable"))
+
+    def test_only_the_start_is_searched(self):
+        self.assertIsNone(self.classifier.search(b" " * 100 + b"Sealed"))
+        self.assertIsNotNone(self.classifier.search(b" " * 94 + b"Sealed"))
+
+
+class Doc1ErrorClassifierTest(unittest.TestCase):
+    def test_messages_match_what_they_were(self):
+        pacer_case_id, url = "123", "https://ecf.cand.uscourts.gov/doc1/1"
+        result = doc1_error_classifier.classify(
+            b"<p>This document is currently Under Seal</p>",
+            pacer_case_id=pacer_case_id,
+            url=url,
+        )
+        self.assertEqual(result.kind, "sealed")
+        self.assertEqual(
+            result.message, f"Document is sealed: {pacer_case_id=} {url=}"
+        )
+
+    def test_later_errors_on_the_page_win(self):
+        """When PACER's pages had several errors, the one checked for last
+        was used, so it's first in the table.
+        """
+        result = doc1_error_classifier.classify(
+            b"The document is not available. Sealed Document.",
+            pacer_case_id="1",
+            url="u",
+        )
+        self.assertEqual(result.kind, "sealed")
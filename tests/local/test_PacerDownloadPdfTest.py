@@ -0,0 +1,136 @@
+import io
+import unittest
+from unittest import mock
+
+from requests import Response
+
+from juriscraper.pacer import AppellateDocketReport
+from juriscraper.pacer.reports import PDF_HEAD_BYTES, BaseReport
+
+PDF = b"%PDF-1.4\n" + b"x" * (3 * PDF_HEAD_BYTES) + b"\n%%EOF"
+
+
+DOC1_URL = "https://ecf.cand.uscourts.gov/doc1/035122021132"
+
+
+def make_response(content, content_type="text/html", url=DOC1_URL):
+    """Make a response that reads its body from a file, like a streamed
+    one does.
+    """
+    r = Response()
+    r.status_code = 200
+    r.headers["content-type"] = content_type
+    r.url = url
+    r.raw = io.BytesIO(content)
+    return r
+
+
+class DownloadPdfTest(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock()
+        self.report = BaseReport("cand", self.session)
+
+    def download_both_ways(self, *responses):
+        """Download with download_pdf and download_pdf_to, with the session
+        returning responses in turn to each.
+
+        :return: The results of each and what was written to the sink.
+        """
+        results = []
+        for stream in (False, True):
+            made = [make_response(*args) for args in responses]
+            self.session.post.side_effect = made[:1]
+            self.session.get.side_effect = made[1:]
+            if stream:
+                sink = io.BytesIO()
+                r, error = self.report.download_pdf_to(
+                    sink, "1", "035122021132"
+                )
+                results.append((r, error, sink.getvalue()))
+            else:
+                results.append(self.report.download_pdf("1", "035122021132"))
+            # Both ways make the same requests.
+            self.assertEqual(self.session.post.call_args[1]["stream"], stream)
+        return results
+
+    def test_pdf(self):
+        (r, error), (streamed_r, streamed_error, written) = (
+            self.download_both_ways((PDF, "application/pdf"))
+        )
+        self.assertEqual(r.content, PDF)
+        self.assertEqual(written, PDF)
+        self.assertEqual(error, streamed_error)
+        self.assertEqual(error, "")
+
+    def test_only_the_head_is_read_before_writing(self):
+        self.session.post.return_value = make_response(PDF, "application/pdf")
+        r, body, error = self.report._get_pdf_response(
+            "1", "035122021132", stream=True
+        )
+        self.assertEqual(body.head, PDF[:PDF_HEAD_BYTES])
+        self.assertEqual(r.raw.tell(), PDF_HEAD_BYTES)
+
+    def test_errors(self):
+        pages = [
+            (b"<p>This document is currently Under Seal</p>", "sealed"),
+            (b"<p>The document is not available.</p>", "not available"),
+            (
+                b"<p>You do not have permission to view\nthis document.</p>",
+                "Permission denied",
+            ),
+        ]
+        for page, message in pages:
+            with self.subTest(message=message):
+                (r, error), (streamed_r, streamed_error, written) = (
+                    self.download_both_ways((page,))
+                )
+                self.assertIsNone(r)
+                self.assertIsNone(streamed_r)
+                self.assertIn(message, error)
+                self.assertEqual(error, streamed_error)
+                self.assertEqual(written, b"")
+
+    def test_errors_past_the_head(self):
+        """Without streaming, the whole page is checked for errors."""
+        page = b"<p>" + b" " * PDF_HEAD_BYTES + b"Under Seal</p>"
+        self.session.post.return_value = make_response(page)
+        r, error = self.report.download_pdf("1", "035122021132")
+        self.assertIsNone(r)
+        self.assertIn("sealed", error)
+
+    def test_redirect_and_iframe(self):
+        redirect = b'<script>window.location = "/doc1/123";</script>'
+        iframe = b'<html><iframe src="/cgi-bin/show_temp.pl?file=a.pdf">'
+        for responses in (
+            [(redirect,), (PDF, "application/pdf")],
+            [(iframe,), (PDF, "application/pdf")],
+            [(redirect,), (iframe,), (PDF, "application/pdf")],
+        ):
+            with self.subTest(responses=responses):
+                (r, error), (streamed_r, streamed_error, written) = (
+                    self.download_both_ways(*responses)
+                )
+                self.assertEqual(r.content, PDF)
+                self.assertEqual(written, PDF)
+                self.assertEqual(error, streamed_error)
+        self.assertEqual(
+            self.session.get.call_args[0][0],
+            "https://ecf.cand.uscourts.gov/cgi-bin/show_temp.pl?file=a.pdf",
+        )
+
+
+class AppellateDownloadPdfTest(unittest.TestCase):
+    def test_streams_pdf(self):
+        session = mock.Mock()
+        report = AppellateDocketReport("ca1", session)
+        session.get.return_value = make_response(PDF, "application/pdf")
+        sink = io.BytesIO()
+        r = report.download_pdf_to(sink, "00116008873")
+        self.assertIsNotNone(r)
+        self.assertEqual(sink.getvalue(), PDF)
+        self.assertTrue(session.get.call_args[1]["stream"])
+
+        session.get.return_value = make_response(b"<p>Nope</p>")
+        sink = io.BytesIO()
+        self.assertIsNone(report.download_pdf_to(sink, "00116008873"))
+        self.assertEqual(sink.getvalue(), b"")
@@ -0,0 +1,229 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from juriscraper.pacer.incremental import (
+    SqliteWatermarkStore,
+    Watermark,
+    WatermarkStore,
+    delta_query_options,
+    get_watermark,
+    merge_dockets,
+    refresh_docket,
+)
+from tests import TESTS_ROOT_EXAMPLES_PACER
+
+
+def make_entry(
+    date_filed,
+    document_number=None,
+    pacer_doc_id=None,
+    seq=None,
+    date_entered=None,
+):
+    entry = {
+        "date_filed": date_filed,
+        "description": f"Entry {document_number} filed {date_filed}",
+        "document_number": document_number,
+        "pacer_doc_id": pacer_doc_id,
+        "pacer_seq_no": seq,
+    }
+    if date_entered is not None:
+        entry["date_entered"] = date_entered
+    return entry
+
+
+class FakeDocketReport:
+    """Returns the entries of a docket that a query would."""
+
+    def __init__(self, court_id, entries):
+        self.court_id = court_id
+        self.entries = entries
+        self.queries = []
+
+    def query(
+        self,
+        pacer_case_id,
+        date_range_type="Filed",
+        date_start=None,
+        doc_num_start="",
+        **kw,
+    ):
+        self.queries.append(
+            dict(kw, date_range_type=date_range_type, date_start=date_start)
+        )
+
+        def get_date(entry):
+            if date_range_type == "Entered":
+                return entry.get("date_entered", entry["date_filed"])
+            return entry["date_filed"]
+
+        entries = [
+            e
+            for e in self.entries
+            if (date_start is None or get_date(e) >= date_start)
+            and (
+                not doc_num_start
+                or int(e["document_number"] or 0) >= doc_num_start
+            )
+        ]
+        self.data = {"case_name": "Foo v. Bar", "docket_entries": entries}
+
+
+class WatermarkTest(unittest.TestCase):
+    def test_watermark_of_example_docket(self):
+        path = os.path.join(
+            TESTS_ROOT_EXAMPLES_PACER, "dockets", "district", "azd.json"
+        )
+        with open(path) as f:
+            docket = json.load(f)
+        watermark = get_watermark(docket)
+        entries = docket["docket_entries"]
+        self.assertEqual(
+            watermark.date_filed,
+            date.fromisoformat(max(e["date_filed"] for e in entries)),
+        )
+        self.assertEqual(
+            watermark.document_number,
+            max(int(e["document_number"] or 0) for e in entries),
+        )
+        self.assertEqual(get_watermark({}), Watermark())
+
+    def test_delta_query_options(self):
+        watermark = Watermark(date(2020, 1, 2), 7)
+        self.assertEqual(
+            delta_query_options(watermark),
+            {"date_range_type": "Entered", "date_start": date(2020, 1, 2)},
+        )
+        self.assertEqual(
+            delta_query_options(watermark, by="document_number"),
+            {"doc_num_start": 7},
+        )
+        self.assertEqual(delta_query_options(None), {})
+        self.assertEqual(delta_query_options(Watermark()), {})
+        with self.assertRaises(ValueError):
+            delta_query_options(watermark, by="color")
+
+    def test_merge_drops_duplicates(self):
+        old = {
+            "case_name": "Foo v. Bar",
+            "parties": [{"name": "Foo"}],
+            "docket_entries": [
+                make_entry(date(2020, 1, 1)),
+                make_entry(date(2020, 1, 2), "1", "0001", "5"),
+            ],
+        }
+        new = {
+            "case_name": "Foo v. Baz",
+            "parties": [],
+            "docket_entries": [
+                make_entry(date(2020, 1, 2), "1", "0001", "5"),
+                make_entry(date(2020, 1, 2), "2", "0002", "6"),
+                make_entry(date(2020, 1, 3)),
+            ],
+        }
+        merged = merge_dockets(old, new)
+        self.assertEqual(merged["case_name"], "Foo v. Baz")
+        self.assertEqual(merged["parties"], old["parties"])
+        self.assertEqual(
+            [e["document_number"] for e in merged["docket_entries"]],
+            [None, "1", "2", None],
+        )
+        self.assertEqual(len(old["docket_entries"]), 2)
+
+    def test_merge_sorts_by_date_filed(self):
+        old = {
+            "docket_entries": [
+                make_entry(date(2020, 1, 1), "1", "0001", "1"),
+                make_entry(date(2020, 1, 3), "3", "0003", "3"),
+            ]
+        }
+        new = {
+            "docket_entries": [
+                make_entry(date(2020, 1, 3), "3", "0003", "3"),
+                make_entry(date(2020, 1, 2), "2", "0002", "2"),
+            ]
+        }
+        merged = merge_dockets(old, new)
+        self.assertEqual(
+            [e["document_number"] for e in merged["docket_entries"]],
+            ["1", "2", "3"],
+        )
+
+
+class WatermarkStoreTest(unittest.TestCase):
+    def make_store(self):
+        return WatermarkStore()
+
+    def test_watermarks_only_go_up(self):
+        store = self.make_store()
+        self.assertIsNone(store.get("cand", "1"))
+        store.update(
+            "cand", "1", {"docket_entries": [make_entry(date(2020, 1, 5))]}
+        )
+        store.update(
+            "cand", 1, {"docket_entries": [make_entry(date(2020, 1, 1), "3")]}
+        )
+        self.assertEqual(
+            store.get("cand", "1"), Watermark(date(2020, 1, 5), 3)
+        )
+        self.assertIsNone(store.get("nysd", "1"))
+
+    def test_refresh_docket(self):
+        store = self.make_store()
+        entries = [
+            make_entry(date(2020, 1, 1), "1", "0001", "1"),
+            make_entry(date(2020, 1, 2)),
+            make_entry(date(2020, 1, 2), "2", "0002", "2"),
+        ]
+        report = FakeDocketReport("cand", entries)
+        docket = refresh_docket(report, "1", store)
+        self.assertEqual(report.queries[-1]["date_start"], None)
+        self.assertEqual(len(docket["docket_entries"]), 3)
+
+        entries.append(make_entry(date(2020, 1, 2), "3", "0003", "3"))
+        entries.append(make_entry(date(2020, 1, 4)))
+        docket = refresh_docket(report, "1", store, docket)
+        self.assertEqual(report.queries[-1]["date_start"], date(2020, 1, 2))
+        self.assertEqual(report.queries[-1]["date_range_type"], "Entered")
+        self.assertEqual(docket["docket_entries"], entries)
+        self.assertEqual(
+            store.get("cand", "1"), Watermark(date(2020, 1, 4), 3)
+        )
+
+        # Without the docket, only the new entries come back.
+        entries.append(make_entry(date(2020, 1, 5), "4", "0004", "4"))
+        delta = refresh_docket(report, "1", store, by="document_number")
+        self.assertEqual(
+            [e["document_number"] for e in delta["docket_entries"]],
+            ["3", "4"],
+        )
+
+        # A back-dated entry, entered after the last refresh.
+        back_dated = make_entry(
+            date(2020, 1, 1), "5", "0005", "5", date_entered=date(2020, 1, 6)
+        )
+        entries.append(back_dated)
+        docket = refresh_docket(report, "1", store, docket)
+        self.assertEqual(docket["docket_entries"][1], back_dated)
+        self.assertEqual(len(docket["docket_entries"]), len(entries))
+
+
+class SqliteWatermarkStoreTest(WatermarkStoreTest):
+    def make_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        store = SqliteWatermarkStore(os.path.join(directory.name, "w.db"))
+        self.addCleanup(store.close)
+        return store
+
+    def test_watermarks_are_kept(self):
+        store = self.make_store()
+        store.update(
+            "cand", "1", {"docket_entries": [make_entry(date(2020, 1, 5))]}
+        )
+        again = SqliteWatermarkStore(store.path)
+        self.addCleanup(again.close)
+        self.assertEqual(again.get("cand", "1"), Watermark(date(2020, 1, 5)))
@@ -0,0 +1,171 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from requests import Response
+
+from juriscraper.lib.exceptions import PacerLoginException
+from juriscraper.pacer import (
+    FileLoginStore,
+    LoginStore,
+    PacerSession,
+    PacerSessionPool,
+)
+
+
+def fake_login(calls):
+    """Make a PacerSession.login that counts its calls and takes a moment,
+    so that other threads pile up behind it.
+    """
+
+    def login(session, url=None):
+        calls.append(session)
+        time.sleep(0.05)
+        session.cookies.clear()
+        session.cookies.set(
+            "NextGenCSO", f"token-{len(calls)}", domain=".uscourts.gov"
+        )
+
+    return login
+
+
+class LoginStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        patcher = mock.patch.object(
+            PacerSession, "login", fake_login(self.calls)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_store(self):
+        return LoginStore()
+
+    def make_session(self, store):
+        return PacerSession(
+            username="user", password="pass", login_store=store
+        )
+
+    def log_in_at_once(self, sessions, stores=None):
+        stores = stores or [s.login_store for s in sessions]
+        threads = [
+            threading.Thread(target=store.login, args=(session,))
+            for session, store in zip(sessions, stores)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_one_expiry_is_one_login(self):
+        store = self.make_store()
+        sessions = [self.make_session(store) for _ in range(20)]
+        for session in sessions:
+            store.refresh(session)
+        self.assertEqual(len(self.calls), 1)
+
+        self.log_in_at_once(sessions)
+        self.assertEqual(len(self.calls), 2)
+        for session in sessions:
+            self.assertEqual(session.login_generation, 2)
+            self.assertEqual(session.cookies["NextGenCSO"], "token-2")
+
+    def test_refresh_gets_newer_cookies(self):
+        store = self.make_store()
+        old, new = self.make_session(store), self.make_session(store)
+        store.refresh(old)
+        # new is logged in like old is, so this must be a new login.
+        store.refresh(new)
+        store.login(new)
+        self.assertEqual(old.cookies["NextGenCSO"], "token-1")
+        store.refresh(old)
+        self.assertEqual(old.cookies["NextGenCSO"], "token-2")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_refresh_never_mixes_logins(self):
+        """A session gets a generation's own cookies, even if it refreshes
+        in the middle of another session's login.
+        """
+        mixed = []
+
+        class RefreshingLoginStore(LoginStore):
+            """Refreshes reader after every change to the store."""
+
+            reader = None
+
+            def __setattr__(self, name, value):
+                super().__setattr__(name, value)
+                if self.reader is not None and name != "reader":
+                    self.refresh(self.reader)
+                    token = self.reader.cookies.get("NextGenCSO")
+                    if token != f"token-{self.reader.login_generation}":
+                        mixed.append(token)
+
+        store = RefreshingLoginStore()
+        writer, reader = self.make_session(store), self.make_session(store)
+        store.refresh(writer)
+        store.reader = reader
+        store.login(writer)
+        self.assertEqual(reader.login_generation, 2)
+        self.assertEqual(mixed, [])
+
+
+class FileLoginStoreTest(LoginStoreTest):
+    def make_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return FileLoginStore(os.path.join(directory.name, "pacer.json"))
+
+    def test_processes_share_logins(self):
+        """Each process has its own FileLoginStore, for the same file."""
+        store = self.make_store()
+        store.refresh(self.make_session(store))
+        stores = [FileLoginStore(store.path) for _ in range(10)]
+        sessions = [self.make_session(s) for s in stores]
+        for session in sessions:
+            session.login_store.refresh(session)
+        self.log_in_at_once(sessions, stores)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(os.stat(store.path).st_mode & 0o777, 0o600)
+
+
+class PacerSessionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        patcher = mock.patch.object(
+            PacerSession, "login", fake_login(self.calls)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sessions_are_reused(self):
+        pool = PacerSessionPool("user", "pass")
+        with pool.session() as s:
+            pass
+        with pool.session() as s2, pool.session() as s3:
+            self.assertIs(s, s2)
+            self.assertIsNot(s2, s3)
+            self.assertIs(s3.login_store, pool.login_store)
+            self.assertEqual(s3.cookies["NextGenCSO"], "token-1")
+        self.assertEqual(len(self.calls), 1)
+        pool.close()
+
+    def test_expired_session_uses_the_store(self):
+        pool = PacerSessionPool("user", "pass")
+        r = Response()
+        r.status_code = 200
+        r._content = b"<html>Please log in</html>"
+        with pool.session() as s:
+            self.assertTrue(s._login_again(r))
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(s.login_generation, 2)
+
+    def test_no_credentials(self):
+        session = PacerSession(login_store=LoginStore())
+        r = Response()
+        r._content = b"<html>Please log in</html>"
+        with self.assertRaises(PacerLoginException):
+            session._login_again(r)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+
+import unittest
+from unittest import mock
+
+from juriscraper.lib.rate_limit import RateLimiter, TokenBucket
+from juriscraper.opinions.united_states.federal_appellate import ca1
+from juriscraper.pacer import PacerSession
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimitTest(unittest.TestCase):
+    def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=2, clock=clock)
+        # The burst goes straight through
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        # Then each request reserves the next token and waits for it
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+        # Once enough time has passed, the bucket refills, but only to burst
+        clock.now = 100
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+
+    def test_hosts_are_limited_independently(self):
+        limiter = RateLimiter(default_rate=1)
+        self.assertEqual(limiter.reserve("https://a.example.com/1"), 0)
+        self.assertGreater(limiter.reserve("https://a.example.com/2"), 0)
+        self.assertEqual(limiter.reserve("https://b.example.com/1"), 0)
+
+    def test_no_limit_by_default(self):
+        limiter = RateLimiter()
+        for _ in range(10):
+            self.assertEqual(limiter.reserve("https://a.example.com/"), 0)
+
+    def test_local_files_are_never_limited(self):
+        limiter = RateLimiter(default_rate=0.001)
+        for _ in range(10):
+            self.assertEqual(limiter.reserve("tests/examples/ca1.html"), 0)
+
+    def test_strictest_rate_wins(self):
+        limiter = RateLimiter(default_rate=10)
+        url = "https://a.example.com/"
+        limiter.reserve(url, rate=0.5)
+        self.assertAlmostEqual(limiter.reserve(url, rate=5), 2.0, places=2)
+        self.assertEqual(limiter._buckets["a.example.com"].rate, 0.5)
+
+    def test_site_rate_limit_is_used(self):
+        site = ca1.Site()
+        site.rate_limit = 0.25
+        with mock.patch(
+            "juriscraper.AbstractSite.rate_limiter"
+        ) as limiter, mock.patch.object(site.request["session"], "get"):
+            site._request_url_get(site.url)
+        limiter.wait.assert_called_once_with(site.url, 0.25, 1)
+
+    def test_pacer_session_rate_limit_is_used(self):
+        session = PacerSession()
+        session.rate_limit = 3
+        url = "https://ecf.cand.uscourts.gov/cgi-bin/DktRpt.pl"
+        with mock.patch(
+            "juriscraper.pacer.http.rate_limiter"
+        ) as limiter, mock.patch(
+            "juriscraper.pacer.http.requests.Session.post"
+        ):
+            session.post(url, data={"a": 1}, auto_login=False)
+        limiter.wait.assert_called_once_with(url, 3, 1)
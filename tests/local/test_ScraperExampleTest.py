@@ -8,6 +8,8 @@
 import sys
 import time
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 
 from juriscraper.lib.importer import build_module_list
 from juriscraper.lib.string_utils import CaseNameTweaker
@@ -16,6 +18,120 @@
     warn_or_crash_slow_parser,
 )
 
+JSON_COMPARE_EXTENSION = ".compare.json"
+
+# To test the scrapers in parallel, set this to the number of processes to
+# use, or to 0 to use one per CPU. Unset, they're tested one at a time.
+WORKERS_ENV_VAR = "JURISCRAPER_TEST_WORKERS"
+
+
+def get_num_workers():
+    """How many processes to test the example files with, from the
+    environment. 1 means to test them in this process.
+    """
+    value = os.environ.get(WORKERS_ENV_VAR, "").strip()
+    if not value:
+        return 1
+    return int(value) or os.cpu_count() or 1
+
+
+def get_example_path(module_string):
+    # module_parts:
+    # [0]  - "juriscraper"
+    # [1]  - "opinions" or "oral_args"
+    # ...  - rest of the path
+    # [-1] - module name
+    module_parts = module_string.split(".")
+    return os.path.join(
+        "tests",
+        "examples",
+        module_parts[1],
+        "united_states",
+        module_parts[-1],
+    )
+
+
+def check_example_files(module_string, cnt=None):
+    """Scrape each of a module's example files, and compare what it gets with
+    the file's .compare.json.
+
+    This doesn't use a TestCase, so that it can be run in another process.
+    Compare files that don't exist yet are generated.
+
+    :return: A dict of how many example files there were, how long they took,
+    the compare files they were compared with, as (json_path, message)
+    tuples where the message is empty if they matched, and the compare files
+    that were generated.
+    """
+    package, module = module_string.rsplit(".", 1)
+    mod = __import__(f"{package}.{module}", globals(), locals(), [module])
+    cnt = cnt or CaseNameTweaker()
+    comparer = unittest.TestCase()
+    comparer.maxDiff = 1000
+    paths = [
+        path
+        for path in glob.glob(f"{get_example_path(module_string)}_example*")
+        if not path.endswith(JSON_COMPARE_EXTENSION)
+    ]
+    compared = []
+    generated = []
+    t1 = time.time()
+    for path in paths:
+        # This loop allows multiple example files per module
+        if path.endswith("~"):
+            # Text editor backup: Not interesting.
+            continue
+        site = mod.Site(cnt=cnt)
+        site.url = path
+        # Forces a local GET
+        site.enable_test_mode()
+        site.parse()
+        # Now validate that the parsed result is as we expect
+        json_path = f"{path.rsplit('.', 1)[0]}{JSON_COMPARE_EXTENSION}"
+        json_data = json.loads(site.to_json())
+        if os.path.isfile(json_path):
+            # Compare result with corresponding json file
+            with open(json_path) as input_file:
+                fixture_json = json.load(input_file)
+            try:
+                comparer.assertEqual(
+                    len(fixture_json),
+                    len(json_data),
+                    msg="Fixture and scraped data have different "
+                    "lengths: expected %s and scraped %s (%s)"
+                    % (
+                        len(fixture_json),
+                        len(json_data),
+                        module_string,
+                    ),
+                )
+                for i, item in enumerate(fixture_json):
+                    comparer.assertEqual(
+                        fixture_json[i],
+                        json_data[i],
+                    )
+            except AssertionError as e:
+                compared.append((json_path, str(e)))
+            else:
+                compared.append((json_path, ""))
+        else:
+            # Generate corresponding json file if it doesn't
+            # already exist. This should only happen once
+            # when adding a new example html file.
+            generated.append(json_path)
+            with open(json_path, "w") as json_example:
+                json.dump(json_data, json_example, indent=2)
+    return {
+        "num_tests": len(paths),
+        "duration": time.time() - t1,
+        "compared": compared,
+        "generated": generated,
+    }
+
+
+def _init_worker():
+    logging.disable(logging.CRITICAL)
+
 
 class ScraperExampleTest(unittest.TestCase):
     def setUp(self):
@@ -27,53 +143,58 @@ def tearDown(self):
         # Re-enable logging
         logging.disable(logging.NOTSET)
 
-    def run_tests_on_module_str(self, module_str: str) -> None:
+    def iter_results(self, module_strings, workers):
+        """Yield each module and the results of checking its example files,
+        in order, checking them in workers processes if there's more than
+        one.
+        """
+        if workers <= 1:
+            cnt = CaseNameTweaker()
+            for module_string in module_strings:
+                yield module_string, check_example_files(module_string, cnt)
+            return
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+            yield from zip(
+                module_strings,
+                pool.map(check_example_files, module_strings),
+            )
+
+    def run_tests_on_module_str(
+        self, module_str: str, workers: Optional[int] = None
+    ) -> None:
         """Finds all the $module_example* files and tests them with the sample
         scraper.
+
+        :param workers: How many processes to shard the modules across.
+        Defaults to the value of the JURISCRAPER_TEST_WORKERS environment
+        variable.
         """
+        if workers is None:
+            workers = get_num_workers()
         module_strings = build_module_list(module_str)
-        num_scrapers = len(
-            [s for s in module_strings if "backscraper" not in s]
-        )
-        max_len_mod_string = (
-            max(len(mod) for mod in module_strings if "backscraper" not in mod)
-            + 2
-        )
+        scraper_strings = []
+        for module_string in module_strings:
+            if "backscraper" in module_string:
+                # Make sure it still imports, but there's nothing to test.
+                package, module = module_string.rsplit(".", 1)
+                __import__(module_string, globals(), locals(), [module])
+            else:
+                scraper_strings.append(module_string)
+        num_scrapers = len(scraper_strings)
+        max_len_mod_string = max(len(mod) for mod in scraper_strings) + 2
         num_example_files = 0
         num_warnings = 0
-        cnt = CaseNameTweaker()
-        json_compare_extension = ".compare.json"
         json_compare_files_generated = []
-        for module_string in module_strings:
-            package, module = module_string.rsplit(".", 1)
-            mod = __import__(
-                f"{package}.{module}", globals(), locals(), [module]
-            )
-            if "backscraper" in module_string:
-                continue
-
+        if workers > 1:
+            print(f"\n  Testing with {workers} processes.")
+        for module_string, result in self.iter_results(
+            scraper_strings, workers
+        ):
             sys.stdout.write(f"  {module_string.ljust(max_len_mod_string)} ")
             sys.stdout.flush()
-            # module_parts:
-            # [0]  - "juriscraper"
-            # [1]  - "opinions" or "oral_args"
-            # ...  - rest of the path
-            # [-1] - module name
-            module_parts = module_string.split(".")
-            example_path = os.path.join(
-                "tests",
-                "examples",
-                module_parts[1],
-                "united_states",
-                module_parts[-1],
-            )
-            paths = [
-                path
-                for path in glob.glob(f"{example_path}_example*")
-                if not path.endswith(json_compare_extension)
-            ]
+            example_path = get_example_path(module_string)
             self.assertTrue(
-                paths,
+                result["num_tests"],
                 "No example file found for: %s! \n\nThe test looked in: "
                 "%s"
                 % (
@@ -81,60 +202,21 @@ def run_tests_on_module_str(self, module_str: str) -> None:
                     os.path.join(os.getcwd(), example_path),
                 ),
             )
-            num_example_files += len(paths)
-            t1 = time.time()
-            num_tests = len(paths)
-            for path in paths:
-                # This loop allows multiple example files per module
-                if path.endswith("~"):
-                    # Text editor backup: Not interesting.
-                    continue
-                site = mod.Site(cnt=cnt)
-                site.url = path
-                # Forces a local GET
-                site.enable_test_mode()
-                site.parse()
-                # Now validate that the parsed result is as we expect
-                json_path = f"{path.rsplit('.', 1)[0]}{json_compare_extension}"
-                json_data = json.loads(site.to_json())
-                if os.path.isfile(json_path):
-                    # Compare result with corresponding json file
-                    example_file = path.rsplit("/", 1)[1]
-                    compare_file = json_path.rsplit("/", 1)[1]
-                    with open(json_path) as input_file, self.subTest(
-                        "Testing example files",
-                        json_path=json_path,
-                        module_string=module_string,
-                    ):
-                        fixture_json = json.load(input_file)
-                        self.assertEqual(
-                            len(fixture_json),
-                            len(json_data),
-                            msg="Fixture and scraped data have different "
-                            "lengths: expected %s and scraped %s (%s)"
-                            % (
-                                len(fixture_json),
-                                len(json_data),
-                                module_string,
-                            ),
-                        )
-                        for i, item in enumerate(fixture_json):
-                            self.assertEqual(
-                                fixture_json[i],
-                                json_data[i],
-                            )
-
-                else:
-                    # Generate corresponding json file if it doesn't
-                    # already exist. This should only happen once
-                    # when adding a new example html file.
-                    warn_generated_compare_file(json_path)
-                    json_compare_files_generated.append(json_path)
-                    with open(json_path, "w") as json_example:
-                        json.dump(json_data, json_example, indent=2)
-            t2 = time.time()
-            duration = t2 - t1
-            warning_msg = warn_or_crash_slow_parser(t2 - t1)
+            num_example_files += result["num_tests"]
+            for json_path, message in result["compared"]:
+                with self.subTest(
+                    "Testing example files",
+                    json_path=json_path,
+                    module_string=module_string,
+                ):
+                    if message:
+                        self.fail(message)
+            for json_path in result["generated"]:
+                warn_generated_compare_file(json_path)
+                json_compare_files_generated.append(json_path)
+            num_tests = result["num_tests"]
+            duration = result["duration"]
+            warning_msg = warn_or_crash_slow_parser(duration)
             if warning_msg:
                 num_warnings += 1
 
@@ -204,3 +286,10 @@ def test_scrape_opinion_state_example_files(self):
 
     def test_scrape_oral_arg_example_files(self):
         self.run_tests_on_module_str("juriscraper.oral_args")
+
+    def test_scrape_example_files_in_parallel(self):
+        """Does sharding the modules across processes work too?"""
+        self.run_tests_on_module_str(
+            "juriscraper.opinions.united_states.administrative_agency",
+            workers=2,
+        )
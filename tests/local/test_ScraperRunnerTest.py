@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+
+
+import datetime
+import os
+import tempfile
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+from requests import HTTPError
+
+from juriscraper.AbstractSite import AbstractSite
+from juriscraper.lib.checkpoint import (
+    BackscrapeCheckpoint,
+    SqliteBackscrapeCheckpoint,
+)
+from juriscraper.lib.network_utils import get_host
+from juriscraper.lib.runner import (
+    KeyedSemaphore,
+    parallel_site_yielder,
+    scrape_courts,
+)
+
+FED_APP = "juriscraper.opinions.united_states.federal_appellate"
+
+
+class FakeBackscrapeSite:
+    """A Site that finds one case per back-scrape item."""
+
+    downloaded = []
+
+    def _download_backwards(self, item):
+        if item == "gone":
+            raise HTTPError("404 Client Error")
+        if item == "broken":
+            raise ValueError("Broken page.")
+        time.sleep(0.01 * (5 - item))
+        self.downloaded.append(item)
+        self.case_names = [f"Case {item}"]
+
+    def parse(self):
+        self.hash = f"hash-{self.case_names[0]}"
+        return self
+
+    def __len__(self):
+        return len(self.case_names)
+
+
+def make_fake_court():
+    mod = types.ModuleType("fake_court")
+    mod.Site = type("Site", (FakeBackscrapeSite,), {"downloaded": []})
+    return mod
+
+
+class ScraperRunnerTest(unittest.TestCase):
+    """Tests for running many courts at once."""
+
+    def test_get_host(self):
+        qa_pairs = (
+            ("https://www.ca1.uscourts.gov/opinions", "www.ca1.uscourts.gov"),
+            ("HTTP://Example.COM:8080/x", "example.com:8080"),
+            ("tests/examples/opinions/united_states/ca1_example.xml", ""),
+            (None, ""),
+        )
+        for q, a in qa_pairs:
+            self.assertEqual(get_host(q), a)
+
+    def test_keyed_semaphore_caps_each_key(self):
+        semaphore = KeyedSemaphore(2)
+        lock = threading.Lock()
+        active = {"a": 0, "b": 0}
+        peaks = {"a": 0, "b": 0}
+
+        def work(key):
+            with semaphore.hold(key):
+                with lock:
+                    active[key] += 1
+                    peaks[key] = max(peaks[key], active[key])
+                time.sleep(0.02)
+                with lock:
+                    active[key] -= 1
+
+        threads = [
+            threading.Thread(target=work, args=(key,))
+            for key in ["a"] * 6 + ["b"] * 6
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peaks, {"a": 2, "b": 2})
+
+    def test_failures_are_isolated_and_results_stream(self):
+        """Does a broken court leave the others alone, and do fast courts come
+        back before slow ones?
+        """
+        courts = [f"{FED_APP}.{c}" for c in ["ca1", "ca2_p", "ca4"]]
+
+        def fake_parse(site):
+            if site.court_id.endswith("ca1"):
+                time.sleep(0.2)
+            if site.court_id.endswith("ca2_p"):
+                raise ValueError("Court is down.")
+            site.case_names = ["Lissner v. Langley"]
+            return site
+
+        with mock.patch.object(
+            AbstractSite, "parse", autospec=True, side_effect=fake_parse
+        ):
+            results = list(
+                scrape_courts(courts, callback=lambda site: site.court_id)
+            )
+
+        order = [court for court, _ in results]
+        self.assertEqual(sorted(order), sorted(courts))
+        self.assertEqual(order[-1], courts[0], msg="Slow court wasn't last.")
+
+        results = dict(results)
+        self.assertIn("Court is down.", results[courts[1]]["global_failure"])
+        self.assertEqual(results[courts[1]]["scrape"], {})
+        for court in (courts[0], courts[2]):
+            self.assertFalse(results[court]["global_failure"])
+            self.assertEqual(results[court]["scrape"], court)
+
+
+class ParallelBackscrapeTest(unittest.TestCase):
+    """Tests for back-scraping a court on many threads."""
+
+    def test_all_items_are_yielded_as_they_finish(self):
+        mod = make_fake_court()
+        results = list(
+            parallel_site_yielder([0, 1, 2, 3, "gone"], mod, max_workers=4)
+        )
+        items = [item for item, _ in results]
+        self.assertEqual(sorted(items), [0, 1, 2, 3])
+        self.assertNotEqual(items, [0, 1, 2, 3], msg="Results were serial.")
+        for item, site in results:
+            self.assertEqual(site.case_names, [f"Case {item}"])
+
+    def test_errors_other_than_http_errors_are_raised(self):
+        mod = make_fake_court()
+        with self.assertRaises(ValueError):
+            list(parallel_site_yielder([0, "broken", 1], mod, max_workers=2))
+
+    def test_checkpoint_resumes_a_backscrape(self):
+        mod = make_fake_court()
+        checkpoint = BackscrapeCheckpoint()
+        items = [0, 1, 2, 3, 4]
+        yielder = parallel_site_yielder(
+            items, mod, max_workers=1, checkpoint=checkpoint
+        )
+        item, site = next(yielder)
+        # Nothing is done until the caller is finished with the site.
+        self.assertFalse(checkpoint.is_done("fake_court", item))
+        next(yielder)
+        self.assertEqual(
+            checkpoint.get("fake_court", item), {"count": 1, "hash": site.hash}
+        )
+        # Closing the yielder doesn't mark the item it last yielded as done.
+        yielder.close()
+
+        done = [i for i in items if checkpoint.is_done("fake_court", i)]
+        self.assertEqual(done, [0])
+        mod.Site.downloaded.clear()
+        resumed = [
+            item
+            for item, _ in parallel_site_yielder(
+                items, mod, max_workers=1, checkpoint=checkpoint
+            )
+        ]
+        self.assertEqual(resumed, [1, 2, 3, 4])
+        self.assertNotIn(0, mod.Site.downloaded)
+
+    def test_checkpoint_retries_items_the_caller_failed_on(self):
+        mod = make_fake_court()
+        checkpoint = BackscrapeCheckpoint()
+        with self.assertRaises(ValueError):
+            for item, _ in parallel_site_yielder(
+                [0, 1, 2], mod, max_workers=1, checkpoint=checkpoint
+            ):
+                raise ValueError("Unable to save the site.")
+        self.assertFalse(checkpoint.is_done("fake_court", item))
+
+        resumed = [
+            i
+            for i, _ in parallel_site_yielder(
+                [0, 1, 2], mod, max_workers=1, checkpoint=checkpoint
+            )
+        ]
+        self.assertIn(item, resumed)
+        self.assertEqual(sorted(resumed), [0, 1, 2])
+
+    def test_sqlite_checkpoint_persists(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "checkpoints.sqlite3")
+            item = (datetime.date(2020, 1, 1), datetime.date(2020, 1, 8))
+            checkpoint = SqliteBackscrapeCheckpoint(path)
+            checkpoint.set("tex", item, {"count": 12, "hash": "abc"})
+            checkpoint.close()
+
+            checkpoint = SqliteBackscrapeCheckpoint(path)
+            self.assertEqual(
+                checkpoint.get("tex", item), {"count": 12, "hash": "abc"}
+            )
+            self.assertTrue(checkpoint.is_done("tex", item))
+            self.assertFalse(checkpoint.is_done("tex", item[::-1]))
+            self.assertFalse(checkpoint.is_done("texapp", item))
+            checkpoint.close()
@@ -1,8 +1,11 @@
 #!/usr/bin/env python
 
 
+import re
+import sys
 import unittest
 
+from juriscraper.lib import string_utils
 from juriscraper.lib.date_utils import is_first_month_in_quarter, quarter
 from juriscraper.lib.diff_tools import normalize_phrase
 from juriscraper.lib.string_utils import (
@@ -229,6 +232,23 @@ def test_make_short_name(self):
                 % (t[0], t[1], output),
             )
 
+    def test_bad_words_file_is_up_to_date(self):
+        """Is bad_words.txt what make_bad_words makes now?
+
+        If not, run string_utils.write_bad_words_file().
+        """
+        with open(string_utils.BAD_WORDS_PATH, encoding="utf-8") as f:
+            words = f.read().splitlines()
+        self.assertEqual(words, string_utils.make_bad_words())
+
+    def test_bad_words_are_shared(self):
+        bad_words = CaseNameTweaker().bad_words
+        self.assertIsInstance(bad_words, frozenset)
+        self.assertIs(CaseNameTweaker().bad_words, bad_words)
+        for word in ("u.s.a.", "usa", "usa,", "dallas", "dallas.", "legaré"):
+            self.assertIn(word, bad_words)
+        self.assertNotIn("u.s.a..", bad_words)
+
     def test_quarter(self):
         answers = {
             1: 1,
@@ -373,6 +393,36 @@ def test_harmonize_and_clean_string_tests(self):
             with self.subTest("Harmonize function", test=pair[0]):
                 self.assertEqual(harmonize(clean_string(pair[0])), pair[1])
 
+    def test_harmonize_and_clean_string_edge_cases(self):
+        test_pairs = [
+            # Bad words are removed even when they're separated by odd
+            # whitespace.
+            ["Lissner,\tPlaintiff\nv.\xa0 White", "Lissner v. White"],
+            ["Plaintiffs, Lissner v. Appellee", "Lissner v."],
+            ["Lissner –_/, v. ,;White\u2003", "Lissner v. White"],
+            ["\u3000Nos.\t 23", "23"],
+            ["", ""],
+        ]
+        for pair in test_pairs:
+            with self.subTest(test=pair[0]):
+                self.assertEqual(harmonize(clean_string(pair[0])), pair[1])
+        self.assertEqual(harmonize(1), "1")
+
+    def test_whitespace_is_what_regexes_call_whitespace(self):
+        whitespace = "".join(
+            c
+            for c in map(chr, range(sys.maxunicode + 1))
+            if re.match(r"\s", c)
+        )
+        self.assertEqual(string_utils.WHITESPACE, whitespace)
+
+    def test_harmonize_is_cached(self):
+        string_utils._harmonize.cache_clear()
+        for _ in range(3):
+            harmonize("US v. Lissner, Plaintiff")
+        info = string_utils._harmonize.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
     def test_normalize_phrase(self):
         """Tests normalization of case titles."""
         test_pairs = [